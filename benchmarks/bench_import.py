@@ -0,0 +1,27 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import subprocess
+import sys
+
+
+def _import(statement):
+    subprocess.check_call([sys.executable, "-c", statement])
+
+
+def bench_import_compas(benchmark):
+    """Reference for the import benchmarks below."""
+    benchmark.pedantic(_import, args=("import compas.geometry",), rounds=5)
+
+
+def bench_import_compas_mrr(benchmark):
+    benchmark.pedantic(_import, args=("import compas_mrr",), rounds=5)
+
+
+def bench_import_arbitrary_pts_localization(benchmark):
+    benchmark.pedantic(
+        _import,
+        args=("from compas_mrr import arbitrary_pts_localization",),
+        rounds=5,
+    )
@@ -0,0 +1,94 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import pytest
+from synthetic import point_pairs
+
+from compas_mrr import arbitrary_pts_localization
+from compas_mrr import batch_arbitrary_pts_localization
+from compas_mrr import batch_three_pts_localization
+from compas_mrr import leave_one_out_diagnostics
+from compas_mrr import robust_pts_localization
+from compas_mrr import three_pts_localization
+
+SIZES = [3, 10, 100, 1000, 10000, 100000]
+
+
+@pytest.mark.parametrize("n_points", SIZES)
+def bench_svd(benchmark, n_points):
+    rcs_coords, wcs_coords, _ = point_pairs(n_points)
+
+    benchmark(arbitrary_pts_localization, rcs_coords, wcs_coords)
+
+
+@pytest.mark.parametrize("n_points", [3, 10, 100, 1000])
+def bench_slsqp(benchmark, n_points):
+    rcs_coords, wcs_coords, _ = point_pairs(n_points)
+
+    benchmark(
+        arbitrary_pts_localization, rcs_coords, wcs_coords, method="slsqp", starts=1
+    )
+
+
+@pytest.mark.parametrize("n_points", [3, 10, 100, 1000])
+def bench_lm(benchmark, n_points):
+    rcs_coords, wcs_coords, _ = point_pairs(n_points)
+
+    benchmark(arbitrary_pts_localization, rcs_coords, wcs_coords, method="lm", starts=1)
+
+
+@pytest.mark.parametrize("n_points", [10, 1000])
+def bench_slsqp_warm(benchmark, n_points):
+    rcs_coords, wcs_coords, _ = point_pairs(n_points)
+    origin, x_vec, y_vec = arbitrary_pts_localization(rcs_coords, wcs_coords)
+    # moved by a few centimetres
+    initial_frame = [[c + 30 for c in origin], x_vec, y_vec]
+
+    benchmark(
+        arbitrary_pts_localization,
+        rcs_coords,
+        wcs_coords,
+        method="slsqp",
+        initial_frame=initial_frame,
+    )
+
+
+@pytest.mark.parametrize("n_sets", [10, 1000])
+def bench_batch(benchmark, n_sets):
+    sets = [point_pairs(10, seed=seed) for seed in range(n_sets)]
+    rcs_sets = [rcs for rcs, _, _ in sets]
+    wcs_sets = [wcs for _, wcs, _ in sets]
+
+    benchmark(batch_arbitrary_pts_localization, rcs_sets, wcs_sets)
+
+
+@pytest.mark.parametrize("n_points", [10, 100, 1000])
+@pytest.mark.parametrize("method", ["ransac", "huber"])
+def bench_robust(benchmark, n_points, method):
+    rcs_coords, wcs_coords, _ = point_pairs(n_points, outliers=0.2)
+
+    benchmark(robust_pts_localization, rcs_coords, wcs_coords, method=method, seed=0)
+
+
+def bench_three_pts(benchmark):
+    rcs_coords, wcs_coords, _ = point_pairs(3)
+
+    benchmark(three_pts_localization, rcs_coords.tolist(), wcs_coords.tolist())
+
+
+@pytest.mark.parametrize("n_triples", [10, 10000])
+def bench_batch_three_pts(benchmark, n_triples):
+    triples = [point_pairs(3, seed=seed) for seed in range(n_triples)]
+    rcs_triples = np.array([rcs for rcs, _, _ in triples])
+    wcs_triples = np.array([wcs for _, wcs, _ in triples])
+
+    benchmark(batch_three_pts_localization, rcs_triples, wcs_triples)
+
+
+@pytest.mark.parametrize("n_points", [10, 1000, 100000])
+def bench_leave_one_out(benchmark, n_points):
+    rcs_coords, wcs_coords, _ = point_pairs(n_points)
+
+    benchmark(leave_one_out_diagnostics, rcs_coords, wcs_coords)
@@ -0,0 +1,57 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+
+import pytest
+from synthetic import pointlist
+
+from compas_mrr import MeasurementPoint
+from compas_mrr import MeasurementPointCloud
+from compas_mrr.pointlist import read_pointlist
+from compas_mrr.pointlist import read_pointlist_arrays
+
+SIZES = [10, 1000, 100000]
+
+
+@pytest.mark.parametrize("n_points", SIZES)
+def bench_read_pointlist(benchmark, n_points):
+    text = pointlist(n_points)
+
+    benchmark(lambda: read_pointlist(io.StringIO(text), scale=1000))
+
+
+@pytest.mark.parametrize("n_points", SIZES)
+def bench_read_pointlist_attrs(benchmark, n_points):
+    text = pointlist(n_points)
+
+    def read_with_attrs():
+        return [pt.attrs for pt in read_pointlist(io.StringIO(text))]
+
+    benchmark(read_with_attrs)
+
+
+@pytest.mark.parametrize("n_points", SIZES)
+def bench_read_pointlist_arrays(benchmark, n_points):
+    text = pointlist(n_points)
+
+    benchmark(lambda: read_pointlist_arrays(io.StringIO(text), scale=1000))
+
+
+@pytest.mark.parametrize("n_points", SIZES)
+def bench_point_cloud_from_pointlist(benchmark, n_points):
+    text = pointlist(n_points)
+
+    benchmark(lambda: MeasurementPointCloud.from_pointlist(io.StringIO(text)))
+
+
+def bench_point_name_parsing(benchmark):
+    points = [MeasurementPoint(0, 0, 0, "LP{}".format(i)) for i in range(1000)]
+
+    def parse():
+        for pt in points:
+            pt.pt_name = pt.pt_name  # clears the cache
+            pt.prefix, pt.idx
+
+    benchmark(parse)
@@ -0,0 +1,32 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest
+from synthetic import transformations
+
+from compas_mrr.xforms import transform_points_to_robot_base
+from compas_mrr.xforms import xform_to_xyz_quaternion
+from compas_mrr.xforms import xforms_to_xyz_quaternions
+
+
+def bench_xform_to_xyz_quaternion(benchmark):
+    M = transformations(1)[0].tolist()
+
+    benchmark(xform_to_xyz_quaternion, M)
+
+
+@pytest.mark.parametrize("n_xforms", [10, 1000, 100000])
+def bench_xforms_to_xyz_quaternions(benchmark, n_xforms):
+    M = transformations(n_xforms)
+
+    benchmark(xforms_to_xyz_quaternions, M)
+
+
+@pytest.mark.parametrize("n_points", [1000, 100000])
+def bench_transform_points_to_robot_base(benchmark, n_points):
+    M = transformations(n_points + 1)
+    frame = [M[0, :3, 3], M[0, :3, 0], M[0, :3, 1]]
+    points = M[1:, :3, 3].copy()
+
+    benchmark(transform_points_to_robot_base, points, frame, out=points)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Allow the benchmarks to import the synthetic data generators
+sys.path.insert(0, os.path.dirname(__file__))
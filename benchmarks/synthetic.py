@@ -0,0 +1,78 @@
+"""Synthetic localization data for the benchmarks."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+
+def point_pairs(n_points, noise=0.5, outliers=0.0, seed=0):
+    """Localization points in RCS and their simulated measurements in WCS.
+
+    Parameters
+    ----------
+    n_points
+        Number of point pairs.
+    noise
+        Standard deviation of the measurement noise per coordinate, in mm.
+    outliers
+        Fraction of measurements displaced by 50 to 500 mm.
+    seed
+        Seed for the random generator.
+
+    Returns
+    -------
+    tuple
+        RCS coordinates (N, 3), WCS coordinates (N, 3) and the frame used to
+        create them as origin, x axis and y axis.
+    """
+    rng = np.random.default_rng(seed)
+
+    R = Rotation.random(random_state=seed).as_matrix()
+    t = rng.uniform(-20000, 20000, 3)
+
+    rcs_coords = rng.uniform(-2500, 2500, (n_points, 3))
+    wcs_coords = rcs_coords.dot(R.T) + t
+    wcs_coords += rng.normal(scale=noise, size=wcs_coords.shape)
+
+    n_outliers = int(round(outliers * n_points))
+    if n_outliers:
+        idxs = rng.choice(n_points, n_outliers, replace=False)
+        directions = rng.normal(size=(n_outliers, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+        wcs_coords[idxs] += directions * rng.uniform(50, 500, (n_outliers, 1))
+
+    return rcs_coords, wcs_coords, [t, R[:, 0], R[:, 1]]
+
+
+def transformations(n_xforms, seed=0):
+    """(N, 4, 4) rigid transformations along a smooth random path."""
+    rng = np.random.default_rng(seed)
+
+    rotvecs = np.cumsum(rng.normal(scale=0.05, size=(n_xforms, 3)), axis=0)
+    M = np.zeros((n_xforms, 4, 4))
+    M[:, :3, :3] = Rotation.from_rotvec(rotvecs).as_matrix()
+    M[:, :3, 3] = np.cumsum(rng.normal(scale=10, size=(n_xforms, 3)), axis=0)
+    M[:, 3, 3] = 1
+
+    return M
+
+
+def pointlist(n_points, seed=0):
+    """Text of a pointlist export with ``n_points`` points."""
+    rng = np.random.default_rng(seed)
+
+    lines = ["NAME;X;Y;Z;Attr1;Attr2;Attr3;Attr4;Attr5;HA;VA;HD;hr;ppm;"]
+    coords = rng.uniform(0, 30, (n_points, 3))
+    polar = rng.uniform(0, 6, (n_points, 3))
+
+    for i, ((x, y, z), (ha, va, hd)) in enumerate(zip(coords, polar)):
+        lines.append(
+            "LP{};{:.6f};{:.6f};{:.6f};;;;;;{:.6f};{:.6f};{:.6f};0.000000;0.000000;".format(
+                i + 1, x, y, z, ha, va, hd
+            )
+        )
+
+    return "\n".join(lines) + "\n"
@@ -5,17 +5,27 @@ from __future__ import division
 from __future__ import print_function
 
 import os
+import re
+import sys
 from os import path
-from distutils.version import LooseVersion
 
 import compas
 import compas.plugins
 
-from .measurement_point import *  # noqa: F401, F403
-from .three_pts_localization import *  # noqa: F401, F403
-
-if not compas.IPY:
-    from .arbitrary_pts_localization import *  # noqa: F401, F403
+from .measurement_point import split_pt_name
+from .measurement_point import MeasurementPoint
+from .measurement_point import sort_measurement_points
+from .measurement_point import group_measurement_points
+from .pointlist import POINTLIST_COORD_COLUMNS
+from .pointlist import iter_pointlist
+from .pointlist import read_pointlist
+from .pointlist import iter_pointlist_arrays
+from .pointlist import read_pointlist_arrays
+from .correspondence import PointCorrespondence
+from .correspondence import match_points
+from .correspondence import find_correspondences
+from .three_pts_localization import three_pts_localization
+from .three_pts_localization import batch_three_pts_localization
 
 PKG_ROOT = path.dirname(__file__)
 REPO_ROOT = path.abspath(path.join(PKG_ROOT, ".."))
@@ -108,7 +118,81 @@ def _fixed_prepare_environment(env=None):
     return env
 
 
-if LooseVersion(compas.__version__) < LooseVersion("0.19.2"):
+def _version_tuple(version):  # type: (str) -> tuple
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:3])
+
+
+if _version_tuple(compas.__version__) < (0, 19, 2):
     import compas._os
 
     compas._os.prepare_environment = _fixed_prepare_environment
+
+
+# Submodules depending on NumPy and SciPy are imported on first access of one
+# of their attributes (PEP 562), so importing compas_mrr stays cheap. These
+# modules are not available in IronPython.
+_LAZY_ATTRS = {
+    "arbitrary_pts_localization": "arbitrary_pts_localization",
+    "batch_arbitrary_pts_localization": "arbitrary_pts_localization",
+    "robust_pts_localization": "robust_pts_localization",
+    "IncrementalLocalizer": "incremental_localization",
+    "MeasurementPointCloud": "measurement_point_cloud",
+    "localization_diagnostics": "diagnostics",
+    "leave_one_out_diagnostics": "diagnostics",
+    "polar_pts_localization": "polar_localization",
+    "LocalizationCache": "cache",
+    "cached_localization": "cache",
+}
+
+__all__ = [
+    "split_pt_name",
+    "MeasurementPoint",
+    "sort_measurement_points",
+    "group_measurement_points",
+    "POINTLIST_COORD_COLUMNS",
+    "iter_pointlist",
+    "read_pointlist",
+    "iter_pointlist_arrays",
+    "read_pointlist_arrays",
+    "PointCorrespondence",
+    "match_points",
+    "find_correspondences",
+    "three_pts_localization",
+    "batch_three_pts_localization",
+]
+
+if not compas.IPY:
+    # Star imports resolve these through __getattr__
+    __all__ += list(_LAZY_ATTRS)
+
+    import importlib
+    import types
+
+    def __getattr__(name):
+        try:
+            module_name = _LAZY_ATTRS[name]
+        except KeyError:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(__name__, name)
+            )
+
+        module = importlib.import_module("." + module_name, __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+    class _Package(types.ModuleType):
+        def __setattr__(self, name, value):
+            # Importing a submodule binds it as an attribute of the package,
+            # which would shadow the function of the same name (e.g.
+            # arbitrary_pts_localization).
+            if name in _LAZY_ATTRS and isinstance(value, types.ModuleType):
+                value = getattr(value, name)
+
+            super(_Package, self).__setattr__(name, value)
+
+    sys.modules[__name__].__class__ = _Package
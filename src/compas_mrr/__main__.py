@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
 
+import argparse
 import sys
 import compas
 import compas_mrr
 
 
-if __name__ == "__main__":
+def _print_info():
     print()
     print("compas_mrr is installed properly.")
     print()
@@ -14,3 +15,41 @@ if __name__ == "__main__":
     print("COMPAS: {}".format(compas.__version__))
 
     print("Python: {}".format(sys.version))
+
+
+def main(args=None):
+    from compas_mrr import server
+
+    parser = argparse.ArgumentParser(prog="python -m compas_mrr")
+    subparsers = parser.add_subparsers(dest="command")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a localization server, see compas_mrr.server."
+    )
+    serve_parser.add_argument("--host", default=server.DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=server.DEFAULT_PORT)
+    serve_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=128,
+        help="Number of localization results kept in memory, 0 disables the cache.",
+    )
+    serve_parser.add_argument(
+        "--cache-dir", help="Directory to keep localization results across restarts."
+    )
+
+    args = parser.parse_args(args)
+
+    if args.command == "serve":
+        server.serve(
+            host=args.host,
+            port=args.port,
+            cache_size=args.cache_size,
+            cache_dir=args.cache_dir,
+        )
+    else:
+        _print_info()
+
+
+if __name__ == "__main__":
+    main()
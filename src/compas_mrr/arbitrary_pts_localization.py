@@ -8,71 +8,277 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import sys
-import tempfile
+import os
+import threading
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from functools import reduce
 
 import numpy as np
+from scipy.optimize import OptimizeResult
+from scipy.optimize import least_squares
 from scipy.optimize import minimize
+from scipy.spatial.transform import Rotation
 
 from compas_mrr.utils import TYPE_CHECKING
 
-try:
-    from pathlib import Path
-except ImportError:
-    if sys.version_info.major < 3:
-        raise Exception("Python 3 is required to run this module.")
-    else:
-        raise
-
 if TYPE_CHECKING:
+    from typing import Callable  # noqa: F401
     from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
 
-    from scipy.optimize import OptimizeResult  # noqa: F401
+    from compas_mrr.diagnostics import LocalizationDiagnostics  # noqa: F401
 
+METHODS = ("svd", "slsqp", "lm")
+EXECUTORS = ("thread", "process")
 
-def _objective_function(
-    x,  # type: List[float]
+# Pools for named executors, created on first use and reused across calls
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _coords_to_array(coords):  # type: (List[List[float]]) -> np.ndarray
+    """Convert a sequence of points to a (N, 3) array of floats."""
+    arr = np.asarray(coords, dtype=float)
+
+    if arr.ndim != 2 or arr.shape[1] != 3:
+        raise ValueError(
+            "Expected a sequence of 3D points, got array with shape {}".format(
+                arr.shape
+            )
+        )
+
+    return arr
+
+
+def _point_pairs_to_arrays(
     rcs_coords,  # type: List[List[float]]
     wcs_coords,  # type: List[List[float]]
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """Convert the point sets to arrays, checking that they can be localized."""
+    rcs_coords = _coords_to_array(rcs_coords)
+    wcs_coords = _coords_to_array(wcs_coords)
+
+    if rcs_coords.shape != wcs_coords.shape:
+        raise ValueError("rcs_coords and wcs_coords need to have the same length.")
+
+    if len(rcs_coords) < 3:
+        raise ValueError("At least three point pairs are needed.")
+
+    return rcs_coords, wcs_coords
+
+
+def _kabsch(
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+    weights=None,  # type: Union[None, np.ndarray]
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """Closed form least squares rigid transformation between two point sets.
+
+    Solves for the rotation ``R`` and translation ``t`` minimizing the
+    (weighted) sum of ``|R * p + t - q|^2`` over all point pairs using the SVD
+    of the cross covariance matrix (Kabsch/Umeyama without scaling).
+
+    Stacked point sets of shape (..., N, 3) are solved in one pass.
+
+    Parameters
+    ----------
+    rcs_coords
+        Localization points in RCS as a (..., N, 3) array.
+    wcs_coords
+        Measurements in WCS as a (..., N, 3) array.
+    weights
+        Optional weights for the point pairs as a (..., N) array. Pairs with
+        weight 0 are ignored.
+
+    Returns
+    -------
+    :obj:`tuple` of :class:`numpy.ndarray`
+        The translation (..., 3) and the rotation matrix (..., 3, 3), where the
+        columns of the rotation matrix are the axes of the RCS in the WCS.
+    """
+    if weights is None:
+        rcs_centroid = rcs_coords.mean(axis=-2)
+        wcs_centroid = wcs_coords.mean(axis=-2)
+        weighted_rcs = rcs_coords - rcs_centroid[..., np.newaxis, :]
+    else:
+        w = weights[..., np.newaxis]
+        w_sum = w.sum(axis=-2)
+        rcs_centroid = (w * rcs_coords).sum(axis=-2) / w_sum
+        wcs_centroid = (w * wcs_coords).sum(axis=-2) / w_sum
+        weighted_rcs = w * (rcs_coords - rcs_centroid[..., np.newaxis, :])
+
+    H = np.einsum(
+        "...ni,...nj->...ij",
+        weighted_rcs,
+        wcs_coords - wcs_centroid[..., np.newaxis, :],
+    )
+    R, _ = _rotation_from_cross_covariance(H)
+    t = wcs_centroid - np.einsum("...ij,...j->...i", R, rcs_centroid)
+
+    return t, R
+
+
+def _rotation_from_cross_covariance(
+    H,  # type: np.ndarray
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """Best rotation for a (stacked) cross covariance matrix.
+
+    Parameters
+    ----------
+    H
+        Cross covariance matrix of the centered RCS and WCS points as a
+        (..., 3, 3) array.
+
+    Returns
+    -------
+    :obj:`tuple` of :class:`numpy.ndarray`
+        The rotation matrix (..., 3, 3) and the singular values of ``H`` with
+        the sign correction for reflections applied (..., 3). The sum of the
+        latter is the trace of ``R^T * H``.
+    """
+    U, S, Vt = np.linalg.svd(H)
+    V = np.swapaxes(Vt, -1, -2)
+    Ut = np.swapaxes(U, -1, -2)
+
+    # Flip the axis belonging to the smallest singular value if the best
+    # orthogonal matrix is a reflection.
+    d = np.sign(np.linalg.det(np.matmul(V, Ut)))
+    d = np.where(d == 0, 1.0, d)
+    D = np.ones(d.shape + (3,))
+    D[..., 2] = d
+
+    R = np.matmul(V * D[..., np.newaxis, :], Ut)
+
+    return R, S * D
+
+
+def _pad_point_sets(
+    point_sets,  # type: List[List[List[float]]]
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """Stack point sets of different length to a (K, N, 3) array.
+
+    Returns the stacked array and a (K, N) boolean mask where padding is
+    False.
+    """
+    if isinstance(point_sets, np.ndarray):
+        arr = np.asarray(point_sets, dtype=float)
+        if arr.ndim != 3 or arr.shape[2] != 3:
+            raise ValueError(
+                "Expected stacked point sets of shape (K, N, 3), got {}".format(
+                    arr.shape
+                )
+            )
+        return arr, np.ones(arr.shape[:2], dtype=bool)
+
+    arrays = [_coords_to_array(pts) for pts in point_sets]
+    n_max = max(len(arr) for arr in arrays) if arrays else 0
+
+    stacked = np.zeros((len(arrays), n_max, 3))
+    mask = np.zeros((len(arrays), n_max), dtype=bool)
+    for k, arr in enumerate(arrays):
+        stacked[k, : len(arr)] = arr
+        mask[k, : len(arr)] = True
+
+    return stacked, mask
+
+
+def _residuals(
+    x,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+):  # type: (...) -> np.ndarray
+    """Deviations of the transformed localization points from the measurements.
+
+    Parameters
+    ----------
+    x
+        The optimization variable (9x1).
+    rcs_coords
+        The localization points as a (N, 3) array.
+    wcs_coords
+        The measurements as a (N, 3) array.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The deviations as a (N, 3) array.
+    """
+    x_vec = x[3:6]
+    y_vec = x[6:9]
+    axes = np.array((x_vec, y_vec, np.cross(x_vec, y_vec)))
+
+    return x[0:3] + rcs_coords.dot(axes) - wcs_coords
+
+
+def _objective_function(
+    x,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
 ):  # type: (...) -> float
     """Objective function for the optimization problem.
 
     Parameters
     ----------
     x
-        The optimization variable (9x1)
-    args : :obj:`tuple`
-        The localization points and the measurements as a tuple of two
-        dimensional arrays where each row is one point. The columns are the X,
-        Y and Z coordinates.
+        The optimization variable (9x1).
+    rcs_coords
+        The localization points as a (N, 3) array where each row is one point.
+        The columns are the X, Y and Z coordinates.
+    wcs_coords
+        The measurements as a (N, 3) array.
 
     Returns
     -------
     :obj:`float`
-        The cost for the given optimization variable values.
+        The cost for the given optimization variable values, i.e. the sum of
+        the squared deviations from the measurements.
     """
-    origin = np.array(x[0:3])
-    x_vec = np.array(x[3:6])
-    y_vec = np.array(x[6:9])
-    z_vec = np.cross(x_vec, y_vec)
-
-    cost = 0
-    for point, measurement in zip(rcs_coords, wcs_coords):
-        # Calculate the deviation from the measurement using the given
-        # coordinate system (optimization variable) and add the square of it to
-        # the cost.
-        deviation = np.power(
-            origin
-            + point[0] * x_vec
-            + point[1] * y_vec
-            + point[2] * z_vec
-            - measurement,
-            2,
-        )
-        cost += sum(deviation)
+    residuals = _residuals(x, rcs_coords, wcs_coords)
+
+    return float(np.einsum("ij,ij->", residuals, residuals))
 
-    return cost
+
+def _objective_gradient(
+    x,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+):  # type: (...) -> np.ndarray
+    """Gradient of :func:`_objective_function`.
+
+    Parameters
+    ----------
+    x
+        The optimization variable (9x1).
+    rcs_coords
+        The localization points as a (N, 3) array.
+    wcs_coords
+        The measurements as a (N, 3) array.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The partial derivatives of the cost with respect to ``x`` (9x1).
+    """
+    x_vec = x[3:6]
+    y_vec = x[6:9]
+    residuals = _residuals(x, rcs_coords, wcs_coords)
+
+    # Row k is the sum of the residuals weighted by the k-th coordinate
+    weighted = rcs_coords.T.dot(residuals)
+
+    # The z axis is x cross y, so the derivative of r . (x cross y) is
+    # y cross r with respect to x and r cross x with respect to y.
+    return 2 * np.concatenate(
+        (
+            residuals.sum(axis=0),
+            weighted[0] + np.cross(y_vec, weighted[2]),
+            weighted[1] + np.cross(weighted[2], x_vec),
+        )
+    )
 
 
 def _nonlinear_constraints(x):  # type: (List[float]) -> List[float]
@@ -116,132 +322,424 @@ def _nonlinear_jacobian(x):  # type: (List[float]) -> List[List[float]]
     ]
 
 
-def _plot(
+def _svd_localization(
     rcs_coords,  # type: List[List[float]]
     wcs_coords,  # type: List[List[float]]
-    results,  # type: OptimizeResult
-):  # type: (...) -> None
-    """Create plots to visualize multiple consecutive results from a solver."""
-    import matplotlib.pyplot as plt
+):  # type: (...) -> List[List[float]]
+    """Calculate the RCS origin frame using :func:`_kabsch`."""
+    t, R = _kabsch(*_point_pairs_to_arrays(rcs_coords, wcs_coords))
+
+    return [t.tolist(), R[:, 0].tolist(), R[:, 1].tolist()]
+
 
-    rcs_coords = np.array(rcs_coords)
-    wcs_coords = np.array(wcs_coords)
+def _initial_guesses(
+    starts,  # type: int
+    full_rotation=False,  # type: bool
+):  # type: (...) -> np.ndarray
+    """Initial guesses for the SLSQP solver runs.
 
-    plot_dir = Path(tempfile.mkdtemp(prefix="localization_"))
-    print("Saving plots to {}".format(plot_dir))
+    Parameters
+    ----------
+    starts
+        Number of initial guesses.
+    full_rotation
+        Spread the guesses over all rotations (SO(3)) using a super-Fibonacci
+        spiral instead of only rotating the world axes about Z.
 
-    for i, res in enumerate(results):
-        dir_ = plot_dir / str(i)
-        dir_.mkdir()
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The optimization variables to start from as a (starts, 9) array. All
+        guesses have the origin at ``[0, 0, 0]``.
+    """
+    i = np.arange(starts, dtype=float)
+
+    if full_rotation:
+        # Alexa, 2022. "Super-Fibonacci Spirals: Fast, Low-Discrepancy
+        # Sampling of SO(3)".
+        phi = np.sqrt(2.0)
+        psi = 1.533751168755204288118041
+
+        s = i + 0.5
+        r = np.sqrt(s / starts)
+        R = np.sqrt(1.0 - s / starts)
+        alpha = 2.0 * np.pi * s / phi
+        beta = 2.0 * np.pi * s / psi
+
+        w = r * np.sin(alpha)
+        x = r * np.cos(alpha)
+        y = R * np.sin(beta)
+        z = R * np.cos(beta)
+
+        x_vecs = np.stack(
+            (1 - 2 * (y * y + z * z), 2 * (x * y + z * w), 2 * (x * z - y * w)),
+            axis=-1,
+        )
+        y_vecs = np.stack(
+            (2 * (x * y - z * w), 1 - 2 * (x * x + z * z), 2 * (y * z + x * w)),
+            axis=-1,
+        )
+    else:
+        radians = 2.0 * np.pi * i / starts
+        c, s = np.cos(radians), np.sin(radians)
+        zeros = np.zeros(starts)
 
-        _plot_result(rcs_coords, wcs_coords, res, dir_)
+        x_vecs = np.stack((c, s, zeros), axis=-1)
+        y_vecs = np.stack((-s, c, zeros), axis=-1)
 
-    # Create a plot summarizing the the different runs
-    objective_values = [result.fun for result in results]
-    summary_file_path = plot_dir / "summary.png"
-    plt.figure()
-    plt.plot(range(len(objective_values)), objective_values, "ro")
-    plt.ylabel("Objective value")
-    plt.xlabel("Run")
-    plt.title("Objective value for different x_0")
-    plt.savefig(summary_file_path)
+    return np.concatenate((np.zeros((starts, 3)), x_vecs, y_vecs), axis=-1)
 
 
-def _plot_result(
+def _warm_guess(
+    initial_frame,  # type: List[List[float]]
+    rcs_centroid,  # type: np.ndarray
+    wcs_centroid,  # type: np.ndarray
+):  # type: (...) -> np.ndarray
+    """Optimization variable of the centered problem from a prior frame.
+
+    The axes are orthonormalized, the origin is moved to the centroids like
+    the point sets, ``t + R * c_rcs - c_wcs``.
+    """
+    origin, x_vec, y_vec = [np.asarray(list(v), dtype=float) for v in initial_frame]
+
+    x_vec = x_vec / np.linalg.norm(x_vec)
+    y_vec = y_vec - x_vec.dot(y_vec) * x_vec
+    y_vec = y_vec / np.linalg.norm(y_vec)
+    axes = np.array((x_vec, y_vec, np.cross(x_vec, y_vec)))
+
+    origin = origin + rcs_centroid.dot(axes) - wcs_centroid
+
+    return np.concatenate((origin, x_vec, y_vec))
+
+
+def _solve_start(
+    x0,  # type: np.ndarray
     rcs_coords,  # type: np.ndarray
     wcs_coords,  # type: np.ndarray
-    result,  # type: OptimizeResult
-    plot_dir,  # type: Path
-):  # type: (...) -> None
-    """Create some plots that illustrate the result.
+    maxiter=200,  # type: int
+):  # type: (...) -> OptimizeResult
+    """Run SLSQP from one initial guess."""
+    constraints = {
+        "type": "eq",
+        "fun": _nonlinear_constraints,
+        "jac": _nonlinear_jacobian,
+    }
+
+    return minimize(
+        _objective_function,
+        x0,
+        args=(rcs_coords, wcs_coords),
+        jac=_objective_gradient,
+        method="SLSQP",  # Default method for problems with constraints
+        constraints=constraints,
+        options={"disp": True, "maxiter": maxiter},
+    )
+
+
+def _skew(v):  # type: (np.ndarray) -> np.ndarray
+    """(..., 3, 3) cross product matrices of (..., 3) vectors."""
+    x, y, z = np.moveaxis(v, -1, 0)
+    zeros = np.zeros_like(x)
+
+    return np.stack(
+        (
+            np.stack((zeros, -z, y), axis=-1),
+            np.stack((z, zeros, -x), axis=-1),
+            np.stack((-y, x, zeros), axis=-1),
+        ),
+        axis=-2,
+    )
+
+
+def _left_jacobian(w):  # type: (np.ndarray) -> np.ndarray
+    """Left jacobian of SO(3) at the rotation vector ``w``.
+
+    A change ``dw`` of the rotation vector rotates by ``J(w) * dw`` on the
+    left, ``exp([w + dw]) = exp([J(w) * dw]) * exp([w])``.
+    """
+    theta = np.linalg.norm(w)
+    K = _skew(w)
 
-    Parameters
-    ----------
-    rcs_coords
-    wcs_coords
-    result
-        The result from the solver
-    folder
-        The folder in which the plots should be stored.
+    if theta < 1e-8:
+        return np.eye(3) + 0.5 * K
 
-    Returns
-    -------
-    :obj:`str`
-        The path at which the plots were stored.
+    a = (1 - np.cos(theta)) / theta**2
+    b = (theta - np.sin(theta)) / theta**3
+
+    return np.eye(3) + a * K + b * K.dot(K)
+
+
+def _lm_residuals(
+    params,  # type: np.ndarray
+    R0,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+):  # type: (...) -> np.ndarray
+    """Flat deviations for the translation and rotation vector ``params``.
+
+    The rotation is ``exp([w]) * R0``, with the rotation vector ``w`` relative
+    to the rotation ``R0`` of the initial guess.
     """
-    import matplotlib.pyplot as plt
-
-    origin = result.x[0:3]
-    x_vec = result.x[3:6]
-    y_vec = result.x[6:9]
-    z_vec = np.cross(x_vec, y_vec)
-
-    x_axis = origin + 1000 * x_vec
-    y_axis = origin + 1000 * y_vec
-    # z_axis = origin + 1000 * z_vec
-
-    # Calculate the localization points in the new coordinate system
-    _transformed_points = []
-    for point in rcs_coords:
-        _transformed_points.append(
-            origin + point[0] * x_vec + point[1] * y_vec + point[2] * z_vec
+    R = Rotation.from_rotvec(params[3:]).as_matrix().dot(R0)
+
+    return (rcs_coords.dot(R.T) + params[:3] - wcs_coords).ravel()
+
+
+def _lm_jacobian(
+    params,  # type: np.ndarray
+    R0,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+):  # type: (...) -> np.ndarray
+    """(3N, 6) jacobian of :func:`_lm_residuals`."""
+    w = params[3:]
+    rotated = rcs_coords.dot(Rotation.from_rotvec(w).as_matrix().dot(R0).T)
+
+    J = np.zeros((len(rcs_coords), 3, 6))
+    J[:, [0, 1, 2], [0, 1, 2]] = 1
+    J[:, :, 3:] = -np.matmul(_skew(rotated), _left_jacobian(w))
+
+    return J.reshape(-1, 6)
+
+
+def _solve_start_lm(
+    x0,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+    maxiter=200,  # type: int
+):  # type: (...) -> OptimizeResult
+    """Run Levenberg-Marquardt from one initial guess.
+
+    Solves for the translation and a rotation vector, the result is converted
+    to the 9 entry optimization variable of :func:`_solve_start` with the
+    objective value in ``fun``.
+    """
+    x_vec, y_vec = x0[3:6], x0[6:9]
+    R0 = np.column_stack((x_vec, y_vec, np.cross(x_vec, y_vec)))
+
+    res = least_squares(
+        _lm_residuals,
+        np.concatenate((x0[0:3], np.zeros(3))),
+        jac=_lm_jacobian,
+        method="lm",
+        max_nfev=maxiter,
+        args=(R0, rcs_coords, wcs_coords),
+    )
+
+    R = Rotation.from_rotvec(res.x[3:]).as_matrix().dot(R0)
+
+    return OptimizeResult(
+        x=np.concatenate((res.x[:3], R[:, 0], R[:, 1])),
+        fun=2 * res.cost,
+        success=res.success,
+        status=res.status,
+        message=res.message,
+        nfev=res.nfev,
+        njev=res.njev,
+    )
+
+
+def _get_solve_start(method):  # type: (str) -> Callable
+    """Function running the solver from one initial guess."""
+    if method == "lm":
+        return _solve_start_lm
+
+    return _solve_start
+
+
+def _get_executor(executor):  # type: (Union[str, Executor]) -> Executor
+    """Get executor from name, named executors are shared between calls."""
+    if isinstance(executor, Executor):
+        return executor
+
+    with _POOLS_LOCK:
+        if executor not in _POOLS:
+            pool_type = (
+                ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            )
+            _POOLS[executor] = pool_type(max_workers=os.cpu_count())
+        return _POOLS[executor]
+
+
+def _run_starts(
+    x0s,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+    maxiter=200,  # type: int
+    executor=None,  # type: Union[None, str, Executor]
+    tol=None,  # type: Union[None, float]
+    method="slsqp",  # type: str
+):  # type: (...) -> List[OptimizeResult]
+    """Run the solver from each initial guess, stopping early below ``tol``."""
+    results = []
+    solve_start = _get_solve_start(method)
+
+    if not (executor is None or isinstance(executor, Executor)):
+        if executor not in EXECUTORS:
+            raise ValueError(
+                "Unknown executor {!r}, expected one of {}".format(
+                    executor, ", ".join(EXECUTORS)
+                )
+            )
+
+        # A single run gains nothing from a pool
+        if len(x0s) < 2:
+            executor = None
+
+    if executor is None:
+        for x0 in x0s:
+            res = solve_start(x0, rcs_coords, wcs_coords, maxiter=maxiter)
+            results.append(res)
+
+            if tol is not None and res.fun < tol:
+                break
+
+        return results
+
+    pool = _get_executor(executor)
+    futures = [
+        pool.submit(solve_start, x0, rcs_coords, wcs_coords, maxiter=maxiter)
+        for x0 in x0s
+    ]
+
+    for future in as_completed(futures):
+        res = future.result()
+        results.append(res)
+
+        if tol is not None and res.fun < tol:
+            # Starts already running can't be interrupted, they finish in
+            # the background but their results are discarded.
+            for f in futures:
+                f.cancel()
+            break
+
+    return results
+
+
+def _multistart_localization(
+    rcs_coords,  # type: List[List[float]]
+    wcs_coords,  # type: List[List[float]]
+    plot_results=False,  # type: Union[bool, str]
+    maxiter=200,  # type: int
+    starts=4,  # type: int
+    executor=None,  # type: Union[None, str, Executor]
+    tol=None,  # type: Union[None, float]
+    full_rotation=False,  # type: bool
+    initial_frame=None,  # type: Union[None, List[List[float]]]
+    fallback_rms=None,  # type: Union[None, float]
+    method="slsqp",  # type: str
+):  # type: (...) -> List[List[float]]
+    """Calculate the RCS origin frame from multiple SLSQP or LM solver runs."""
+    if starts < 1:
+        raise ValueError("starts needs to be at least 1, got {}.".format(starts))
+
+    rcs_coords, wcs_coords = _point_pairs_to_arrays(rcs_coords, wcs_coords)
+
+    # Solve for the origin relative to the centroids to keep the problem well
+    # conditioned for coordinates far from the WCS origin.
+    rcs_centroid = rcs_coords.mean(axis=0)
+    wcs_centroid = wcs_coords.mean(axis=0)
+    rcs_centered = rcs_coords - rcs_centroid
+    wcs_centered = wcs_coords - wcs_centroid
+
+    results = []
+
+    if initial_frame is not None:
+        x0 = _warm_guess(initial_frame, rcs_centroid, wcs_centroid)
+        solve_start = _get_solve_start(method)
+        warm = solve_start(x0, rcs_centered, wcs_centered, maxiter=maxiter)
+        results.append(warm)
+
+        if fallback_rms is None:
+            # A wrong local minimum deviates by about the size of the point set
+            spread = np.sqrt(np.einsum("ij,ij->", wcs_centered, wcs_centered))
+            fallback_rms = 1e-2 * spread / np.sqrt(len(wcs_coords))
+
+        warm_rms = np.sqrt(warm.fun / len(wcs_coords))
+        if not warm.success or not warm_rms <= fallback_rms:
+            initial_frame = None
+
+    if initial_frame is None:
+        results += _run_starts(
+            _initial_guesses(starts, full_rotation=full_rotation),
+            rcs_centered,
+            wcs_centered,
+            maxiter=maxiter,
+            executor=executor,
+            tol=tol,
+            method=method,
         )
-    transformed_points = np.array(_transformed_points)
-
-    plt.figure()
-    plt.plot(wcs_coords.T[0], wcs_coords.T[1], "bo")
-    plt.plot(transformed_points.T[0], wcs_coords.T[1], "rx")
-    plt.plot(origin[0], origin[1], "bx")
-    plt.plot(x_axis[0], x_axis[1], "rx")
-    plt.plot(y_axis[0], y_axis[1], "gx")
-    plt.xlabel("x")
-    plt.ylabel("y")
-    plt.title("X-Y projection")
-    plt.savefig(plot_dir / "rcs_matching_xy.png")
-
-    plt.figure()
-    plt.plot(wcs_coords.T[0], wcs_coords.T[2], "bo")
-    plt.plot(transformed_points.T[0], wcs_coords.T[2], "rx")
-    plt.plot(origin[0], origin[2], "bx")
-    plt.plot(x_axis[0], x_axis[2], "rx")
-    plt.plot(y_axis[0], y_axis[2], "gx")
-    plt.xlabel("x")
-    plt.ylabel("z")
-    plt.title("X-Z projection")
-    plt.savefig(plot_dir / "rcs_matching_xz.png")
-
-    plt.figure()
-    plt.plot(wcs_coords.T[1], wcs_coords.T[2], "bo")
-    plt.plot(transformed_points.T[1], wcs_coords.T[2], "rx")
-    plt.plot(origin[1], origin[2], "bx")
-    plt.plot(x_axis[1], x_axis[2], "rx")
-    plt.plot(y_axis[1], y_axis[2], "gx")
-    plt.xlabel("y")
-    plt.ylabel("z")
-    plt.title("Y-Z projection")
-    plt.savefig(plot_dir / "rcs_matching_yz.png")
+
+    for res in results:
+        # Move the origin back from the centered problem
+        x_vec, y_vec = res.x[3:6], res.x[6:9]
+        axes = np.array((x_vec, y_vec, np.cross(x_vec, y_vec)))
+        res.x[0:3] += wcs_centroid - rcs_centroid.dot(axes)
+
+    if plot_results:
+        from compas_mrr.plotting import _plot
+
+        plot_dir = None if plot_results is True else plot_results
+        _plot(rcs_coords, wcs_coords, results, plot_dir=plot_dir)
+
+    # Pick the result with the lowest objective value
+    result = reduce((lambda x, y: x if x.fun < y.fun else y), results)
+
+    origin = result.x[0:3].tolist()
+    x_vec = result.x[3:6].tolist()
+    y_vec = result.x[6:9].tolist()
+
+    return [origin, x_vec, y_vec]
 
 
 def arbitrary_pts_localization(
     rcs_coords,  # type: List[List[float]]
     wcs_coords,  # type: List[List[float]]
-    plot_results=False,  # type: bool
+    plot_results=False,  # type: Union[bool, str]
     maxiter=200,  # type: int
-):  # type: (...) -> List[List[float]]
+    method="svd",  # type: str
+    starts=4,  # type: int
+    executor=None,  # type: Union[None, str, Executor]
+    tol=None,  # type: Union[None, float]
+    full_rotation=False,  # type: bool
+    initial_frame=None,  # type: Union[None, List[List[float]]]
+    fallback_rms=None,  # type: Union[None, float]
+    full_output=False,  # type: bool
+):  # type: (...) -> Union[List[List[float]], Tuple[List[List[float]], LocalizationDiagnostics]]  # noqa: E501
     """Calculate the RCS origin frame.
 
-    Finding the origin is formulated as an optimization problem where we want
+    Finding the origin is formulated as a least squares problem where we want
     to find the origin and two orthonormal vectors defining the coordinate
-    system. At the same time, the position of the localization points in this
-    new coordinate system should match the measurements as close as possible.
-    Therefore the deviation from the measurements is used as the cost function.
-    The only constraints are that the x and y vector need to have length 1 and
-    be orthogonal to each other.  The optimization variable is a vector with 9
-    entries: X = [o, x, y] where o is the origin of the coordinate system and
-    x, y the vectors spanning the x-y-plane. Each of them is a 3 dimensional
-    vector.  **Important**: Ensure that the order of rcs_coords and
-    measurements is identical. I.e. the i-th entry in measurements is the
-    measurement of the i-th localization point.
+    system. The position of the localization points in this new coordinate
+    system should match the measurements as close as possible, so the sum of
+    squared deviations from the measurements is minimized.
+
+    With ``method="svd"`` (default) the problem is solved in closed form from
+    the singular value decomposition of the cross covariance matrix of the
+    centered point sets (Kabsch algorithm). The options of the iterative
+    solvers (``plot_results``, ``maxiter``, ``starts``, ``executor``, ``tol``,
+    ``full_rotation``, ``initial_frame`` and ``fallback_rms``) raise a
+    :exc:`ValueError` if they are changed from their defaults.
+
+    With ``method="slsqp"`` it is solved as a constrained optimization problem.
+    The optimization variable is a vector with 9 entries: X = [o, x, y] where o
+    is the origin of the coordinate system and x, y the vectors spanning the
+    x-y-plane. Each of them is a 3 dimensional vector. The constraints are that
+    the x and y vector need to have length 1 and be orthogonal to each other.
+    The solver is started from multiple initial guesses and the best result
+    is kept. The solver runs are independent and can be run on a thread or
+    process pool.
+
+    With ``method="lm"`` it is solved as an unconstrained least squares problem
+    over the 6 degrees of freedom, the origin and a rotation vector relative to
+    the initial guess, using Levenberg-Marquardt with the analytic jacobian.
+    The axes are exactly orthonormal and it needs fewer iterations than SLSQP.
+    Initial guesses are used like for ``method="slsqp"``.
+
+    **Important**: Ensure that the order of rcs_coords and measurements is
+    identical. I.e. the i-th entry in measurements is the measurement of the
+    i-th localization point. At least three point pairs are needed, otherwise
+    a :exc:`ValueError` is raised.
 
     Parameters
     ----------
@@ -252,6 +750,49 @@ def arbitrary_pts_localization(
         The measurements taken in the world coordinate system (WCS) with the
         total station. These are the coordinates of the rcs_coords in
         the WCS.
+    plot_results
+        Save a record of the solver runs and render plots of them on a
+        background thread, see :mod:`compas_mrr.plotting`. Either ``True`` to
+        use a directory in the temporary directory or the directory to use.
+        Only used with ``method="slsqp"`` and ``method="lm"``.
+    maxiter
+        Maximum number of iterations per solver run, or of function evaluations
+        with ``method="lm"``. Only used with ``method="slsqp"`` and
+        ``method="lm"``.
+    method
+        Solver to use, either ``"svd"``, ``"slsqp"`` or ``"lm"``.
+    starts
+        Number of initial guesses for ``method="slsqp"`` and ``method="lm"``,
+        at least 1.
+    executor
+        Run the solver runs for ``method="slsqp"`` or ``method="lm"``
+        concurrently, either on a pool shared between calls (``"thread"`` or
+        ``"process"``) or on a given :class:`concurrent.futures.Executor`.
+        A single run is not handed to the shared pools. Defaults to running
+        them one after another.
+    tol
+        Stop when a solver run reaches an objective value (sum of squared
+        deviations) below this value and skip the remaining runs.
+    full_rotation
+        Spread the initial guesses over all rotations instead of only rotating
+        the world axes about the Z axis. Use this if the robot base might be
+        tilted.
+    initial_frame
+        Prior frame as origin, x axis and y axis (or a
+        :class:`compas.geometry.Frame`), e.g. the result of the previous
+        localization. With ``method="slsqp"`` or ``method="lm"`` a single
+        solver run is started from it instead of the ``starts`` initial
+        guesses, which is faster if the robot only moved a little. Not
+        available with ``method="svd"``, which is solved in closed form and
+        has no initial guess.
+    fallback_rms
+        RMS deviation above which the run from ``initial_frame`` is considered
+        stuck in a wrong minimum, and the solver is run from all ``starts``
+        initial guesses as without ``initial_frame``. Defaults to 1% of the
+        RMS distance of the measurements from their centroid.
+    full_output
+        Also return residuals, RMS deviation and covariance of the frame, see
+        :func:`compas_mrr.diagnostics.localization_diagnostics`.
 
     Returns
     -------
@@ -259,42 +800,99 @@ def arbitrary_pts_localization(
         A tuple of 3 vectors (lists with 3 elements) where the first represents
         the origin of the RCS, the second is the direction of the x axis and
         the third the direction of the y axis. The x and y axis are vectors
-        with length 1.
+        with length 1. With ``full_output=True`` a tuple of the frame and a
+        :class:`compas_mrr.diagnostics.LocalizationDiagnostics`.
     """
-    # Setup the constraints
-    constraints = {"type": "eq", "fun": _nonlinear_constraints}
-
-    results = []
-    slices = 4
-    for i in range(slices):
-        radians = np.deg2rad(360.0 / float(slices) * i)
-        c, s = np.cos(radians), np.sin(radians)
-        rotation = np.array(((c, -s, 0), (s, c, 0), (0, 0, 1)))
-
-        x = rotation.dot(np.array([1, 0, 0]))
-        y = rotation.dot(np.array([0, 1, 0]))
-
-        # We use the standard coordinate system as an initial guess.
-        x0 = np.array(np.concatenate(([0, 0, 0], x, y)))
-        res = minimize(
-            _objective_function,
-            x0,
-            args=(rcs_coords, wcs_coords),
-            method="SLSQP",  # Default method for problems with constraints
-            constraints=constraints,
-            options={"disp": True, "maxiter": maxiter},
+    if method == "svd":
+        iterative_options = (
+            ("plot_results", plot_results, False),
+            ("maxiter", maxiter, 200),
+            ("starts", starts, 4),
+            ("executor", executor, None),
+            ("tol", tol, None),
+            ("full_rotation", full_rotation, False),
+            ("initial_frame", initial_frame, None),
+            ("fallback_rms", fallback_rms, None),
+        )
+        for name, value, default in iterative_options:
+            changed = value is not None if default is None else value != default
+            if changed:
+                raise ValueError(
+                    "{} is only used with method='slsqp' or method='lm'.".format(name)
+                )
+
+        frame = _svd_localization(rcs_coords, wcs_coords)
+    elif method in ("slsqp", "lm"):
+        frame = _multistart_localization(
+            rcs_coords,
+            wcs_coords,
+            plot_results=plot_results,
+            maxiter=maxiter,
+            starts=starts,
+            executor=executor,
+            tol=tol,
+            full_rotation=full_rotation,
+            initial_frame=initial_frame,
+            fallback_rms=fallback_rms,
+            method=method,
+        )
+    else:
+        raise ValueError(
+            "Unknown method {!r}, expected one of {}".format(method, ", ".join(METHODS))
         )
 
-        results.append(res)
+    if full_output:
+        from compas_mrr.diagnostics import localization_diagnostics
 
-    if plot_results:
-        _plot(rcs_coords, wcs_coords, results)
+        return frame, localization_diagnostics(rcs_coords, wcs_coords, frame)
 
-    # Pick the result with the lowest objective value
-    result = reduce((lambda x, y: x if x.fun < y.fun else y), results)
+    return frame
 
-    origin = result.x[0:3].tolist()
-    x_vec = result.x[3:6].tolist()
-    y_vec = result.x[6:9].tolist()
 
-    return [origin, x_vec, y_vec]
+def batch_arbitrary_pts_localization(
+    rcs_sets,  # type: List[List[List[float]]]
+    wcs_sets,  # type: List[List[List[float]]]
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """Calculate the RCS origin frames for many sets of point pairs at once.
+
+    Every set is solved in closed form like ``method="svd"`` in
+    :func:`arbitrary_pts_localization`, but all sets are solved in one
+    vectorized pass.
+
+    Parameters
+    ----------
+    rcs_sets
+        K sets of localization points in RCS, either as a (K, N, 3) array or as
+        a sequence of K point sequences. Sets may differ in length.
+    wcs_sets
+        K sets of measurements in WCS, matching ``rcs_sets`` in shape and
+        order.
+
+    Returns
+    -------
+    :obj:`tuple` of :class:`numpy.ndarray`
+        A (K, 3, 3) array of frames where each frame is origin, x axis and y
+        axis like the result of :func:`arbitrary_pts_localization`, and a (K,)
+        array with the root mean square deviation from the measurements for
+        each set.
+    """
+    rcs_coords, rcs_mask = _pad_point_sets(rcs_sets)
+    wcs_coords, wcs_mask = _pad_point_sets(wcs_sets)
+
+    if rcs_coords.shape != wcs_coords.shape or np.any(rcs_mask != wcs_mask):
+        raise ValueError("rcs_sets and wcs_sets need to have the same shape.")
+
+    counts = rcs_mask.sum(axis=1)
+    if np.any(counts < 3):
+        raise ValueError("Every set needs at least three point pairs.")
+
+    t, R = _kabsch(rcs_coords, wcs_coords, weights=rcs_mask.astype(float))
+
+    deviations = np.einsum("kij,knj->kni", R, rcs_coords) + t[:, np.newaxis]
+    deviations -= wcs_coords
+    squared = np.where(rcs_mask, np.einsum("kni,kni->kn", deviations, deviations), 0)
+    rms = np.sqrt(squared.sum(axis=1) / counts)
+
+    frames = np.stack((t, R[..., 0], R[..., 1]), axis=1)
+
+    return frames, rms
@@ -0,0 +1,350 @@
+"""
+*******************************************************************************
+Cache of localization results keyed on the measured coordinates.
+*******************************************************************************
+
+Grasshopper recomputes a solver component whenever anything upstream changes,
+even if the point sets are the same. :func:`cached_localization` wraps a
+localization function so a repeated call with the same coordinates (rounded to
+``decimals``) and the same options returns the stored result instead of
+solving again.
+
+Results are kept in memory in least recently used order, and optionally written
+to a directory so they survive restarts of a long running process like
+:mod:`compas_mrr.server` or a ``compas.rpc`` server. Stored results are plain
+arrays in ``.npz`` files, loaded without unpickling, so a file placed in the
+directory can at most give a wrong result, not run code. Only results made of
+numbers, lists, arrays, tuples and the result types of compas_mrr are written
+to the directory, others are only kept in memory::
+
+    from compas_mrr.cache import cached_localization
+    from compas_mrr import arbitrary_pts_localization
+
+    localize = cached_localization(arbitrary_pts_localization, directory="cache")
+    frame = localize(rcs_coords, wcs_coords, method="slsqp")
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from compas_mrr.arbitrary_pts_localization import _coords_to_array
+from compas_mrr.diagnostics import LeaveOneOutDiagnostics
+from compas_mrr.diagnostics import LocalizationDiagnostics
+from compas_mrr.utils import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any  # noqa: F401
+    from typing import Callable  # noqa: F401
+    from typing import Dict  # noqa: F401
+    from typing import List  # noqa: F401
+    from typing import Union  # noqa: F401
+
+# Options that don't change the result and are left out of the key.
+IGNORED_OPTIONS = ("executor",)
+
+_MISSING = object()
+
+# Named tuples that can be restored from the directory store
+_RESULT_TYPES = {
+    cls.__name__: cls for cls in (LocalizationDiagnostics, LeaveOneOutDiagnostics)
+}
+
+
+class _NotStorable(Exception):
+    pass
+
+
+def _encode(value, arrays):  # type: (Any, Dict[str, np.ndarray]) -> Any
+    """JSON layout of a result, adding its arrays to ``arrays``."""
+    if value is None:
+        return {"none": True}
+
+    if isinstance(value, tuple):
+        name = type(value).__name__
+        if name in _RESULT_TYPES and isinstance(value, _RESULT_TYPES[name]):
+            return {"type": name, "items": [_encode(v, arrays) for v in value]}
+        if type(value) is tuple:
+            return {"items": [_encode(v, arrays) for v in value]}
+        raise _NotStorable(name)
+
+    if isinstance(value, (np.number, np.bool_)):
+        kind = "number"
+    elif isinstance(value, (bool, int, float)):
+        kind = "scalar"
+    elif isinstance(value, list):
+        kind = "list"
+    elif isinstance(value, np.ndarray):
+        kind = "array"
+    else:
+        raise _NotStorable(type(value).__name__)
+
+    try:
+        array = np.asarray(value)
+    except ValueError:
+        raise _NotStorable("ragged list")
+
+    if array.dtype.kind not in "biufc":
+        raise _NotStorable(str(array.dtype))
+
+    key = "a{}".format(len(arrays))
+    arrays[key] = array
+
+    return {kind: key}
+
+
+def _decode(layout, arrays):  # type: (Any, Any) -> Any
+    if "none" in layout:
+        return None
+
+    if "items" in layout:
+        items = [_decode(item, arrays) for item in layout["items"]]
+        if "type" in layout:
+            return _RESULT_TYPES[layout["type"]](*items)
+        return tuple(items)
+
+    if "scalar" in layout:
+        return arrays[layout["scalar"]].item()
+
+    if "number" in layout:
+        return arrays[layout["number"]][()]
+
+    if "list" in layout:
+        return arrays[layout["list"]].tolist()
+
+    return arrays[layout["array"]]
+
+
+class LocalizationCache(object):
+    """Least recently used store of localization results.
+
+    Parameters
+    ----------
+    maxsize
+        Number of results kept in memory.
+    decimals
+        Coordinates are rounded to this number of decimals before hashing, so
+        noise below it doesn't cause a new solve.
+    directory
+        Directory to also store results in, created if missing. Results found
+        there are loaded into memory on first use. Only in memory by default.
+        See module documentation for the stored results.
+
+    Attributes
+    ----------
+    hits
+        Number of results returned from the cache.
+    misses
+        Number of results that had to be computed.
+    """
+
+    def __init__(
+        self,
+        maxsize=128,  # type: int
+        decimals=6,  # type: int
+        directory=None,  # type: Union[None, str]
+    ):  # type: (...) -> None
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+        self._results = OrderedDict()  # type: OrderedDict
+        self._lock = threading.Lock()
+
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __len__(self):  # type: () -> int
+        return len(self._results)
+
+    def key(
+        self,
+        name,  # type: str
+        rcs_coords,  # type: List[List[float]]
+        wcs_coords,  # type: List[List[float]]
+        options=None,  # type: Union[None, Dict[str, Any]]
+    ):  # type: (...) -> str
+        """Hash of a function name, rounded coordinates and options.
+
+        Parameters
+        ----------
+        name
+            Name of the localization function.
+        rcs_coords
+            Localization points in RCS.
+        wcs_coords
+            Measurements in WCS.
+        options
+            Keyword arguments of the localization function. Their ``repr``
+            is hashed, so they should be plain values.
+
+        Returns
+        -------
+        :obj:`str`
+            Hexadecimal SHA-256 digest.
+        """
+        digest = hashlib.sha256(name.encode("utf-8"))
+
+        for coords in (rcs_coords, wcs_coords):
+            # adding 0.0 turns -0.0 into 0.0
+            rounded = np.round(_coords_to_array(coords), self.decimals) + 0.0
+            digest.update(repr(rounded.shape).encode("utf-8"))
+            digest.update(np.ascontiguousarray(rounded, dtype="<f8").tobytes())
+
+        options = sorted((options or {}).items())
+        digest.update(repr(options).encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def _path(self, key):  # type: (str) -> str
+        return os.path.join(self.directory, key + ".npz")
+
+    def _load(self, key):  # type: (str) -> Any
+        try:
+            with np.load(self._path(key), allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            layout = json.loads(str(arrays.pop("layout")))
+            return _decode(layout, arrays)
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return _MISSING
+
+    def _store(self, key, result):  # type: (str, Any) -> None
+        arrays = {}  # type: Dict[str, np.ndarray]
+        try:
+            layout = _encode(result, arrays)
+        except _NotStorable:
+            return
+
+        path = self._path(key)
+        tmp_path = "{}.{}.tmp".format(path, threading.current_thread().ident)
+        with open(tmp_path, "wb") as f:
+            np.savez(f, layout=np.array(json.dumps(layout)), **arrays)
+        os.replace(tmp_path, path)
+
+    def get(self, key, default=None):  # type: (str, Any) -> Any
+        """Get a copy of the result stored for a key."""
+        with self._lock:
+            result = self._results.pop(key, _MISSING)
+            if result is not _MISSING:
+                self._results[key] = result
+
+        if result is _MISSING and self.directory is not None:
+            result = self._load(key)
+            if result is not _MISSING:
+                self._remember(key, result)
+
+        if result is _MISSING:
+            return default
+
+        return copy.deepcopy(result)
+
+    def _remember(self, key, result):  # type: (str, Any) -> None
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = result
+
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def put(self, key, result):  # type: (str, Any) -> None
+        """Store a copy of a result for a key."""
+        result = copy.deepcopy(result)
+        self._remember(key, result)
+
+        if self.directory is not None:
+            self._store(key, result)
+
+    def clear(self):  # type: () -> None
+        """Remove all results from memory and the directory."""
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".npz"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def localize(self, func, rcs_coords, wcs_coords, **kwargs):
+        # type: (Callable, List[List[float]], List[List[float]], Any) -> Any
+        """Call a localization function or return its stored result.
+
+        Calls with ``plot_results`` enabled are always solved, so the plots
+        are created.
+        """
+        if kwargs.get("plot_results"):
+            return func(rcs_coords, wcs_coords, **kwargs)
+
+        options = {k: v for k, v in kwargs.items() if k not in IGNORED_OPTIONS}
+        name = "{}.{}".format(func.__module__, func.__name__)
+        key = self.key(name, rcs_coords, wcs_coords, options)
+
+        result = self.get(key, _MISSING)
+        if result is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return result
+
+        with self._lock:
+            self.misses += 1
+
+        result = func(rcs_coords, wcs_coords, **kwargs)
+        self.put(key, result)
+
+        return result
+
+
+def cached_localization(
+    func,  # type: Callable
+    maxsize=128,  # type: int
+    decimals=6,  # type: int
+    directory=None,  # type: Union[None, str]
+    cache=None,  # type: Union[None, LocalizationCache]
+):  # type: (...) -> Callable
+    """Wrap a localization function with a :class:`LocalizationCache`.
+
+    Parameters
+    ----------
+    func
+        Function taking RCS and WCS coordinates as the first two arguments,
+        e.g. :func:`compas_mrr.arbitrary_pts_localization`. Other arguments
+        need to be given as keywords.
+    maxsize
+        Number of results kept in memory.
+    decimals
+        Coordinates are rounded to this number of decimals before hashing.
+    directory
+        Directory to also store results in.
+    cache
+        Cache to use instead of creating one, e.g. to share it between
+        functions. ``maxsize``, ``decimals`` and ``directory`` are ignored.
+
+    Returns
+    -------
+    :obj:`callable`
+        The wrapped function, with the cache as ``cache`` attribute.
+    """
+    if cache is None:
+        cache = LocalizationCache(
+            maxsize=maxsize, decimals=decimals, directory=directory
+        )
+
+    @functools.wraps(func)
+    def wrapper(rcs_coords, wcs_coords, **kwargs):
+        return cache.localize(func, rcs_coords, wcs_coords, **kwargs)
+
+    wrapper.cache = cache
+
+    return wrapper
@@ -0,0 +1,290 @@
+"""
+*******************************************************************************
+Pairing of localization points in RCS with their measurements in WCS.
+*******************************************************************************
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+from collections import namedtuple
+
+from compas_mrr.utils import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any  # noqa: F401
+    from typing import Dict  # noqa: F401
+    from typing import Hashable  # noqa: F401
+    from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
+
+    import numpy as np  # noqa: F401
+
+PointCorrespondence = namedtuple(
+    "PointCorrespondence",
+    ["rcs_coords", "wcs_coords", "keys", "missing_rcs", "missing_wcs", "duplicates"],
+)
+PointCorrespondence.__doc__ = """Result of :func:`match_points`.
+
+Attributes
+----------
+rcs_coords
+    Coordinates of the matched RCS points.
+wcs_coords
+    Coordinates of the matched WCS points, in the same order.
+keys
+    The key of each matched pair.
+missing_rcs
+    Keys of WCS points without a RCS point.
+missing_wcs
+    Keys of RCS points without a WCS point.
+duplicates
+    Keys found more than once in either set.
+"""
+
+
+def _coords(pt):  # type: (Any) -> List[float]
+    """Coordinates of a point or the origin of a frame."""
+    if hasattr(pt, "point"):
+        pt = pt.point
+
+    return [float(c) for c in pt]
+
+
+def _is_labeled(points):  # type: (List[Any]) -> bool
+    return all(hasattr(pt, "pt_name") for pt in points)
+
+
+def _index_points(
+    points,  # type: List[Any]
+    by_prefix,  # type: bool
+    start,  # type: int
+):  # type: (...) -> Tuple[Dict[Hashable, Any], List[Hashable]]
+    """Hash points by key, last occurrence wins.
+
+    Labeled points are keyed on prefix and index of the point name, unlabeled
+    points on their position in the sequence.
+    """
+    index = OrderedDict()  # type: Dict[Hashable, Any]
+    duplicates = []  # type: List[Hashable]
+
+    for i, pt in enumerate(points):
+        if hasattr(pt, "pt_name"):
+            key = pt._split_pt_name() if by_prefix else pt.idx
+        else:
+            key = start + i
+
+        if key in index and key not in duplicates:
+            duplicates.append(key)
+        index[key] = pt
+
+    return index, duplicates
+
+
+def match_points(
+    rcs_points,  # type: List[Any]
+    wcs_points,  # type: List[Any]
+    start=1,  # type: int
+):  # type: (...) -> PointCorrespondence
+    """Pair RCS points with their WCS measurements by point name.
+
+    Points are matched on the prefix and index of
+    :attr:`compas_mrr.MeasurementPoint.pt_name` using a hash join, so the
+    order of the two sets does not matter. Points without a name (e.g. plain
+    points or frames from the robot) are keyed on their position in the
+    sequence starting at ``start``, and are matched on the index of the named
+    points only. I.e. the first frame of the robot is paired with ``LP1``.
+
+    If a key is found more than once in a set the last point is used and the
+    key is reported as a duplicate.
+
+    Parameters
+    ----------
+    rcs_points
+        Points or frames in RCS.
+    wcs_points
+        Measured points in WCS.
+    start
+        Index of the first unnamed point.
+
+    Returns
+    -------
+    :class:`PointCorrespondence`
+        The matched coordinates in order of the WCS points, which can be passed
+        to :func:`compas_mrr.arbitrary_pts_localization`, and the keys of
+        missing and duplicate points.
+
+    Examples
+    --------
+    >>> from compas_mrr import MeasurementPoint
+    >>> rcs = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+    >>> wcs = [MeasurementPoint(10, 0, 0, "LP2"), MeasurementPoint(9, 0, 0, "LP1")]
+    >>> result = match_points(rcs, wcs)
+    >>> result.rcs_coords
+    [[1.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    >>> result.missing_rcs, result.missing_wcs
+    ([], [3])
+    """
+    rcs_points = list(rcs_points)
+    wcs_points = list(wcs_points)
+
+    by_prefix = _is_labeled(rcs_points) and _is_labeled(wcs_points)
+
+    rcs_index, rcs_duplicates = _index_points(rcs_points, by_prefix, start)
+    wcs_index, wcs_duplicates = _index_points(wcs_points, by_prefix, start)
+
+    keys = []
+    rcs_coords = []
+    wcs_coords = []
+    missing_rcs = []
+
+    for key, wcs_pt in wcs_index.items():
+        rcs_pt = rcs_index.get(key)
+        if rcs_pt is None:
+            missing_rcs.append(key)
+            continue
+
+        keys.append(key)
+        rcs_coords.append(_coords(rcs_pt))
+        wcs_coords.append(_coords(wcs_pt))
+
+    missing_wcs = [key for key in rcs_index if key not in wcs_index]
+    duplicates = rcs_duplicates + [k for k in wcs_duplicates if k not in rcs_duplicates]
+
+    return PointCorrespondence(
+        rcs_coords, wcs_coords, keys, missing_rcs, missing_wcs, duplicates
+    )
+
+
+def _principal_axes(coords):  # type: (np.ndarray) -> np.ndarray
+    """Principal axes of a centered point set as columns of a rotation matrix."""
+    import numpy as np
+
+    _, _, Vt = np.linalg.svd(coords, full_matrices=False)
+    axes = Vt.T
+    if np.linalg.det(axes) < 0:
+        axes[:, 2] *= -1
+
+    return axes
+
+
+def _icp(
+    rcs_coords,  # type: np.ndarray
+    tree,  # type: Any
+    t,  # type: np.ndarray
+    R,  # type: np.ndarray
+    max_iterations=50,  # type: int
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray, np.ndarray]
+    """Iterative closest point from an initial transformation.
+
+    Returns the transformation and the nearest WCS point of each RCS point.
+    """
+    import numpy as np
+
+    from compas_mrr.arbitrary_pts_localization import _kabsch
+
+    nearest = None
+
+    for _ in range(max_iterations):
+        _, new_nearest = tree.query(rcs_coords.dot(R.T) + t)
+
+        if nearest is not None and np.array_equal(nearest, new_nearest):
+            break
+
+        nearest = new_nearest
+
+        # Only fit to pairs not sharing a measurement with other points
+        counts = np.bincount(nearest, minlength=len(tree.data))
+        unique = counts[nearest] == 1
+        if unique.sum() < 3:
+            break
+
+        t, R = _kabsch(rcs_coords[unique], tree.data[nearest[unique]])
+
+    return t, R, nearest
+
+
+def find_correspondences(
+    rcs_coords,  # type: List[List[float]]
+    wcs_coords,  # type: List[List[float]]
+    max_distance=None,  # type: Union[None, float]
+    max_iterations=50,  # type: int
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """Pair unlabeled RCS points with WCS measurements.
+
+    The point sets are first aligned on their centroids and principal axes,
+    trying the four proper rotations between the axes. Each alignment is then
+    refined with iterative closest point (ICP) using a KD-tree of the
+    measurements, and the alignment with the lowest deviation is kept.
+    Finally points are paired if they are each other's nearest neighbour.
+
+    The alignment from principal axes needs both sets to mostly contain the
+    same points and is ambiguous for symmetric point sets (e.g. points on a
+    regular grid). Use names instead where possible (see
+    :func:`match_points`).
+
+    Parameters
+    ----------
+    rcs_coords
+        Localization points in RCS.
+    wcs_coords
+        Measurements in WCS, in any order. May contain points that are not
+        localization points and vice versa.
+    max_distance
+        Maximum distance between a transformed RCS point and its measurement
+        to pair them.
+    max_iterations
+        Maximum number of ICP iterations per alignment.
+
+    Returns
+    -------
+    :obj:`tuple` of :class:`numpy.ndarray`
+        Indices into ``rcs_coords`` and the indices of the paired points in
+        ``wcs_coords``.
+    """
+    import numpy as np
+    from scipy.spatial import cKDTree
+
+    from compas_mrr.arbitrary_pts_localization import _coords_to_array
+
+    rcs_coords = _coords_to_array(rcs_coords)
+    wcs_coords = _coords_to_array(wcs_coords)
+
+    if len(rcs_coords) < 3 or len(wcs_coords) < 3:
+        raise ValueError("At least three points are needed in each set.")
+
+    tree = cKDTree(wcs_coords)
+
+    rcs_centroid = rcs_coords.mean(axis=0)
+    wcs_centroid = wcs_coords.mean(axis=0)
+    rcs_axes = _principal_axes(rcs_coords - rcs_centroid)
+    wcs_axes = _principal_axes(wcs_coords - wcs_centroid)
+
+    best = None
+    for flip in ([1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]):
+        R = (wcs_axes * flip).dot(rcs_axes.T)
+        t = wcs_centroid - R.dot(rcs_centroid)
+
+        t, R, _ = _icp(rcs_coords, tree, t, R, max_iterations=max_iterations)
+        distances, _ = tree.query(rcs_coords.dot(R.T) + t)
+        cost = np.median(distances)
+
+        if best is None or cost < best[0]:
+            best = (cost, t, R)
+
+    _, t, R = best
+    transformed = rcs_coords.dot(R.T) + t
+
+    distances, nearest_wcs = tree.query(transformed)
+    _, nearest_rcs = cKDTree(transformed).query(wcs_coords)
+
+    mutual = nearest_rcs[nearest_wcs] == np.arange(len(rcs_coords))
+    if max_distance is not None:
+        mutual &= distances <= max_distance
+
+    rcs_idxs = np.flatnonzero(mutual)
+
+    return rcs_idxs, nearest_wcs[rcs_idxs]
@@ -0,0 +1,236 @@
+"""
+*******************************************************************************
+Quality measures of a localization.
+*******************************************************************************
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import namedtuple
+
+import numpy as np
+
+from compas_mrr.arbitrary_pts_localization import _coords_to_array
+from compas_mrr.arbitrary_pts_localization import _rotation_from_cross_covariance
+from compas_mrr.utils import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
+
+LocalizationDiagnostics = namedtuple(
+    "LocalizationDiagnostics", ["residuals", "distances", "rms", "covariance"]
+)
+LocalizationDiagnostics.__doc__ = """Result of :func:`localization_diagnostics`.
+
+Attributes
+----------
+residuals
+    (N, 3) deviations of the transformed RCS points from the measurements in
+    WCS.
+distances
+    (N,) lengths of the residuals.
+rms
+    Root mean square of the distances.
+covariance
+    (6, 6) covariance of the frame as translation of the origin followed by a
+    small rotation vector (radians) of the axes, both in WCS.
+"""
+
+LeaveOneOutDiagnostics = namedtuple(
+    "LeaveOneOutDiagnostics",
+    ["residuals", "distances", "rms", "translations", "rotations"],
+)
+LeaveOneOutDiagnostics.__doc__ = """Result of :func:`leave_one_out_diagnostics`.
+
+Attributes
+----------
+residuals
+    (N, 3) deviations of each RCS point, transformed with the frame localized
+    without it, from its measurement in WCS.
+distances
+    (N,) lengths of the residuals.
+rms
+    Root mean square of the distances.
+translations
+    (N, 3) change of the origin when leaving out each point.
+rotations
+    (N, 3) change of the axes when leaving out each point, as rotation vectors
+    (radians) in WCS.
+"""
+
+
+def _frame_to_rotation(frame):  # type: (List[List[float]]) -> Tuple[np.ndarray, np.ndarray]
+    """Origin and rotation matrix with the frame axes as columns."""
+    origin, x_vec, y_vec = np.asarray(frame, dtype=float)
+
+    return origin, np.column_stack((x_vec, y_vec, np.cross(x_vec, y_vec)))
+
+
+def _pose_jacobian(rotated):  # type: (np.ndarray) -> np.ndarray
+    """(N, 3, 6) jacobian of the transformed points w.r.t. translation and rotation.
+
+    ``rotated`` are the RCS points rotated into WCS, the derivative of
+    ``exp([w]) R r + t`` w.r.t. ``w`` at zero is ``-[R r]``.
+    """
+    n_points = len(rotated)
+    J = np.zeros((n_points, 3, 6))
+    J[:, [0, 1, 2], [0, 1, 2]] = 1
+
+    x, y, z = rotated.T
+    J[:, 0, 4], J[:, 0, 5] = z, -y
+    J[:, 1, 3], J[:, 1, 5] = -z, x
+    J[:, 2, 3], J[:, 2, 4] = y, -x
+
+    return J
+
+
+def _normal_matrix(rotated):  # type: (np.ndarray) -> np.ndarray
+    J = _pose_jacobian(rotated)
+
+    return np.einsum("nia,nib->ab", J, J)
+
+
+def _invert(N):  # type: (np.ndarray) -> np.ndarray
+    try:
+        return np.linalg.inv(N)
+    except np.linalg.LinAlgError:
+        return np.full(N.shape, np.inf)
+
+
+def localization_diagnostics(
+    rcs_coords,  # type: List[List[float]]
+    wcs_coords,  # type: List[List[float]]
+    frame,  # type: List[List[float]]
+    sigma=None,  # type: Union[None, float]
+):  # type: (...) -> LocalizationDiagnostics
+    """Residuals, RMS deviation and covariance of a localization.
+
+    The covariance is propagated from the jacobian of the transformed points at
+    the solution, ``sigma ** 2 * inv(J^T J)``. It is cheap enough to compute
+    after every localization, e.g. to reject a localization where the standard
+    deviation of the origin is too large.
+
+    Parameters
+    ----------
+    rcs_coords
+        Localization points in RCS.
+    wcs_coords
+        Measurements in WCS, in the same order.
+    frame
+        The localized frame as origin, x axis and y axis, see
+        :func:`compas_mrr.arbitrary_pts_localization`.
+    sigma
+        Standard deviation of a measured coordinate, e.g. from the accuracy of
+        the total station. Defaults to the estimate from the residuals,
+        ``sqrt(sum(distances ** 2) / (3 * N - 6))``.
+
+    Returns
+    -------
+    :class:`LocalizationDiagnostics`
+
+    Examples
+    --------
+    >>> rcs = [[0, 0, 0], [1000, 0, 0], [0, 1000, 0], [0, 0, 1000]]
+    >>> wcs = [[10, 20, 30], [1010, 20, 30], [10, 1020, 30], [10, 20, 1030]]
+    >>> frame = [[10, 20, 30], [1, 0, 0], [0, 1, 0]]
+    >>> result = localization_diagnostics(rcs, wcs, frame, sigma=1.0)
+    >>> float(result.rms)
+    0.0
+    >>> np.sqrt(np.diag(result.covariance))[:3].round(3)
+    array([0.592, 0.592, 0.592])
+    """
+    rcs_coords = _coords_to_array(rcs_coords)
+    wcs_coords = _coords_to_array(wcs_coords)
+
+    n_points = len(rcs_coords)
+    if n_points != len(wcs_coords):
+        raise ValueError("Point sets need to have the same length.")
+    if n_points < 3:
+        raise ValueError("At least three point pairs are needed.")
+
+    origin, R = _frame_to_rotation(frame)
+
+    rotated = rcs_coords.dot(R.T)
+    residuals = rotated + origin - wcs_coords
+    squared = np.einsum("ij,ij->i", residuals, residuals)
+
+    if sigma is None:
+        variance = squared.sum() / (3 * n_points - 6)
+    else:
+        variance = sigma**2
+
+    covariance = variance * _invert(_normal_matrix(rotated))
+
+    return LocalizationDiagnostics(
+        residuals, np.sqrt(squared), np.sqrt(squared.mean()), covariance
+    )
+
+
+def leave_one_out_diagnostics(rcs_coords, wcs_coords):
+    # type: (List[List[float]], List[List[float]]) -> LeaveOneOutDiagnostics
+    """Leave-one-out residuals and frame changes of a localization.
+
+    For each point the frame is localized from all other points (with
+    ``method="svd"``, see :func:`compas_mrr.arbitrary_pts_localization`) and
+    used to predict the left out point. Instead of solving N times, the cross
+    covariance matrix of all points is downdated by each point in turn, so the
+    whole report costs one stacked SVD of N 3x3 matrices.
+
+    A point with a large leave-one-out residual is badly measured, or the frame
+    depends heavily on it.
+
+    Parameters
+    ----------
+    rcs_coords
+        Localization points in RCS, at least four.
+    wcs_coords
+        Measurements in WCS, in the same order.
+
+    Returns
+    -------
+    :class:`LeaveOneOutDiagnostics`
+        Changes of the frame are relative to the frame localized from all
+        points.
+    """
+    from scipy.spatial.transform import Rotation
+
+    rcs_coords = _coords_to_array(rcs_coords)
+    wcs_coords = _coords_to_array(wcs_coords)
+
+    n_points = len(rcs_coords)
+    if n_points != len(wcs_coords):
+        raise ValueError("Point sets need to have the same length.")
+    if n_points < 4:
+        raise ValueError("At least four point pairs are needed.")
+
+    rcs_centroid = rcs_coords.mean(axis=0)
+    wcs_centroid = wcs_coords.mean(axis=0)
+    p = rcs_coords - rcs_centroid
+    q = wcs_coords - wcs_centroid
+
+    H = p.T.dot(q)
+    R, _ = _rotation_from_cross_covariance(H)
+    t = wcs_centroid - R.dot(rcs_centroid)
+
+    # Without point i the centroids move by -p_i / (n - 1), which turns the
+    # downdate of the centered cross covariance into n / (n - 1) * p_i q_i^T.
+    m = n_points - 1
+    H_loo = H - n_points / m * np.einsum("ni,nj->nij", p, q)
+    R_loo, _ = _rotation_from_cross_covariance(H_loo)
+
+    t_loo = (wcs_centroid - q / m) - np.einsum(
+        "nij,nj->ni", R_loo, rcs_centroid - p / m
+    )
+
+    residuals = n_points / m * (np.einsum("nij,nj->ni", R_loo, p) - q)
+    squared = np.einsum("ij,ij->i", residuals, residuals)
+
+    rotations = Rotation.from_matrix(np.matmul(R_loo, R.T)).as_rotvec()
+
+    return LeaveOneOutDiagnostics(
+        residuals, np.sqrt(squared), np.sqrt(squared.mean()), t_loo - t, rotations
+    )
@@ -0,0 +1,176 @@
+"""
+*******************************************************************************
+Incremental arbitrary points method, updated as each point is measured.
+*******************************************************************************
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from compas_mrr.arbitrary_pts_localization import _rotation_from_cross_covariance
+from compas_mrr.utils import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
+
+
+class IncrementalLocalizer(object):
+    """Arbitrary points localization updated one point pair at a time.
+
+    Keeps running centroids and the cross covariance matrix of the point pairs
+    (updated with Welford's method), so adding a point pair and getting the
+    updated least squares frame takes constant time regardless of how many
+    points have been measured. The result after adding all point pairs is the
+    same as :func:`compas_mrr.arbitrary_pts_localization` with
+    ``method="svd"``.
+
+    The estimate is considered converged when the frame moved less than
+    ``translation_tol`` and rotated less than ``rotation_tol`` for
+    ``patience`` consecutive point pairs, which indicates that measuring more
+    points is unlikely to change the result.
+
+    Parameters
+    ----------
+    translation_tol
+        Maximum change of the frame origin for the estimate to be considered
+        stable, in the units of the coordinates.
+    rotation_tol
+        Maximum change of the frame orientation for the estimate to be
+        considered stable, in radians.
+    patience
+        Number of consecutive stable updates needed for convergence.
+
+    Examples
+    --------
+    >>> localizer = IncrementalLocalizer()
+    >>> for pt in [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]:
+    ...     frame, rms = localizer.add(pt, [pt[0] + 10, pt[1] + 20, pt[2] + 30])
+    >>> [round(v, 6) for v in frame[0]]
+    [10.0, 20.0, 30.0]
+    >>> round(rms, 6)
+    0.0
+    """
+
+    def __init__(
+        self,
+        translation_tol=0.5,  # type: float
+        rotation_tol=1e-4,  # type: float
+        patience=2,  # type: int
+    ):  # type: (...) -> None
+        self.translation_tol = translation_tol
+        self.rotation_tol = rotation_tol
+        self.patience = patience
+        self.reset()
+
+    def reset(self):  # type: () -> None
+        """Remove all point pairs."""
+        self.n = 0
+        self._rcs_mean = np.zeros(3)
+        self._wcs_mean = np.zeros(3)
+        # Centered co-moments
+        self._H = np.zeros((3, 3))
+        self._rcs_ss = 0.0
+        self._wcs_ss = 0.0
+
+        self._t = None  # type: Union[None, np.ndarray]
+        self._R = None  # type: Union[None, np.ndarray]
+        self._rms = None  # type: Union[None, float]
+        self._stable_updates = 0
+
+    def add(
+        self,
+        rcs_pt,  # type: List[float]
+        wcs_pt,  # type: List[float]
+    ):  # type: (...) -> Tuple[Union[None, List[List[float]]], Union[None, float]]
+        """Add a point pair and update the frame.
+
+        Parameters
+        ----------
+        rcs_pt
+            Localization point in RCS.
+        wcs_pt
+            Measurement of the localization point in WCS.
+
+        Returns
+        -------
+        :obj:`tuple`
+            The frame as origin, x axis and y axis (see
+            :func:`compas_mrr.arbitrary_pts_localization`) and the root mean
+            square deviation from the measurements. Both are None until the
+            frame is determined by the point pairs.
+        """
+        p = np.asarray(rcs_pt, dtype=float).reshape(3)
+        q = np.asarray(wcs_pt, dtype=float).reshape(3)
+
+        self.n += 1
+        dp = p - self._rcs_mean
+        dq = q - self._wcs_mean
+        self._rcs_mean += dp / self.n
+        self._wcs_mean += dq / self.n
+
+        self._H += np.outer(dp, q - self._wcs_mean)
+        self._rcs_ss += dp.dot(p - self._rcs_mean)
+        self._wcs_ss += dq.dot(q - self._wcs_mean)
+
+        self._update()
+
+        return self.frame, self.rms
+
+    def _update(self):  # type: () -> None
+        prev_t, prev_R = self._t, self._R
+
+        if self.n >= 3:
+            R, signed_s = _rotation_from_cross_covariance(self._H)
+            s = np.abs(signed_s)
+
+        # The frame is undetermined if the RCS points are collinear
+        if self.n < 3 or s[1] <= 1e-12 * max(s[0], 1.0):
+            self._t = self._R = self._rms = None
+            self._stable_updates = 0
+            return
+
+        self._R = R
+        self._t = self._wcs_mean - R.dot(self._rcs_mean)
+
+        sse = self._rcs_ss + self._wcs_ss - 2.0 * signed_s.sum()
+        self._rms = float(np.sqrt(max(sse, 0.0) / self.n))
+
+        if prev_t is None:
+            self._stable_updates = 0
+            return
+
+        translation_delta = np.linalg.norm(self._t - prev_t)
+        # Rotation angle of R * prev_R^T
+        cos_angle = (np.trace(R.dot(prev_R.T)) - 1.0) / 2.0
+        rotation_delta = np.arccos(np.clip(cos_angle, -1.0, 1.0))
+
+        if (
+            translation_delta <= self.translation_tol
+            and rotation_delta <= self.rotation_tol
+        ):
+            self._stable_updates += 1
+        else:
+            self._stable_updates = 0
+
+    @property
+    def frame(self):  # type: () -> Union[None, List[List[float]]]
+        """Current frame as origin, x axis and y axis."""
+        if self._t is None:
+            return None
+
+        return [self._t.tolist(), self._R[:, 0].tolist(), self._R[:, 1].tolist()]
+
+    @property
+    def rms(self):  # type: () -> Union[None, float]
+        """Root mean square deviation from the measurements for current frame."""
+        return self._rms
+
+    @property
+    def converged(self):  # type: () -> bool
+        """True if the frame has been stable for ``patience`` updates."""
+        return self._stable_updates >= self.patience
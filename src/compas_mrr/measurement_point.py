@@ -2,6 +2,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from collections import OrderedDict
+
 import compas
 import compas.geometry
 
@@ -10,10 +12,56 @@ from compas_mrr.utils import TYPE_CHECKING
 from compas_mrr.utils import cgpoint_to_rgpoint
 
 if TYPE_CHECKING:
+    from typing import Any  # noqa: F401
+    from typing import Dict  # noqa: F401
+    from typing import Iterable  # noqa: F401
+    from typing import List  # noqa: F401
     from typing import Tuple  # noqa: F401
     from typing import Union  # noqa: F401
 
 
+_DIGITS = "0123456789"
+
+
+def _parse_attr_value(value):  # type: (str) -> Any
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _parse_attrs(keys, values):  # type: (List[str], List[str]) -> dict
+    """Parse attribute columns, numeric values as floats and empty ones skipped."""
+    return {k: _parse_attr_value(v) for k, v in zip(keys, values) if k and v != ""}
+
+
+def split_pt_name(pt_name):  # type: (str) -> Tuple[str, int]
+    """Split point name into prefix and trailing index.
+
+    Parameters
+    ----------
+    pt_name
+        Point name from data source.
+
+    Returns
+    -------
+    :obj:`tuple` of :obj:`str` and :obj:`int`
+        The prefix and the index. The index is 0 if the name does not end with
+        a number.
+
+    Examples
+    --------
+    >>> split_pt_name("LP12")
+    ('LP', 12)
+    >>> split_pt_name("station")
+    ('station', 0)
+    """
+    prefix = pt_name.rstrip(_DIGITS)
+    idx = pt_name[len(prefix) :]
+
+    return prefix, int(idx) if idx else 0
+
+
 class MeasurementPoint(compas.geometry.Point):
     """A :class:`compas.geometry.Point` with some CSV pointlist related methods."""
 
@@ -27,13 +75,54 @@ class MeasurementPoint(compas.geometry.Point):
     ):  # type: (...) -> None
         super(MeasurementPoint, self).__init__(x, y, z)
         self.pt_name = pt_name
-        self.attrs = attrs or {}
+        self.attrs = attrs
 
     def __repr__(self):  # type: () -> str
         return "Point ID: {}, Location: {}, {}, {}".format(
             self.pt_name, self.x, self.y, self.z
         )
 
+    @property
+    def pt_name(self):  # type: () -> str
+        """Point name from data source, e.g. ``LP1``."""
+        return self._pt_name
+
+    @pt_name.setter
+    def pt_name(self, pt_name):  # type: (str) -> None
+        self._pt_name = pt_name
+        self._prefix_idx = None  # type: Union[None, Tuple[str, int]]
+
+    @property
+    def attrs(self):  # type: () -> dict
+        """Point attributes from data source."""
+        if self._raw_attrs is not None:
+            keys, values = self._raw_attrs
+            self._attrs = _parse_attrs(keys, values)
+            self._raw_attrs = None
+
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs):  # type: (Union[None, dict]) -> None
+        self._attrs = attrs or {}
+        self._raw_attrs = None  # type: Union[None, Tuple[List[str], List[str]]]
+
+    @classmethod
+    def _from_raw_attrs(
+        cls,
+        x,  # type: float
+        y,  # type: float
+        z,  # type: float
+        pt_name,  # type: str
+        keys,  # type: List[str]
+        values,  # type: List[str]
+    ):  # type: (...) -> MeasurementPoint
+        """Create point with attributes parsed from strings on first access."""
+        pt = cls(x, y, z, pt_name)
+        pt._raw_attrs = (keys, values)
+
+        return pt
+
     @property
     def prefix(self):  # type: () -> str
         """Point prefix from data source."""
@@ -49,25 +138,63 @@ class MeasurementPoint(compas.geometry.Point):
         return cgpoint_to_rgpoint(self)
 
     def _split_pt_name(self):  # type: () -> Tuple[str, int]
-        idx = ""
-
-        for n, elem in enumerate(self.pt_name[::-1]):
-            if elem.isdigit():
-                idx = elem + idx  # add to front of str
-            else:
-                idx_last_char_idx = len(self.pt_name) - n
-                break
-
-        prefix = self.pt_name[:idx_last_char_idx]
+        # Parsed once and cached until pt_name is changed
+        if self._prefix_idx is None:
+            self._prefix_idx = split_pt_name(self._pt_name)
 
-        try:
-            _idx = int(idx)
-        except ValueError:
-            _idx = 0
-
-        return prefix, _idx
+        return self._prefix_idx
 
 
 # Make MeasurementPoint available from utils for backwards compatibility
 # with compas_mrr <= v1.0.4
 utils.MeasurementPoint = MeasurementPoint  # type: ignore[attr-defined]
+
+
+def sort_measurement_points(points):
+    # type: (Iterable[MeasurementPoint]) -> List[MeasurementPoint]
+    """Sort points by prefix and index.
+
+    Sorting is by index as a number, so ``LP2`` comes before ``LP10``.
+
+    Parameters
+    ----------
+    points
+        Points to sort.
+
+    Returns
+    -------
+    :obj:`list` of :class:`MeasurementPoint`
+    """
+    return sorted(points, key=lambda pt: pt._split_pt_name())
+
+
+def group_measurement_points(points):
+    # type: (Iterable[MeasurementPoint]) -> Dict[str, List[MeasurementPoint]]
+    """Group points by prefix, each group sorted by index.
+
+    Parameters
+    ----------
+    points
+        Points to group.
+
+    Returns
+    -------
+    :obj:`dict`
+        Lists of points by prefix, in order of first appearance of the prefix.
+
+    Examples
+    --------
+    >>> pts = [MeasurementPoint(0, 0, 0, n) for n in ["LP2", "S1", "LP1"]]
+    >>> groups = group_measurement_points(pts)
+    >>> [(prefix, [pt.idx for pt in group]) for prefix, group in groups.items()]
+    [('LP', [1, 2]), ('S', [1])]
+    """
+    groups = OrderedDict()  # type: Dict[str, List[MeasurementPoint]]
+
+    for pt in points:
+        groups.setdefault(pt.prefix, []).append(pt)
+
+    for group in groups.values():
+        group.sort(key=lambda pt: pt.idx)
+
+    return groups
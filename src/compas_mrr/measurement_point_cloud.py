@@ -0,0 +1,241 @@
+"""
+*******************************************************************************
+Array backed collection of measurement points.
+*******************************************************************************
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+
+import numpy as np
+
+from compas_mrr.measurement_point import MeasurementPoint
+from compas_mrr.measurement_point import split_pt_name
+from compas_mrr.pointlist import _iter_rows
+from compas_mrr.utils import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import IO  # noqa: F401
+    from typing import Dict  # noqa: F401
+    from typing import Iterator  # noqa: F401
+    from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
+
+
+def _typed_column(values):  # type: (List[str]) -> np.ndarray
+    """Convert a column of strings to floats if possible, empty values to NaN."""
+    column = np.array(values, dtype=str)
+
+    try:
+        return np.where(column == "", "nan", column).astype(float)
+    except ValueError:
+        return column
+
+
+class MeasurementPointCloud(object):
+    """Columnar collection of :class:`compas_mrr.MeasurementPoint`.
+
+    Coordinates are stored in one (N, 3) array, names in a string array and
+    each attribute as a column array, instead of one object per point.
+    :class:`compas_mrr.MeasurementPoint` objects are only created when
+    indexing with an integer or iterating.
+
+    The point cloud can be used as a (N, 3) array, e.g. passed directly to
+    :func:`compas_mrr.arbitrary_pts_localization`.
+
+    Parameters
+    ----------
+    coords
+        Point coordinates as (N, 3) array or sequence of points.
+    names
+        Point names, defaults to empty strings.
+    attrs
+        Attribute columns as a :obj:`dict` of sequences of length N. Numeric
+        columns use NaN for missing values.
+
+    Examples
+    --------
+    >>> cloud = MeasurementPointCloud([[1, 2, 3], [4, 5, 6]], names=["LP1", "LP2"])
+    >>> len(cloud)
+    2
+    >>> cloud[1]
+    Point ID: LP2, Location: 4.0, 5.0, 6.0
+    """
+
+    def __init__(
+        self,
+        coords,  # type: Union[np.ndarray, List[List[float]]]
+        names=None,  # type: Union[None, List[str]]
+        attrs=None,  # type: Union[None, Dict[str, List]]
+    ):  # type: (...) -> None
+        self.coords = np.array(coords, dtype=float).reshape(-1, 3)
+        n_points = len(self.coords)
+
+        if names is None:
+            names = [""] * n_points
+        self.names = np.array(names, dtype=str).reshape(-1)
+
+        self.attrs = {}  # type: Dict[str, np.ndarray]
+        for key, values in (attrs or {}).items():
+            column = np.asarray(values)
+            if column.dtype.kind not in "fiub":
+                column = column.astype(str)
+            self.attrs[key] = column
+
+        for key, column in [("names", self.names)] + list(self.attrs.items()):
+            if len(column) != n_points:
+                raise ValueError(
+                    "Column {} has length {}, expected {}.".format(
+                        key, len(column), n_points
+                    )
+                )
+
+    @classmethod
+    def from_points(cls, points):
+        # type: (List[MeasurementPoint]) -> MeasurementPointCloud
+        """Create point cloud from :class:`compas_mrr.MeasurementPoint` objects."""
+        points = list(points)
+        keys = sorted(set(key for pt in points for key in pt.attrs))
+
+        attrs = {}
+        for key in keys:
+            values = [pt.attrs.get(key) for pt in points]
+            if all(v is None or isinstance(v, (int, float)) for v in values):
+                attrs[key] = np.array(
+                    [np.nan if v is None else v for v in values], dtype=float
+                )
+            else:
+                attrs[key] = np.array(["" if v is None else v for v in values])
+
+        return cls(
+            [list(pt) for pt in points],
+            names=[pt.pt_name for pt in points],
+            attrs=attrs,
+        )
+
+    @classmethod
+    def from_pointlist(
+        cls,
+        path_or_file,  # type: Union[str, IO[str]]
+        delimiter=";",  # type: str
+        scale=1.0,  # type: float
+    ):  # type: (...) -> MeasurementPointCloud
+        """Read a CSV pointlist, see :func:`compas_mrr.pointlist.iter_pointlist`.
+
+        Attribute columns containing only numbers (or empty values) are
+        converted to float columns, others are kept as strings.
+        """
+        names = []  # type: List[str]
+        coords = []  # type: List[List[str]]
+        attr_values = []  # type: List[List[str]]
+        attr_keys = []  # type: List[str]
+
+        for coord_idxs, attr_keys, attr_idxs, row in _iter_rows(
+            path_or_file, delimiter
+        ):
+            name_idx, x_idx, y_idx, z_idx = coord_idxs
+            names.append(row[name_idx].strip())
+            coords.append([row[x_idx], row[y_idx], row[z_idx]])
+            attr_values.append(
+                [row[i].strip() if i < len(row) else "" for i in attr_idxs]
+            )
+
+        xyz = np.array(coords, dtype=float).reshape(-1, 3) * scale
+        columns = zip(*attr_values) if attr_values else [[] for _ in attr_keys]
+        attrs = {key: _typed_column(list(col)) for key, col in zip(attr_keys, columns)}
+
+        return cls(xyz, names=names, attrs=attrs)
+
+    def __len__(self):  # type: () -> int
+        return len(self.coords)
+
+    def __repr__(self):  # type: () -> str
+        return "MeasurementPointCloud with {} points".format(len(self))
+
+    def __array__(self, dtype=None, copy=None):
+        # type: (Union[None, np.dtype], Union[None, bool]) -> np.ndarray
+        if copy:
+            return np.array(self.coords, dtype=dtype)
+        return np.asarray(self.coords, dtype=dtype)
+
+    def __iter__(self):  # type: () -> Iterator[MeasurementPoint]
+        for i in range(len(self)):
+            yield self._point(i)
+
+    def __getitem__(self, key):
+        # type: (Union[int, slice, np.ndarray]) -> Union[MeasurementPoint, MeasurementPointCloud]  # noqa: E501
+        """Get a point for integer keys, a new point cloud for other keys."""
+        if isinstance(key, (int, np.integer)):
+            if not -len(self) <= key < len(self):
+                raise IndexError("Point index out of range.")
+            return self._point(int(key) % len(self))
+
+        return MeasurementPointCloud(
+            self.coords[key],
+            names=self.names[key],
+            attrs={k: v[key] for k, v in self.attrs.items()},
+        )
+
+    def _point(self, i):  # type: (int) -> MeasurementPoint
+        x, y, z = self.coords[i].tolist()
+        attrs = {}
+        for key, column in self.attrs.items():
+            value = column[i].item()
+            if value != "" and value == value:  # skip empty strings and NaN
+                attrs[key] = value
+
+        return MeasurementPoint(x, y, z, str(self.names[i]), attrs=attrs)
+
+    def split_names(self):  # type: () -> Tuple[np.ndarray, np.ndarray]
+        """Prefixes and indices of all point names.
+
+        Each distinct name is only parsed once, see
+        :func:`compas_mrr.measurement_point.split_pt_name`.
+
+        Returns
+        -------
+        :obj:`tuple` of :class:`numpy.ndarray`
+            Prefixes (N,) and indices (N,).
+        """
+        unique_names, inverse = np.unique(self.names, return_inverse=True)
+        split = [split_pt_name(name) for name in unique_names.tolist()]
+
+        prefixes = np.array([prefix for prefix, _ in split], dtype=str)
+        idxs = np.array([idx for _, idx in split], dtype=int)
+
+        return prefixes[inverse], idxs[inverse]
+
+    def sorted_by_name(self):  # type: () -> MeasurementPointCloud
+        """Get point cloud sorted by prefix and index of the point names."""
+        prefixes, idxs = self.split_names()
+
+        return self[np.lexsort((idxs, prefixes))]
+
+    def grouped_by_prefix(self):
+        # type: () -> Dict[str, MeasurementPointCloud]
+        """Split point cloud by prefix of the point names.
+
+        Returns
+        -------
+        :obj:`dict`
+            Point clouds by prefix in alphabetical order, each sorted by index.
+        """
+        prefixes, idxs = self.split_names()
+        order = np.lexsort((idxs, prefixes))
+
+        unique_prefixes, starts = np.unique(prefixes[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        groups = OrderedDict()  # type: Dict[str, MeasurementPointCloud]
+        for prefix, start, end in zip(unique_prefixes.tolist(), starts, ends):
+            groups[prefix] = self[order[start:end]]
+
+        return groups
+
+    def to_points(self):  # type: () -> List[MeasurementPoint]
+        """Create a :class:`compas_mrr.MeasurementPoint` for every point."""
+        return list(self)
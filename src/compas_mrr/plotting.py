@@ -0,0 +1,248 @@
+"""
+*******************************************************************************
+Plots of localization solver runs, rendered off the critical path.
+*******************************************************************************
+
+With ``plot_results`` enabled, :func:`compas_mrr.arbitrary_pts_localization`
+only writes a small record of the solver runs (a compressed ``.npz`` file) and
+hands it to a background thread, which renders the plots to PNG files in a
+directory next to the record. Records can also be rendered later with
+:func:`render_plot_record`.
+
+Plots are drawn on a single reused figure with the Agg canvas, so no GUI
+backend is needed and no figures are left open.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+import os
+import tempfile
+import threading
+import time
+import warnings
+
+import numpy as np
+
+from compas_mrr.utils import TYPE_CHECKING
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # type: ignore
+
+if TYPE_CHECKING:
+    from typing import Any  # noqa: F401
+    from typing import List  # noqa: F401
+    from typing import Union  # noqa: F401
+
+    from scipy.optimize import OptimizeResult  # noqa: F401
+
+DEFAULT_PLOT_DIR = os.path.join(tempfile.gettempdir(), "compas_mrr_localization")
+
+_PROJECTIONS = (("x", 0, "y", 1), ("x", 0, "z", 2), ("y", 1, "z", 2))
+
+_record_counter = itertools.count()
+
+
+def save_plot_record(
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+    results,  # type: List[OptimizeResult]
+    plot_dir=DEFAULT_PLOT_DIR,  # type: str
+):  # type: (...) -> str
+    """Write the point sets and solver results to a compressed record.
+
+    Parameters
+    ----------
+    rcs_coords
+        (N, 3) localization points in RCS.
+    wcs_coords
+        (N, 3) measurements in WCS.
+    results
+        Results of the solver runs, with the solution as origin, x axis and y
+        axis in ``x``.
+    plot_dir
+        Directory to write the record to, created if missing.
+
+    Returns
+    -------
+    :obj:`str`
+        Path of the record.
+    """
+    if not os.path.isdir(plot_dir):
+        os.makedirs(plot_dir)
+
+    name = "localization_{}_{}_{}.npz".format(
+        time.strftime("%Y%m%d-%H%M%S"), os.getpid(), next(_record_counter)
+    )
+    path = os.path.join(plot_dir, name)
+
+    np.savez_compressed(
+        path,
+        rcs_coords=np.asarray(rcs_coords, dtype=float),
+        wcs_coords=np.asarray(wcs_coords, dtype=float),
+        solutions=np.array([res.x for res in results], dtype=float).reshape(-1, 9),
+        objective_values=np.array([res.fun for res in results], dtype=float),
+    )
+
+    return path
+
+
+def _plot_projections(
+    figure,  # type: Any
+    wcs_coords,  # type: np.ndarray
+    solution,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    out_dir,  # type: str
+):  # type: (...) -> None
+    """Plot the measurements and the transformed points of one solver run."""
+    origin, x_vec, y_vec = solution.reshape(3, 3)
+    axes = np.array((x_vec, y_vec, np.cross(x_vec, y_vec)))
+
+    transformed = origin + rcs_coords.dot(axes)
+    x_axis = origin + 1000 * x_vec
+    y_axis = origin + 1000 * y_vec
+
+    for label_a, a, label_b, b in _PROJECTIONS:
+        figure.clear()
+        ax = figure.add_subplot(111)
+        ax.plot(wcs_coords[:, a], wcs_coords[:, b], "bo")
+        ax.plot(transformed[:, a], transformed[:, b], "rx")
+        ax.plot(origin[a], origin[b], "bx")
+        ax.plot(x_axis[a], x_axis[b], "rx")
+        ax.plot(y_axis[a], y_axis[b], "gx")
+        ax.set_xlabel(label_a)
+        ax.set_ylabel(label_b)
+        ax.set_title("{}-{} projection".format(label_a.upper(), label_b.upper()))
+        figure.savefig(
+            os.path.join(out_dir, "rcs_matching_{}{}.png".format(label_a, label_b))
+        )
+
+
+def render_plot_record(path, figure=None):  # type: (str, Any) -> str
+    """Render the plots of a record written by :func:`save_plot_record`.
+
+    Parameters
+    ----------
+    path
+        Path of the record.
+    figure
+        :class:`matplotlib.figure.Figure` to draw on, reused for every plot.
+        A new one with an Agg canvas is created by default.
+
+    Returns
+    -------
+    :obj:`str`
+        Directory with the plots, the record path without extension. It
+        contains ``summary.png`` and a subdirectory with the projections for
+        each solver run.
+    """
+    if figure is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure()
+        FigureCanvasAgg(figure)
+
+    with np.load(path) as record:
+        rcs_coords = record["rcs_coords"]
+        wcs_coords = record["wcs_coords"]
+        solutions = record["solutions"]
+        objective_values = record["objective_values"]
+
+    out_dir = os.path.splitext(path)[0]
+
+    for i, solution in enumerate(solutions):
+        run_dir = os.path.join(out_dir, str(i))
+        if not os.path.isdir(run_dir):
+            os.makedirs(run_dir)
+
+        _plot_projections(figure, wcs_coords, solution, rcs_coords, run_dir)
+
+    figure.clear()
+    ax = figure.add_subplot(111)
+    ax.plot(range(len(objective_values)), objective_values, "ro")
+    ax.set_ylabel("Objective value")
+    ax.set_xlabel("Run")
+    ax.set_title("Objective value for different x_0")
+    figure.savefig(os.path.join(out_dir, "summary.png"))
+    figure.clear()
+
+    return out_dir
+
+
+class _PlotWorker(object):
+    """Daemon thread rendering plot records from a queue."""
+
+    def __init__(self):  # type: () -> None
+        self._queue = queue.Queue()  # type: queue.Queue
+        self._thread = threading.Thread(target=self._run, name="compas_mrr-plots")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):  # type: () -> None
+        figure = None
+
+        while True:
+            path = self._queue.get()
+            try:
+                if figure is None:
+                    from matplotlib.backends.backend_agg import FigureCanvasAgg
+                    from matplotlib.figure import Figure
+
+                    figure = Figure()
+                    FigureCanvasAgg(figure)
+
+                render_plot_record(path, figure=figure)
+            except Exception as e:
+                warnings.warn(
+                    "Failed to render plots of {}: {}".format(path, e), RuntimeWarning
+                )
+            finally:
+                self._queue.task_done()
+
+    def submit(self, path):  # type: (str) -> None
+        self._queue.put(path)
+
+    def join(self):  # type: () -> None
+        self._queue.join()
+
+
+_worker = None  # type: Union[None, _PlotWorker]
+_worker_lock = threading.Lock()
+
+
+def submit_plot_record(path):  # type: (str) -> None
+    """Render a record on the background thread, see :func:`render_plot_record`."""
+    global _worker
+
+    with _worker_lock:
+        if _worker is None:
+            _worker = _PlotWorker()
+
+    _worker.submit(path)
+
+
+def wait_for_plots():  # type: () -> None
+    """Block until all submitted records are rendered."""
+    if _worker is not None:
+        _worker.join()
+
+
+def _plot(
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+    results,  # type: List[OptimizeResult]
+    plot_dir=None,  # type: Union[None, str]
+):  # type: (...) -> str
+    """Save a record of the solver runs and render it in the background."""
+    path = save_plot_record(
+        rcs_coords, wcs_coords, results, plot_dir=plot_dir or DEFAULT_PLOT_DIR
+    )
+    print("Saving plots to {}".format(os.path.splitext(path)[0]))
+    submit_plot_record(path)
+
+    return path
@@ -0,0 +1,261 @@
+"""
+*******************************************************************************
+Reading CSV pointlists exported from the total station.
+*******************************************************************************
+
+Pointlists are delimited text files with a header row, one point per row and
+at least the columns ``NAME``, ``X``, ``Y`` and ``Z``. All other columns (e.g.
+``HA``, ``VA``, ``HD``) are treated as point attributes.
+
+::
+
+    NAME;X;Y;Z;Attr1;Attr2;Attr3;Attr4;Attr5;HA;VA;HD;hr;ppm;
+    LP1;15.402885;24.560608;1.046399;;;;;;4.989724;1.864232;2.350375;0;0;
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import csv
+import io
+from contextlib import contextmanager
+
+from compas_mrr.measurement_point import MeasurementPoint
+from compas_mrr.utils import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import IO  # noqa: F401
+    from typing import Dict  # noqa: F401
+    from typing import Iterator  # noqa: F401
+    from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
+
+    import numpy as np  # noqa: F401
+
+POINTLIST_COORD_COLUMNS = ("NAME", "X", "Y", "Z")
+
+
+@contextmanager
+def _open_pointlist(path_or_file):
+    # type: (Union[str, IO[str]]) -> Iterator[IO[str]]
+    if hasattr(path_or_file, "read"):
+        yield path_or_file
+        return
+
+    with io.open(path_or_file, "r", newline="", encoding="utf-8-sig") as f:
+        yield f
+
+
+def _read_header(reader):
+    # type: (Iterator[List[str]]) -> Tuple[List[int], List[str], List[int]]
+    """Read header row.
+
+    Returns the indices of the name and coordinate columns, and the names and
+    indices of the attribute columns.
+    """
+    try:
+        header = [col.strip() for col in next(reader)]
+    except StopIteration:
+        raise ValueError("Pointlist is empty.")
+
+    upper_header = [col.upper() for col in header]
+
+    try:
+        coord_idxs = [upper_header.index(col) for col in POINTLIST_COORD_COLUMNS]
+    except ValueError:
+        raise ValueError(
+            "Pointlist header needs columns {}, got {}".format(
+                ", ".join(POINTLIST_COORD_COLUMNS), ", ".join(header)
+            )
+        )
+
+    attr_idxs = [i for i, col in enumerate(header) if col and i not in coord_idxs]
+    attr_keys = [header[i] for i in attr_idxs]
+
+    return coord_idxs, attr_keys, attr_idxs
+
+
+def _iter_rows(path_or_file, delimiter=";"):
+    # type: (Union[str, IO[str]], str) -> Iterator[Tuple[List[int], List[str], List[int], List[str]]]  # noqa: E501
+    """Yield column layout together with each non empty row."""
+    with _open_pointlist(path_or_file) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        coord_idxs, attr_keys, attr_idxs = _read_header(reader)
+
+        for row in reader:
+            if not row or not row[coord_idxs[0]].strip():
+                continue
+
+            yield coord_idxs, attr_keys, attr_idxs, row
+
+
+def iter_pointlist(
+    path_or_file,  # type: Union[str, IO[str]]
+    delimiter=";",  # type: str
+    scale=1.0,  # type: float
+):  # type: (...) -> Iterator[MeasurementPoint]
+    """Read a pointlist point by point.
+
+    The file is read lazily, so large pointlists can be processed without
+    loading them into memory. The attributes of each point are only parsed
+    when :attr:`MeasurementPoint.attrs` is accessed.
+
+    Parameters
+    ----------
+    path_or_file
+        Path to pointlist or an open text file.
+    delimiter
+        Column delimiter.
+    scale
+        Factor to scale coordinates with, e.g. ``1000`` to convert from meters
+        to millimeters.
+
+    Yields
+    ------
+    :class:`compas_mrr.MeasurementPoint`
+
+    Examples
+    --------
+    >>> import io
+    >>> f = io.StringIO(u"NAME;X;Y;Z;HA;\\nLP1;1.5;2;3;0.5;\\n")
+    >>> pt = next(iter_pointlist(f, scale=1000))
+    >>> pt
+    Point ID: LP1, Location: 1500.0, 2000.0, 3000.0
+    >>> pt.attrs
+    {'HA': 0.5}
+    """
+    for coord_idxs, attr_keys, attr_idxs, row in _iter_rows(path_or_file, delimiter):
+        name_idx, x_idx, y_idx, z_idx = coord_idxs
+
+        yield MeasurementPoint._from_raw_attrs(
+            float(row[x_idx]) * scale,
+            float(row[y_idx]) * scale,
+            float(row[z_idx]) * scale,
+            row[name_idx].strip(),
+            attr_keys,
+            [row[i].strip() if i < len(row) else "" for i in attr_idxs],
+        )
+
+
+def read_pointlist(
+    path_or_file,  # type: Union[str, IO[str]]
+    delimiter=";",  # type: str
+    scale=1.0,  # type: float
+):  # type: (...) -> List[MeasurementPoint]
+    """Read a pointlist to a list of points.
+
+    See :func:`iter_pointlist` for parameters.
+    """
+    return list(iter_pointlist(path_or_file, delimiter=delimiter, scale=scale))
+
+
+def _to_arrays(names, coords, attr_keys, attr_values, scale):
+    # type: (List[str], List[List[str]], List[str], List[List[str]], float) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]  # noqa: E501
+    import numpy as np
+
+    xyz = np.array(coords, dtype=float).reshape(-1, 3)
+    if scale != 1.0:
+        xyz *= scale
+
+    columns = {}
+    for key, values in zip(attr_keys, zip(*attr_values)):
+        try:
+            columns[key] = np.array([v or "nan" for v in values], dtype=float)
+        except ValueError:
+            # not a numeric column
+            pass
+
+    return np.array(names, dtype=str), xyz, columns
+
+
+def iter_pointlist_arrays(
+    path_or_file,  # type: Union[str, IO[str]]
+    delimiter=";",  # type: str
+    scale=1.0,  # type: float
+    chunksize=10000,  # type: int
+):  # type: (...) -> Iterator[Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]]
+    """Read a pointlist in chunks of arrays, without creating point objects.
+
+    Coordinates and numeric attribute columns of each chunk are converted to
+    floats in one bulk operation per column.
+
+    Parameters
+    ----------
+    path_or_file
+        Path to pointlist or an open text file.
+    delimiter
+        Column delimiter.
+    scale
+        Factor to scale coordinates with. Attribute columns are not scaled.
+    chunksize
+        Maximum number of points per chunk.
+
+    Yields
+    ------
+    :obj:`tuple`
+        Point names (M,), coordinates (M, 3) and a :obj:`dict` of the numeric
+        attribute columns (e.g. ``HA``, ``VA``, ``HD``) as (M,) arrays for each
+        chunk. A column is numeric if all its values in the chunk are numbers
+        or empty, empty values are NaN.
+
+    Examples
+    --------
+    >>> import io
+    >>> f = io.StringIO(u"NAME;X;Y;Z;HA;Note;\\nLP1;1.5;2;3;0.5;a;\\nLP2;1;2;3;;b;\\n")
+    >>> names, coords, columns = next(iter_pointlist_arrays(f))
+    >>> columns
+    {'HA': array([0.5, nan])}
+    """
+    names = []  # type: List[str]
+    coords = []  # type: List[List[str]]
+    attr_values = []  # type: List[List[str]]
+    attr_keys = []  # type: List[str]
+
+    for coord_idxs, attr_keys, attr_idxs, row in _iter_rows(path_or_file, delimiter):
+        name_idx, x_idx, y_idx, z_idx = coord_idxs
+        names.append(row[name_idx].strip())
+        coords.append([row[x_idx], row[y_idx], row[z_idx]])
+        attr_values.append([row[i].strip() if i < len(row) else "" for i in attr_idxs])
+
+        if len(names) >= chunksize:
+            yield _to_arrays(names, coords, attr_keys, attr_values, scale)
+            names, coords, attr_values = [], [], []
+
+    if names:
+        yield _to_arrays(names, coords, attr_keys, attr_values, scale)
+
+
+def read_pointlist_arrays(
+    path_or_file,  # type: Union[str, IO[str]]
+    delimiter=";",  # type: str
+    scale=1.0,  # type: float
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]
+    """Read point names, coordinates and numeric attributes of a pointlist to arrays.
+
+    See :func:`iter_pointlist_arrays` for parameters.
+
+    Returns
+    -------
+    :obj:`tuple`
+        Point names (N,), coordinates (N, 3) and a :obj:`dict` of the numeric
+        attribute columns as (N,) arrays.
+    """
+    import numpy as np
+
+    chunks = list(iter_pointlist_arrays(path_or_file, delimiter=delimiter, scale=scale))
+
+    if not chunks:
+        return np.array([], dtype=str), np.zeros((0, 3)), {}
+
+    names, coords, columns = zip(*chunks)
+
+    # columns with text in any chunk are not numeric
+    keys = [key for key in columns[0] if all(key in c for c in columns)]
+
+    return (
+        np.concatenate(names),
+        np.concatenate(coords),
+        {key: np.concatenate([c[key] for c in columns]) for key in keys},
+    )
@@ -0,0 +1,283 @@
+"""
+*******************************************************************************
+Arbitrary points method weighted by the accuracy of polar observations.
+*******************************************************************************
+
+The total station measures a horizontal angle (``HA``), a vertical angle
+(``VA``) and a distance to each point. The accuracy of the angles and the
+distance differ, so the uncertainty of a measured point is larger along the
+line of sight than across it (or the other way around for long distances).
+Weighting every point by this anisotropic covariance gives a more accurate
+frame from the same number of points than weighting all coordinates equally.
+
+Observations follow the pointlist exports: ``HA`` in radians measured
+clockwise, ``VA`` the zenith angle in radians and ``HD`` the horizontal
+distance.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import namedtuple
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from compas_mrr.arbitrary_pts_localization import _coords_to_array
+from compas_mrr.arbitrary_pts_localization import _kabsch
+from compas_mrr.diagnostics import LocalizationDiagnostics
+from compas_mrr.diagnostics import _invert
+from compas_mrr.diagnostics import _pose_jacobian
+from compas_mrr.utils import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
+
+    from compas_mrr.measurement_point import MeasurementPoint  # noqa: F401
+
+InstrumentAccuracy = namedtuple("InstrumentAccuracy", ["angle", "distance", "ppm"])
+InstrumentAccuracy.__doc__ = """Accuracy specification of a total station.
+
+Attributes
+----------
+angle
+    Standard deviation of horizontal and vertical angles in radians, e.g.
+    ``4.85e-6`` for 1 arc second.
+distance
+    Constant part of the standard deviation of distances, in the units of the
+    coordinates.
+ppm
+    Distance dependent part of the standard deviation of distances, in parts
+    per million.
+"""
+
+POLAR_ATTRS = ("HA", "VA", "HD")
+
+
+def polar_observations(points, scale=1.0):
+    # type: (List[MeasurementPoint], float) -> Tuple[np.ndarray, np.ndarray]
+    """Get coordinates and polar observations of points read from a pointlist.
+
+    Parameters
+    ----------
+    points
+        Points with ``HA``, ``VA`` and ``HD`` attributes, e.g. from
+        :func:`compas_mrr.pointlist.read_pointlist`.
+    scale
+        Factor to scale the distances with, use the same as for the
+        coordinates when reading the pointlist.
+
+    Returns
+    -------
+    :obj:`tuple` of :class:`numpy.ndarray`
+        Coordinates (N, 3) and observations (N, 3) as HA, VA and HD.
+    """
+    coords = _coords_to_array([list(pt) for pt in points])
+
+    try:
+        observations = np.array(
+            [[pt.attrs[key] for key in POLAR_ATTRS] for pt in points], dtype=float
+        )
+    except KeyError as e:
+        raise ValueError("Point is missing polar observation {}".format(e))
+
+    observations = observations.reshape(-1, 3)
+    observations[:, 2] *= scale
+
+    return coords, observations
+
+
+def _station_position(wcs_coords, observations):
+    # type: (np.ndarray, np.ndarray) -> np.ndarray
+    """Estimate the station position from points and their observations.
+
+    The height follows directly from the vertical angles, the horizontal
+    position and the unknown orientation of the horizontal angles from a 2D
+    fit of the horizontal offsets.
+    """
+    ha, va, hd = observations.T
+
+    height = np.mean(wcs_coords[:, 2] - hd / np.tan(va))
+
+    # horizontal offsets in the instrument frame, with HA clockwise from Y
+    local = np.column_stack((hd * np.sin(ha), hd * np.cos(ha)))
+    measured = wcs_coords[:, :2]
+
+    local_centroid = local.mean(axis=0)
+    measured_centroid = measured.mean(axis=0)
+    H = (local - local_centroid).T.dot(measured - measured_centroid)
+    U, _, Vt = np.linalg.svd(H)
+    R = Vt.T.dot(U.T)
+    if np.linalg.det(R) < 0:
+        Vt[-1] *= -1
+        R = Vt.T.dot(U.T)
+
+    xy = measured_centroid - R.dot(local_centroid)
+
+    return np.array([xy[0], xy[1], height])
+
+
+def _vertical_sight_error(idxs):  # type: (np.ndarray) -> ValueError
+    return ValueError(
+        "Points {} are measured along a vertical line of sight, their horizontal "
+        "angle is undefined.".format(idxs.tolist())
+    )
+
+
+def _point_covariances(
+    wcs_coords,  # type: np.ndarray
+    observations,  # type: np.ndarray
+    station,  # type: np.ndarray
+    accuracy,  # type: InstrumentAccuracy
+):  # type: (...) -> np.ndarray
+    """(N, 3, 3) covariances of measured points in WCS.
+
+    Variance along the line of sight comes from the distance, across it from
+    the vertical angle and, scaled by the horizontal distance, from the
+    horizontal angle. Raises :exc:`ValueError` for a vertical line of sight,
+    where the horizontal distance is 0 and the covariance singular.
+    """
+    _, va, hd = observations.T
+    slope_distance = hd / np.sin(va)
+
+    line_of_sight = wcs_coords - station
+    line_of_sight /= np.linalg.norm(line_of_sight, axis=1)[:, np.newaxis]
+
+    horizontal = np.cross([0.0, 0.0, 1.0], line_of_sight)
+    horizontal_norm = np.linalg.norm(horizontal, axis=1)
+
+    # NaN from a point at the station position fails the check as well
+    vertical = np.flatnonzero(~(horizontal_norm > 1e-9) | ~(hd > 0))
+    if len(vertical):
+        raise _vertical_sight_error(vertical)
+
+    horizontal /= horizontal_norm[:, np.newaxis]
+    vertical = np.cross(line_of_sight, horizontal)
+
+    sigma_distance = accuracy.distance + accuracy.ppm * 1e-6 * slope_distance
+    variances = (
+        sigma_distance**2,
+        (slope_distance * accuracy.angle) ** 2,
+        (hd * accuracy.angle) ** 2,
+    )
+    axes = (line_of_sight, vertical, horizontal)
+
+    return sum(
+        var[:, None, None] * np.einsum("ni,nj->nij", a, a)
+        for var, a in zip(variances, axes)
+    )
+
+
+def _weighted_normal_equations(rcs_coords, wcs_coords, weights, t, R):
+    # type: (np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]  # noqa: E501
+    """Normal matrix, right hand side and residuals at the current frame."""
+    rotated = rcs_coords.dot(R.T)
+    residuals = rotated + t - wcs_coords
+
+    J = _pose_jacobian(rotated)
+    JtW = np.einsum("nia,nij->naj", J, weights)
+
+    N = np.einsum("naj,njb->ab", JtW, J)
+    g = np.einsum("naj,nj->a", JtW, residuals)
+
+    return N, g, residuals
+
+
+def polar_pts_localization(
+    rcs_coords,  # type: List[List[float]]
+    wcs_coords,  # type: List[List[float]]
+    observations,  # type: List[List[float]]
+    accuracy,  # type: InstrumentAccuracy
+    station=None,  # type: Union[None, List[float]]
+    maxiter=20,  # type: int
+    tol=1e-12,  # type: float
+    full_output=False,  # type: bool
+):  # type: (...) -> Union[List[List[float]], Tuple[List[List[float]], LocalizationDiagnostics]]  # noqa: E501
+    """Calculate the RCS origin frame weighting each point by its covariance.
+
+    The covariance of each measured point is propagated from the accuracy of
+    the polar observations. The frame minimizing the sum of squared
+    Mahalanobis distances is found with Gauss-Newton iterations, starting from
+    the unweighted solution of :func:`compas_mrr.arbitrary_pts_localization`.
+
+    Parameters
+    ----------
+    rcs_coords
+        Localization points in RCS.
+    wcs_coords
+        Measured points in WCS, in the same order.
+    observations
+        (N, 3) polar observations of the measured points as HA, VA and HD (see
+        module documentation), with distances in the units of the
+        coordinates. See :func:`polar_observations`. Points measured along a
+        vertical line of sight (HD of 0) raise a :exc:`ValueError`.
+    accuracy
+        Accuracy of the total station.
+    station
+        Position of the total station in WCS. Estimated from the points and
+        observations by default.
+    maxiter
+        Maximum number of Gauss-Newton iterations.
+    tol
+        Stop when the squared norm of the update is below this value.
+    full_output
+        Also return residuals, RMS deviation and the covariance of the frame
+        propagated from the instrument accuracy, see
+        :func:`compas_mrr.diagnostics.localization_diagnostics`.
+
+    Returns
+    -------
+    :obj:`list` of :obj:`list` of :obj:`float`
+        Origin, x axis and y axis of the frame, like
+        :func:`compas_mrr.arbitrary_pts_localization`. With
+        ``full_output=True`` a tuple of the frame and a
+        :class:`compas_mrr.diagnostics.LocalizationDiagnostics`.
+    """
+    rcs_coords = _coords_to_array(rcs_coords)
+    wcs_coords = _coords_to_array(wcs_coords)
+    observations = _coords_to_array(observations)
+
+    n_points = len(rcs_coords)
+    if not n_points == len(wcs_coords) == len(observations):
+        raise ValueError("Points and observations need to have the same length.")
+    if n_points < 3:
+        raise ValueError("At least three point pairs are needed.")
+
+    # Also guards the station height, hd / tan(va) is 0 / 0 for these
+    vertical = np.flatnonzero(~(observations[:, 2] > 0))
+    if len(vertical):
+        raise _vertical_sight_error(vertical)
+
+    if station is None:
+        station = _station_position(wcs_coords, observations)
+    station = np.asarray(station, dtype=float)
+
+    covariances = _point_covariances(wcs_coords, observations, station, accuracy)
+    weights = np.linalg.inv(covariances)
+
+    t, R = _kabsch(rcs_coords, wcs_coords)
+
+    for _ in range(maxiter):
+        N, g, _ = _weighted_normal_equations(rcs_coords, wcs_coords, weights, t, R)
+        step = -np.linalg.solve(N, g)
+
+        t = t + step[:3]
+        R = Rotation.from_rotvec(step[3:]).as_matrix().dot(R)
+
+        if step.dot(step) < tol:
+            break
+
+    frame = [t.tolist(), R[:, 0].tolist(), R[:, 1].tolist()]
+
+    if not full_output:
+        return frame
+
+    N, _, residuals = _weighted_normal_equations(rcs_coords, wcs_coords, weights, t, R)
+    squared = np.einsum("ij,ij->i", residuals, residuals)
+
+    return frame, LocalizationDiagnostics(
+        residuals, np.sqrt(squared), np.sqrt(squared.mean()), _invert(N)
+    )
@@ -0,0 +1,285 @@
+"""
+*******************************************************************************
+Outlier rejecting variant of the arbitrary points method.
+*******************************************************************************
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from itertools import combinations
+
+import numpy as np
+
+from compas_mrr.arbitrary_pts_localization import _coords_to_array
+from compas_mrr.arbitrary_pts_localization import _kabsch
+from compas_mrr.utils import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
+
+ROBUST_METHODS = ("ransac", "huber", "cauchy")
+
+# Consistency factor between the median absolute deviation and the standard
+# deviation of normally distributed residuals.
+MAD_TO_SIGMA = 1.4826
+
+# Inlier threshold in standard deviations if no threshold is given.
+INLIER_SIGMAS = 2.5
+
+
+def _distances(
+    t,  # type: np.ndarray
+    R,  # type: np.ndarray
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+):  # type: (...) -> np.ndarray
+    """Distances between the transformed points and the measurements.
+
+    Works on stacked hypotheses, ``t`` (..., 3) and ``R`` (..., 3, 3) gives
+    distances of shape (..., N).
+    """
+    transformed = np.einsum("...ij,nj->...ni", R, rcs_coords)
+    deviations = transformed + t[..., np.newaxis, :] - wcs_coords
+
+    return np.sqrt(np.einsum("...ni,...ni->...n", deviations, deviations))
+
+
+def _minimal_samples(
+    n_points,  # type: int
+    max_trials,  # type: int
+    rng,  # type: np.random.Generator
+):  # type: (...) -> np.ndarray
+    """Index triplets to fit hypotheses to, as a (trials, 3) array.
+
+    All combinations are used if there are no more than ``max_trials``.
+    """
+    n_combinations = n_points * (n_points - 1) * (n_points - 2) // 6
+
+    if n_combinations <= max_trials:
+        return np.array(list(combinations(range(n_points), 3)))
+
+    return np.argsort(rng.random((max_trials, n_points)), axis=1)[:, :3]
+
+
+def _refine(
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+    inliers,  # type: np.ndarray
+    threshold,  # type: float
+    max_iter=10,  # type: int
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray, np.ndarray]
+    """Refit on the inliers until the inlier set is stable.
+
+    The returned inliers are always the points the returned frame was fitted
+    to, also if the inlier set did not stabilize within ``max_iter`` fits.
+    """
+    for _ in range(max_iter):
+        t, R = _kabsch(rcs_coords[inliers], wcs_coords[inliers])
+        distances = _distances(t, R, rcs_coords, wcs_coords)
+        new_inliers = distances <= threshold
+
+        if new_inliers.sum() < 3 or np.array_equal(new_inliers, inliers):
+            break
+
+        inliers = new_inliers
+    else:
+        # Not converged, the inliers were updated after the last fit
+        t, R = _kabsch(rcs_coords[inliers], wcs_coords[inliers])
+
+    return t, R, inliers
+
+
+def _ransac(
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+    threshold=None,  # type: Union[None, float]
+    max_trials=200,  # type: int
+    seed=None,  # type: Union[None, int]
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray, np.ndarray]
+    """RANSAC over minimal three point samples followed by a refit.
+
+    Without a threshold the hypothesis with the least median of distances is
+    picked (LMedS) and the threshold is derived from that median.
+    """
+    n_points = len(rcs_coords)
+    rng = np.random.default_rng(seed)
+
+    samples = _minimal_samples(n_points, max_trials, rng)
+
+    # Drop samples where the RCS points are (close to) collinear.
+    rcs_samples = rcs_coords[samples]
+    normals = np.cross(
+        rcs_samples[:, 1] - rcs_samples[:, 0], rcs_samples[:, 2] - rcs_samples[:, 0]
+    )
+    areas = np.linalg.norm(normals, axis=1)
+    samples = samples[areas > 1e-9 * max(areas.max(), 1.0)]
+
+    if not len(samples):
+        raise ValueError("All point samples are collinear.")
+
+    t, R = _kabsch(rcs_coords[samples], wcs_coords[samples])
+    distances = _distances(t, R, rcs_coords, wcs_coords)
+
+    if threshold is None:
+        medians = np.median(distances, axis=1)
+        best = np.argmin(medians)
+        # Rousseeuw's small sample correction for the LMedS scale estimate
+        correction = 1.0 + 5.0 / max(n_points - 3, 1)
+        sigma = MAD_TO_SIGMA * correction * medians[best]
+        threshold = INLIER_SIGMAS * sigma
+    else:
+        # Most inliers, ties broken by the truncated sum of distances (MSAC)
+        counts = (distances <= threshold).sum(axis=1)
+        costs = np.minimum(distances, threshold).sum(axis=1)
+        best = np.lexsort((costs, -counts))[0]
+
+    inliers = distances[best] <= threshold
+
+    if inliers.sum() < 3:
+        raise ValueError("Less than three inliers found.")
+
+    return _refine(rcs_coords, wcs_coords, inliers, threshold)
+
+
+def _irls(
+    rcs_coords,  # type: np.ndarray
+    wcs_coords,  # type: np.ndarray
+    loss="huber",  # type: str
+    threshold=None,  # type: Union[None, float]
+    max_iter=50,  # type: int
+    xtol=1e-9,  # type: float
+):  # type: (...) -> Tuple[np.ndarray, np.ndarray, np.ndarray]
+    """Iteratively reweighted least squares with a Huber or Cauchy loss.
+
+    The loss scale is derived from ``threshold``, or from the median distance
+    of the current fit if no threshold is given.
+    """
+    t, R = _kabsch(rcs_coords, wcs_coords)
+
+    for _ in range(max_iter):
+        distances = _distances(t, R, rcs_coords, wcs_coords)
+
+        if threshold is None:
+            sigma = MAD_TO_SIGMA * np.median(distances)
+        else:
+            sigma = threshold / INLIER_SIGMAS
+
+        if sigma <= 0:
+            break
+
+        # Tuning constants giving 95% efficiency for normal distributions
+        if loss == "huber":
+            c = 1.345 * sigma
+            weights = np.minimum(1.0, c / np.maximum(distances, 1e-300))
+        else:
+            c = 2.385 * sigma
+            weights = 1.0 / (1.0 + (distances / c) ** 2)
+
+        t_new, R_new = _kabsch(rcs_coords, wcs_coords, weights=weights)
+
+        converged = np.abs(R_new - R).max() < xtol and np.abs(
+            t_new - t
+        ).max() < xtol * max(np.abs(t).max(), 1.0)
+        t, R = t_new, R_new
+
+        if converged:
+            break
+
+    distances = _distances(t, R, rcs_coords, wcs_coords)
+
+    if threshold is None:
+        threshold = INLIER_SIGMAS * MAD_TO_SIGMA * np.median(distances)
+
+    return t, R, distances <= threshold
+
+
+def robust_pts_localization(
+    rcs_coords,  # type: List[List[float]]
+    wcs_coords,  # type: List[List[float]]
+    method="ransac",  # type: str
+    threshold=None,  # type: Union[None, float]
+    max_trials=200,  # type: int
+    seed=None,  # type: Union[None, int]
+):  # type: (...) -> Tuple[List[List[float]], np.ndarray, np.ndarray]
+    """Calculate the RCS origin frame while rejecting outlier measurements.
+
+    Same problem as :func:`compas_mrr.arbitrary_pts_localization`, but
+    measurements that do not fit the others (e.g. a prism that was mis-sighted)
+    are detected and left out instead of biasing the result.
+
+    With ``method="ransac"`` (default) frames are fitted to minimal subsets of
+    three point pairs, the frame agreeing with the most measurements is picked
+    and then refitted in closed form to all measurements it agrees with. If
+    there are few points all subsets are tried, otherwise ``max_trials``
+    random subsets.
+
+    With ``method="huber"`` or ``method="cauchy"`` the frame is fitted with
+    iteratively reweighted least squares, where measurements far from the fit
+    get less weight.
+
+    **Important**: Ensure that the order of rcs_coords and measurements is
+    identical. I.e. the i-th entry in measurements is the measurement of the
+    i-th localization point.
+
+    Parameters
+    ----------
+    rcs_coords
+        The points where the robot endeffector was positioned to take
+        measurements. These points are in the RCS.
+    wcs_coords
+        The measurements taken in the world coordinate system (WCS) with the
+        total station.
+    method
+        One of ``"ransac"``, ``"huber"`` or ``"cauchy"``.
+    threshold
+        Maximum distance between a transformed point and its measurement for
+        the measurement to count as an inlier, in the units of the
+        coordinates. Estimated from the median distance if not given.
+    max_trials
+        Maximum number of subsets to try with ``method="ransac"``.
+    seed
+        Seed for the random subsets with ``method="ransac"``.
+
+    Returns
+    -------
+    :obj:`tuple`
+        The frame as origin, x axis and y axis (see
+        :func:`compas_mrr.arbitrary_pts_localization`), a boolean
+        :class:`numpy.ndarray` that is True for inliers and a
+        :class:`numpy.ndarray` with the distance between each transformed point
+        and its measurement.
+    """
+    rcs_coords = _coords_to_array(rcs_coords)
+    wcs_coords = _coords_to_array(wcs_coords)
+
+    if rcs_coords.shape != wcs_coords.shape:
+        raise ValueError("rcs_coords and wcs_coords need to have the same length.")
+
+    if len(rcs_coords) < 3:
+        raise ValueError("At least three point pairs are needed.")
+
+    if method == "ransac":
+        t, R, inliers = _ransac(
+            rcs_coords,
+            wcs_coords,
+            threshold=threshold,
+            max_trials=max_trials,
+            seed=seed,
+        )
+    elif method in ("huber", "cauchy"):
+        t, R, inliers = _irls(rcs_coords, wcs_coords, loss=method, threshold=threshold)
+    else:
+        raise ValueError(
+            "Unknown method {!r}, expected one of {}".format(
+                method, ", ".join(ROBUST_METHODS)
+            )
+        )
+
+    residuals = _distances(t, R, rcs_coords, wcs_coords)
+    frame = [t.tolist(), R[:, 0].tolist(), R[:, 1].tolist()]
+
+    return frame, inliers, residuals
@@ -0,0 +1,431 @@
+"""
+*******************************************************************************
+Localization server for clients like Grasshopper.
+*******************************************************************************
+
+A long running process with NumPy and SciPy already imported, answering
+localization requests over a local TCP socket. Start it with::
+
+    python -m compas_mrr serve --port 50123
+
+and use :class:`LocalizationClient` (which works in IronPython) to send
+requests.
+
+Messages are binary. Each message starts with a little endian header of the
+payload length (uint32), an operation code or status (uint8) and a request id
+(uint32) which is echoed in the response. A client may send several requests
+before reading the responses (pipelining), responses are sent in the order the
+requests were received.
+
+Operations:
+
+* ``OP_HEALTH``: no payload. Response payload is a UTF-8 JSON object with
+  server information.
+* ``OP_LOCALIZE``: payload is the solver method (uint8, see
+  ``LOCALIZE_METHODS``), the number of point pairs N (uint32) followed by the N
+  RCS points and the N WCS points as float64 XYZ triplets. Response payload is
+  origin, x axis, y axis and RMS deviation as 10 float64.
+
+Responses with ``STATUS_ERROR`` have the error message as UTF-8 payload.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import functools
+import json
+import socket
+import struct
+import sys
+import threading
+from collections import deque
+
+from compas_mrr.utils import TYPE_CHECKING
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver  # type: ignore
+
+if TYPE_CHECKING:
+    from typing import Any  # noqa: F401
+    from typing import Dict  # noqa: F401
+    from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
+
+    from compas_mrr.cache import LocalizationCache  # noqa: F401
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 50123
+
+HEADER = struct.Struct("<IBI")
+LOCALIZE_HEADER = struct.Struct("<BI")
+LOCALIZE_RESULT = struct.Struct("<10d")
+
+OP_HEALTH = 0
+OP_LOCALIZE = 1
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+LOCALIZE_METHODS = ("svd", "slsqp", "lm")
+
+# Requests a client sends before reading responses. Unbounded pipelining can
+# fill the socket buffers in both directions, blocking client and server.
+PIPELINE_WINDOW = 64
+
+
+def _recv_exact(sock, n):  # type: (socket.socket, int) -> bytes
+    """Receive exactly n bytes, or b"" if the connection was closed first."""
+    chunks = []
+    remaining = n
+
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            return b""
+        chunks.append(chunk)
+        remaining -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def _recv_message(sock):  # type: (socket.socket) -> Tuple[int, int, bytes]
+    """Receive one message as code, request id and payload.
+
+    Raises :class:`EOFError` if the connection is closed.
+    """
+    header = _recv_exact(sock, HEADER.size)
+    if not header:
+        raise EOFError("Connection closed.")
+
+    length, code, request_id = HEADER.unpack(header)
+    payload = _recv_exact(sock, length) if length else b""
+    if length and not payload:
+        raise EOFError("Connection closed.")
+
+    return code, request_id, payload
+
+
+def _pack_message(code, request_id, payload=b""):  # type: (int, int, bytes) -> bytes
+    return HEADER.pack(len(payload), code, request_id) + payload
+
+
+def _localize(payload, cache=None):
+    # type: (bytes, Union[None, LocalizationCache]) -> bytes
+    import numpy as np
+
+    from compas_mrr.arbitrary_pts_localization import arbitrary_pts_localization
+
+    method_code, n = LOCALIZE_HEADER.unpack_from(payload)
+
+    if method_code >= len(LOCALIZE_METHODS):
+        raise ValueError("Unknown method code {}".format(method_code))
+
+    if len(payload) != LOCALIZE_HEADER.size + n * 6 * 8:
+        raise ValueError("Payload size does not match {} point pairs.".format(n))
+
+    coords = np.frombuffer(payload, dtype="<f8", offset=LOCALIZE_HEADER.size)
+    rcs_coords, wcs_coords = coords.reshape(2, n, 3)
+
+    localize = arbitrary_pts_localization
+    if cache is not None:
+        localize = functools.partial(cache.localize, arbitrary_pts_localization)
+
+    (origin, x_vec, y_vec), diagnostics = localize(
+        rcs_coords,
+        wcs_coords,
+        method=LOCALIZE_METHODS[method_code],
+        full_output=True,
+    )
+
+    return LOCALIZE_RESULT.pack(*(origin + x_vec + y_vec + [diagnostics.rms]))
+
+
+class _LocalizationRequestHandler(socketserver.BaseRequestHandler):
+    def setup(self):  # type: () -> None
+        # Responses are small, don't hold them back waiting for an ACK
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):  # type: () -> None
+        while True:
+            try:
+                op, request_id, payload = _recv_message(self.request)
+            except (EOFError, socket.error):
+                return
+
+            try:
+                response = self.server.dispatch(op, payload)
+                status = STATUS_OK
+            except Exception as e:
+                response = "{}: {}".format(type(e).__name__, e).encode("utf-8")
+                status = STATUS_ERROR
+
+            self.request.sendall(_pack_message(status, request_id, response))
+
+
+class LocalizationServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Localization server, see module documentation for the protocol.
+
+    Parameters
+    ----------
+    host
+        Address to listen on, defaults to localhost only.
+    port
+        Port to listen on, 0 picks a free port.
+    warm
+        Import the solvers and run a localization before accepting requests.
+    cache
+        Cache for localization results, so repeated requests with the same
+        points are answered without solving, see :mod:`compas_mrr.cache`.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host=DEFAULT_HOST,  # type: str
+        port=DEFAULT_PORT,  # type: int
+        warm=True,  # type: bool
+        cache=None,  # type: Union[None, LocalizationCache]
+    ):  # type: (...) -> None
+        socketserver.TCPServer.__init__(self, (host, port), _LocalizationRequestHandler)
+        self._lock = threading.Lock()
+        self.cache = cache
+        self.requests_handled = 0
+
+        if warm:
+            self.warm_up()
+
+    def warm_up(self):  # type: () -> None
+        """Import the solvers and run a localization on a small point set."""
+        coords = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+        flat = [c for pt in coords + coords for c in pt]
+        payload = LOCALIZE_HEADER.pack(0, len(coords))
+        _localize(payload + struct.pack("<{}d".format(len(flat)), *flat))
+
+    def dispatch(self, op, payload):  # type: (int, bytes) -> bytes
+        """Handle a request payload for an operation and return the response."""
+        with self._lock:
+            self.requests_handled += 1
+
+        if op == OP_HEALTH:
+            return self.health()
+
+        if op == OP_LOCALIZE:
+            return _localize(payload, cache=self.cache)
+
+        raise ValueError("Unknown operation {}".format(op))
+
+    def health(self):  # type: () -> bytes
+        import compas
+
+        import compas_mrr
+
+        info = {
+            "status": "ok",
+            "compas_mrr": compas_mrr.__version__,
+            "compas": compas.__version__,
+            "python": sys.version.split()[0],
+            "requests_handled": self.requests_handled,
+        }
+
+        if self.cache is not None:
+            info["cache"] = {
+                "size": len(self.cache),
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+            }
+
+        return json.dumps(info).encode("utf-8")
+
+
+def serve(
+    host=DEFAULT_HOST,  # type: str
+    port=DEFAULT_PORT,  # type: int
+    cache_size=128,  # type: int
+    cache_dir=None,  # type: Union[None, str]
+):  # type: (...) -> None
+    """Run a :class:`LocalizationServer` until interrupted.
+
+    Parameters
+    ----------
+    host
+        Address to listen on.
+    port
+        Port to listen on.
+    cache_size
+        Number of localization results kept in memory, 0 disables the cache.
+    cache_dir
+        Directory to also store localization results in, so they survive a
+        restart of the server. Results are only kept in memory by default.
+    """
+    cache = None
+    if cache_size > 0:
+        from compas_mrr.cache import LocalizationCache
+
+        cache = LocalizationCache(maxsize=cache_size, directory=cache_dir)
+
+    server = LocalizationServer(host, port, cache=cache)
+    print("compas_mrr localization server listening on {}:{}".format(host, port))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+class LocalizationClient(object):
+    """Client for :class:`LocalizationServer`, works in IronPython.
+
+    Parameters
+    ----------
+    host
+        Address of the server.
+    port
+        Port of the server.
+    timeout
+        Socket timeout in seconds.
+
+    Examples
+    --------
+    >>> server = LocalizationServer(port=0, warm=False)
+    >>> thread = threading.Thread(target=server.serve_forever)
+    >>> thread.start()
+    >>> with LocalizationClient(port=server.server_address[1]) as client:
+    ...     client.health()["status"]
+    'ok'
+    >>> server.shutdown()
+    >>> server.server_close()
+    """
+
+    def __init__(
+        self,
+        host=DEFAULT_HOST,  # type: str
+        port=DEFAULT_PORT,  # type: int
+        timeout=30.0,  # type: float
+    ):  # type: (...) -> None
+        self._sock = socket.create_connection((host, port), timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._next_id = 0
+
+    def __enter__(self):  # type: () -> LocalizationClient
+        return self
+
+    def __exit__(self, *args):  # type: (Any) -> None
+        self.close()
+
+    def close(self):  # type: () -> None
+        """Close the connection."""
+        self._sock.close()
+
+    def _request_id(self):  # type: () -> int
+        self._next_id = (self._next_id + 1) % 2**32
+        return self._next_id
+
+    def _receive(self, request_id):  # type: (int) -> bytes
+        status, response_id, payload = _recv_message(self._sock)
+
+        if response_id != request_id:
+            raise RuntimeError(
+                "Expected response {}, got {}".format(request_id, response_id)
+            )
+
+        if status == STATUS_ERROR:
+            raise RuntimeError(payload.decode("utf-8"))
+
+        return payload
+
+    def health(self):  # type: () -> Dict[str, Any]
+        """Get server information."""
+        request_id = self._request_id()
+        self._sock.sendall(_pack_message(OP_HEALTH, request_id))
+
+        return json.loads(self._receive(request_id).decode("utf-8"))
+
+    def localize_many(
+        self,
+        pairs,  # type: List[Tuple[List[List[float]], List[List[float]]]]
+        method="svd",  # type: str
+        window=PIPELINE_WINDOW,  # type: int
+    ):  # type: (...) -> List[Tuple[List[List[float]], float]]
+        """Localize several sets of point pairs, pipelined on one connection.
+
+        Parameters
+        ----------
+        pairs
+            Sequence of (RCS points, WCS points) sets.
+        method
+            Solver, see :func:`compas_mrr.arbitrary_pts_localization`.
+        window
+            Maximum number of requests sent before reading their responses.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`tuple`
+            The frame as origin, x axis and y axis (see
+            :func:`compas_mrr.arbitrary_pts_localization`) and the RMS
+            deviation for each set.
+        """
+        method_code = LOCALIZE_METHODS.index(method)
+
+        messages = []
+        request_ids = []
+        for rcs_coords, wcs_coords in pairs:
+            rcs_coords = [[float(c) for c in pt] for pt in rcs_coords]
+            wcs_coords = [[float(c) for c in pt] for pt in wcs_coords]
+            if len(rcs_coords) != len(wcs_coords):
+                raise ValueError("Point sets need to have the same length.")
+
+            flat = [c for pt in rcs_coords + wcs_coords for c in pt]
+            payload = LOCALIZE_HEADER.pack(method_code, len(rcs_coords))
+            payload += struct.pack("<{}d".format(len(flat)), *flat)
+
+            request_id = self._request_id()
+            request_ids.append(request_id)
+            messages.append(_pack_message(OP_LOCALIZE, request_id, payload))
+
+        if window < 1:
+            raise ValueError("window needs to be at least 1, got {}.".format(window))
+
+        results = []
+        pending = deque()  # type: deque
+
+        def receive_oldest():
+            values = list(LOCALIZE_RESULT.unpack(self._receive(pending.popleft())))
+            results.append(([values[0:3], values[3:6], values[6:9]], values[9]))
+
+        # Send in batches of half a window, so the server has the other half
+        # to work on while a batch is sent.
+        batch_size = max(window // 2, 1)
+        for start in range(0, len(messages), batch_size):
+            batch = request_ids[start : start + batch_size]
+
+            while pending and len(pending) + len(batch) > window:
+                receive_oldest()
+
+            self._sock.sendall(b"".join(messages[start : start + batch_size]))
+            pending.extend(batch)
+
+        while pending:
+            receive_oldest()
+
+        return results
+
+    def localize(
+        self,
+        rcs_coords,  # type: List[List[float]]
+        wcs_coords,  # type: List[List[float]]
+        method="svd",  # type: str
+    ):  # type: (...) -> Tuple[List[List[float]], float]
+        """Localize one set of point pairs.
+
+        Returns the frame as origin, x axis and y axis and the RMS deviation.
+        See :meth:`localize_many`.
+        """
+        return self.localize_many([(rcs_coords, wcs_coords)], method=method)[0]
@@ -4,15 +4,18 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import math
+
 from compas.geometry import Frame
-from compas.geometry import Transformation
 
 from compas_mrr.utils import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from typing import List  # noqa: F401
+    from typing import Tuple  # noqa: F401
     from typing import Union  # noqa: F401
 
+    import numpy as np  # noqa: F401
     from compas.geometry import Point  # noqa: F401
 
 
@@ -27,26 +30,119 @@ def _coerce_frame(frame_or_pts):  # type: (Union[List[Point], Frame]) -> Frame
     return _pts_to_frame(frame_or_pts)
 
 
+def _normalize(v):  # type: (List[float]) -> List[float]
+    length = math.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+    return [v[0] / length, v[1] / length, v[2] / length]
+
+
+def _cross(u, v):  # type: (List[float], List[float]) -> List[float]
+    return [
+        u[1] * v[2] - u[2] * v[1],
+        u[2] * v[0] - u[0] * v[2],
+        u[0] * v[1] - u[1] * v[0],
+    ]
+
+
+def _frame_axes(frame_or_pts):
+    # type: (Union[List[Point], Frame]) -> Tuple[List[float], List[List[float]]]
+    """Origin and orthonormal x, y and z axis of a frame or three points.
+
+    Same frame as :meth:`compas.geometry.Frame.from_points`.
+    """
+    if isinstance(frame_or_pts, Frame):
+        frame = frame_or_pts
+        return list(frame.point), [
+            list(frame.xaxis),
+            list(frame.yaxis),
+            list(frame.zaxis),
+        ]
+
+    p1, p2, p3 = [[float(c) for c in pt] for pt in frame_or_pts]
+    x_vec = [p2[i] - p1[i] for i in range(3)]
+    y_vec = [p3[i] - p1[i] for i in range(3)]
+
+    x_axis = _normalize(x_vec)
+    z_axis = _normalize(_cross(x_vec, y_vec))
+    y_axis = _cross(z_axis, x_axis)
+
+    return p1, [x_axis, y_axis, z_axis]
+
+
 def three_pts_localization(rcs_coords, wcs_coords):  # type: (List[Point], List[Point]) -> Frame
     """Get the robot base frame in WCS using three points method.
 
+    The first point is the origin of a frame, the second point lies on the x
+    axis and the third point in the x-y plane. The robot base frame is the
+    transformation from this frame in RCS to the frame in WCS applied to the
+    world XY frame.
+
     Parameters
     ----------
     rcs_coords
-        List of the RCS coordinates used for measurements.
+        List of the RCS coordinates used for measurements, or a frame.
     wcs_coords
-        List of the WCS coordinates used for measurements.
+        List of the WCS coordinates used for measurements, or a frame.
 
     Returns
     -------
         The base frame of the robot in WCS.
     """
-    recorded_frame_rcs = _coerce_frame(rcs_coords)
-    recorded_frame_wcs = _coerce_frame(wcs_coords)
+    rcs_origin, rcs_axes = _frame_axes(rcs_coords)
+    wcs_origin, wcs_axes = _frame_axes(wcs_coords)
+
+    # Rotation from RCS to WCS, R = sum of outer products of the axes
+    R = [
+        [sum(wcs_axes[k][i] * rcs_axes[k][j] for k in range(3)) for j in range(3)]
+        for i in range(3)
+    ]
+
+    origin = [
+        wcs_origin[i] - sum(R[i][j] * rcs_origin[j] for j in range(3)) for i in range(3)
+    ]
+
+    return Frame(origin, [R[0][0], R[1][0], R[2][0]], [R[0][1], R[1][1], R[2][1]])
+
+
+def batch_three_pts_localization(rcs_triples, wcs_triples):
+    # type: (np.ndarray, np.ndarray) -> np.ndarray
+    """Get many robot base frames using the three points method at once.
+
+    Vectorized version of :func:`three_pts_localization`.
+
+    Parameters
+    ----------
+    rcs_triples
+        (K, 3, 3) array of K triples of RCS points.
+    wcs_triples
+        (K, 3, 3) array of K triples of WCS points.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        (K, 3, 3) array of frames as origin, x axis and y axis, like
+        :func:`compas_mrr.batch_arbitrary_pts_localization`.
+    """
+    import numpy as np
+
+    rcs_triples = np.asarray(rcs_triples, dtype=float)
+    wcs_triples = np.asarray(wcs_triples, dtype=float)
+
+    if rcs_triples.shape != wcs_triples.shape or rcs_triples.shape[-2:] != (3, 3):
+        raise ValueError("Expected two (K, 3, 3) arrays of point triples.")
+
+    def axes(triples):
+        x_vec = triples[..., 1, :] - triples[..., 0, :]
+        y_vec = triples[..., 2, :] - triples[..., 0, :]
+
+        x_axis = x_vec / np.linalg.norm(x_vec, axis=-1, keepdims=True)
+        z_axis = np.cross(x_vec, y_vec)
+        z_axis /= np.linalg.norm(z_axis, axis=-1, keepdims=True)
 
-    T = Transformation.from_frame_to_frame(recorded_frame_rcs, recorded_frame_wcs)
+        return np.stack((x_axis, np.cross(z_axis, x_axis), z_axis), axis=-2)
 
-    wcs_robot_base = Frame.worldXY()
-    wcs_robot_base.transform(T)
+    R = np.einsum("...ki,...kj->...ij", axes(wcs_triples), axes(rcs_triples))
+    origin = wcs_triples[..., 0, :] - np.einsum(
+        "...ij,...j->...i", R, rcs_triples[..., 0, :]
+    )
 
-    return wcs_robot_base
+    return np.stack((origin, R[..., 0], R[..., 1]), axis=-2)
@@ -9,6 +9,10 @@ import compas.geometry
 
 try:
     import Rhino.Geometry  # type: ignore
+    import System  # type: ignore
+    from System.Runtime.InteropServices import GCHandle  # type: ignore
+    from System.Runtime.InteropServices import GCHandleType  # type: ignore
+    from System.Runtime.InteropServices import Marshal  # type: ignore
 except ImportError:
     pass
 
@@ -34,7 +38,9 @@ def _is_type_checking():  # type: () -> bool
 TYPE_CHECKING = _is_type_checking()  # type: bool
 
 if TYPE_CHECKING:
+    from typing import Any  # noqa: F401
     from typing import List  # noqa: F401
+    from typing import Sequence  # noqa: F401
 
 
 def rgpoint_to_cgpoint(pt):
@@ -101,3 +107,185 @@ def matrix_to_rgtransform(M):  # type: (List[List[float]]) -> Rhino.Geometry.Tra
             rgT[i, j] = val
 
     return rgT
+
+
+def _tolist(values):  # type: (Any) -> Any
+    """Convert arrays to nested lists in one call, other sequences are kept."""
+    if hasattr(values, "tolist"):
+        return values.tolist()
+
+    return values
+
+
+def _flatten(values):  # type: (Any) -> List[float]
+    """Flat list of floats from an array or nested sequences."""
+    if hasattr(values, "ravel"):
+        return values.ravel().tolist()
+
+    return [float(c) for row in values for c in row]
+
+
+def _copy_to_structs(struct_type, flat, width):
+    # type: (Any, List[float], int) -> Any
+    """Create a .NET array of structs from a flat buffer of doubles.
+
+    ``Point3d`` and ``Transform`` are blittable structs of 3 and 16 doubles
+    (the latter row by row), so the whole buffer is copied into the pinned
+    struct array with a single :meth:`Marshal.Copy` instead of setting each
+    value through the interop layer.
+    """
+    structs = System.Array.CreateInstance(struct_type, len(flat) // width)
+    handle = GCHandle.Alloc(structs, GCHandleType.Pinned)
+    try:
+        Marshal.Copy(
+            System.Array[float](flat), 0, handle.AddrOfPinnedObject(), len(flat)
+        )
+    finally:
+        handle.Free()
+
+    return structs
+
+
+def _copy_from_structs(struct_type, structs, width):
+    # type: (Any, Sequence[Any], int) -> List[float]
+    """Flat list of doubles of a sequence of structs, see :func:`_copy_to_structs`."""
+    structs = System.Array[struct_type](structs)
+    flat = System.Array.CreateInstance(float, len(structs) * width)
+    handle = GCHandle.Alloc(structs, GCHandleType.Pinned)
+    try:
+        Marshal.Copy(handle.AddrOfPinnedObject(), flat, 0, len(flat))
+    finally:
+        handle.Free()
+
+    return list(flat)
+
+
+def cgpoints_to_rgpoints(points):
+    # type: (Sequence[Sequence[float]]) -> System.Array[Rhino.Geometry.Point3d]
+    """Convert many points to :class:`Rhino.Geometry.Point3d`.
+
+    The coordinates are copied to .NET in one call, see
+    :func:`_copy_to_structs`.
+
+    Parameters
+    ----------
+    points
+        :class:`compas.geometry.Point` objects, coordinate lists or a (N, 3)
+        :class:`numpy.ndarray`.
+
+    Returns
+    -------
+    :class:`System.Array` of :class:`Rhino.Geometry.Point3d`
+        Can be passed to :class:`Rhino.Collections.Point3dList` or any method
+        taking an ``IEnumerable<Point3d>``.
+    """
+    _ensure_rhino()
+
+    return _copy_to_structs(Rhino.Geometry.Point3d, _flatten(points), 3)
+
+
+def rgpoints_to_coords(points):
+    # type: (Sequence[Rhino.Geometry.Point3d]) -> List[List[float]]
+    """Get coordinates of many :class:`Rhino.Geometry.Point3d`.
+
+    The coordinates are copied from .NET in one call. The result can be
+    converted to a (N, 3) array with :func:`numpy.array` in one call.
+    """
+    _ensure_rhino()
+
+    flat = _copy_from_structs(Rhino.Geometry.Point3d, points, 3)
+
+    return [flat[i : i + 3] for i in range(0, len(flat), 3)]
+
+
+def cgframes_to_rgplanes(frames):
+    # type: (Sequence[Any]) -> List[Rhino.Geometry.Plane]
+    """Convert many frames to :class:`Rhino.Geometry.Plane`.
+
+    Parameters
+    ----------
+    frames
+        :class:`compas.geometry.Frame` objects, or origin, x axis and y axis of
+        each frame as nested lists or a (N, 3, 3) :class:`numpy.ndarray` (e.g.
+        from :func:`compas_mrr.batch_arbitrary_pts_localization`).
+
+    Returns
+    -------
+    :obj:`list` of :class:`Rhino.Geometry.Plane`
+    """
+    _ensure_rhino()
+
+    Plane = Rhino.Geometry.Plane
+    Point3d = Rhino.Geometry.Point3d
+    Vector3d = Rhino.Geometry.Vector3d
+
+    planes = []
+    for frame in _tolist(frames):
+        if isinstance(frame, compas.geometry.Frame):
+            frame = (frame.point, frame.xaxis, frame.yaxis)
+
+        (ox, oy, oz), (xx, xy, xz), (yx, yy, yz) = frame
+        planes.append(
+            Plane(Point3d(ox, oy, oz), Vector3d(xx, xy, xz), Vector3d(yx, yy, yz))
+        )
+
+    return planes
+
+
+def rgplanes_to_frames(planes):
+    # type: (Sequence[Rhino.Geometry.Plane]) -> List[List[List[float]]]
+    """Get origin, x axis and y axis of many :class:`Rhino.Geometry.Plane`."""
+    _ensure_rhino()
+
+    frames = []
+    for plane in planes:
+        o, x, y = plane.Origin, plane.XAxis, plane.YAxis
+        frames.append([[o.X, o.Y, o.Z], [x.X, x.Y, x.Z], [y.X, y.Y, y.Z]])
+
+    return frames
+
+
+def matrices_to_rgtransforms(matrices):
+    # type: (Sequence[Any]) -> System.Array[Rhino.Geometry.Transform]
+    """Create many :class:`Rhino.Geometry.Transform` from transformation matrices.
+
+    The matrices are copied to .NET in one call, see :func:`_copy_to_structs`.
+
+    Parameters
+    ----------
+    matrices
+        4x4 matrices as nested lists or a (N, 4, 4) :class:`numpy.ndarray`.
+
+    Returns
+    -------
+    :class:`System.Array` of :class:`Rhino.Geometry.Transform`
+    """
+    _ensure_rhino()
+
+    if hasattr(matrices, "ravel"):
+        flat = matrices.ravel().tolist()
+    else:
+        flat = [float(v) for M in matrices for row in M for v in row]
+
+    return _copy_to_structs(Rhino.Geometry.Transform, flat, 16)
+
+
+def rgtransforms_to_matrices(transforms):
+    # type: (Sequence[Rhino.Geometry.Transform]) -> List[List[List[float]]]
+    """Get matrices of many :class:`Rhino.Geometry.Transform`.
+
+    The matrices are copied from .NET in one call.
+    """
+    _ensure_rhino()
+
+    flat = _copy_from_structs(Rhino.Geometry.Transform, transforms, 16)
+
+    return [
+        [
+            flat[i : i + 4],
+            flat[i + 4 : i + 8],
+            flat[i + 8 : i + 12],
+            flat[i + 12 : i + 16],
+        ]
+        for i in range(0, len(flat), 16)
+    ]
@@ -4,6 +4,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import math
+
 import compas.geometry as cg
 
 from compas_mrr.utils import TYPE_CHECKING
@@ -15,44 +17,146 @@ except ImportError:
 
 if TYPE_CHECKING:
     from typing import Any  # noqa: F401
+    from typing import Callable  # noqa: F401
+    from typing import Dict  # noqa: F401
     from typing import List  # noqa: F401
+    from typing import Sequence as SequenceType  # noqa: F401
+    from typing import Tuple  # noqa: F401
+    from typing import Union  # noqa: F401
 
+    import numpy as np  # noqa: F401
 
-def _coerce_cg_xform(xform):  # type: (Any) -> cg.Transformation
+
+_XFORM_CONVERTERS = {}  # type: Dict[type, Callable[[Any], cg.Transformation]]
+_RESOLVED_CONVERTERS = {}  # type: Dict[type, Union[None, Callable[[Any], cg.Transformation]]]  # noqa: E501
+_OPTIONAL_CONVERTERS_REGISTERED = False
+
+
+def _is_finite(value):  # type: (float) -> bool
+    return not (math.isinf(value) or math.isnan(value))
+
+
+def _xform_from_sequence(M):  # type: (Any) -> cg.Transformation
+    """Create transformation from a nested sequence after a 4x4 shape check."""
     try:
-        from Rhino.Geometry import Transform  # type: ignore
+        rows = [[float(v) for v in row] for row in M]
+    except (TypeError, ValueError):
+        raise TypeError("Can't convert {} to a 4x4 matrix".format(type(M)))
+
+    if len(rows) != 4 or any(len(row) != 4 for row in rows):
+        raise TypeError("Transformation matrix needs to be 4x4.")
+
+    if not all(_is_finite(v) for row in rows for v in row):
+        raise TypeError("Transformation matrix contains non finite values.")
+
+    return cg.Transformation.from_matrix(rows)
+
+
+def _xform_from_ndarray(M):  # type: (np.ndarray) -> cg.Transformation
+    return _xform_from_sequence(M.tolist())
+
 
-        if isinstance(xform, Transform):
-            from compas_mrr.utils import rgtransform_to_matrix
+def _xform_from_rgtransform(rgT):  # type: (Any) -> cg.Transformation
+    from compas_mrr.utils import rgtransform_to_matrix
 
-            M = rgtransform_to_matrix(xform)
-            return cg.Transformation.from_matrix(M)
+    return cg.Transformation.from_matrix(rgtransform_to_matrix(rgT))
+
+
+def register_xform_converter(cls, converter):
+    # type: (type, Callable[[Any], cg.Transformation]) -> None
+    """Register a function converting objects of a type to a transformation.
+
+    The converter is used by :func:`xform_to_xyz_quaternion` and the other
+    functions accepting transformations, for instances of ``cls`` and its
+    subclasses. Converters for :class:`compas.geometry.Transformation`,
+    :class:`Rhino.Geometry.Transform`, :class:`numpy.ndarray` and sequences
+    are registered by default.
+
+    Parameters
+    ----------
+    cls
+        Type to convert.
+    converter
+        Function taking an object of type ``cls`` and returning a
+        :class:`compas.geometry.Transformation`. Should raise
+        :class:`TypeError` for invalid objects.
+
+    Examples
+    --------
+    >>> class Pose(object):
+    ...     def __init__(self, x, y, z):
+    ...         self.xyz = [x, y, z]
+    >>> register_xform_converter(
+    ...     Pose, lambda pose: cg.Translation.from_vector(pose.xyz)
+    ... )
+    >>> xform_to_xyz_quaternion(Pose(1, 2, 3))
+    [1.0, 2.0, 3.0, 1.0, 0.0, 0.0, 0.0]
+    """
+    _XFORM_CONVERTERS[cls] = converter
+    _RESOLVED_CONVERTERS.clear()
+
+
+def _register_optional_converters():  # type: () -> None
+    """Register converters for types from optional packages, tried only once."""
+    global _OPTIONAL_CONVERTERS_REGISTERED
+    _OPTIONAL_CONVERTERS_REGISTERED = True
+
+    try:
+        from Rhino.Geometry import Transform  # type: ignore
+
+        _XFORM_CONVERTERS.setdefault(Transform, _xform_from_rgtransform)
     except ImportError:
         pass
 
     try:
         from numpy import ndarray
 
-        if isinstance(xform, ndarray):
-            M = xform.tolist()
-            return cg.Transformation.from_matrix(M)
+        _XFORM_CONVERTERS.setdefault(ndarray, _xform_from_ndarray)
     except ImportError:
         pass
 
-    if isinstance(xform, cg.Transformation):
-        return xform
 
-    if isinstance(xform, Sequence):
-        try:
-            T = cg.Transformation.from_matrix(xform)
-            T.decomposed()  # raises type error on invalid T
-            return T
-        except TypeError:
-            pass
+def _resolve_converter(cls):
+    # type: (type) -> Union[None, Callable[[Any], cg.Transformation]]
+    """Find the converter for a type, looked up once per type and cached."""
+    try:
+        return _RESOLVED_CONVERTERS[cls]
+    except KeyError:
+        pass
+
+    if not _OPTIONAL_CONVERTERS_REGISTERED:
+        _register_optional_converters()
+
+    converter = None
+    for base in getattr(cls, "__mro__", (cls,)):
+        if base in _XFORM_CONVERTERS:
+            converter = _XFORM_CONVERTERS[base]
+            break
+    else:
+        # Registered abstract base classes (e.g. Sequence) are not in the MRO
+        for base, base_converter in _XFORM_CONVERTERS.items():
+            if issubclass(cls, base):
+                converter = base_converter
+                break
+
+    _RESOLVED_CONVERTERS[cls] = converter
+
+    return converter
+
+
+def _coerce_cg_xform(xform):  # type: (Any) -> cg.Transformation
+    converter = _resolve_converter(type(xform))
+
+    if converter is None:
+        raise TypeError(
+            "Can't convert {} to compas.geometry.Transformation".format(type(xform))
+        )
+
+    return converter(xform)
 
-    raise TypeError(
-        "Can't convert {} to compas.geometry.Transformation".format(type(xform))
-    )
+
+register_xform_converter(cg.Transformation, lambda T: T)
+register_xform_converter(Sequence, _xform_from_sequence)
 
 
 def worldxy_to_robot_base_xform(robot_base_frame):
@@ -100,3 +204,221 @@ def xform_to_xyz_quaternion(xform):  # type: (Any) -> List[float]
     wxyz = cg.Quaternion.from_rotation(xform.rotation).wxyz
 
     return xyz + wxyz
+
+
+def _matrices_to_quaternions(R):  # type: (np.ndarray) -> np.ndarray
+    """Convert stacked (..., 3, 3) rotation matrices to (..., 4) WXYZ quaternions.
+
+    Each row of the symmetric matrix below is ``4 * q_i * q``. The row is
+    picked like :func:`compas.geometry.quaternion_from_matrix` does (W if the
+    trace is positive, else the largest diagonal entry of ``R``), which avoids
+    dividing by small values and gives the same sign as compas, with the
+    picked component positive.
+    """
+    import numpy as np
+
+    trace = np.trace(R, axis1=-2, axis2=-1)
+
+    K = np.empty(R.shape[:-2] + (4, 4))
+    K[..., 0, 0] = 1 + trace
+    K[..., 1, 1] = 1 + 2 * R[..., 0, 0] - trace
+    K[..., 2, 2] = 1 + 2 * R[..., 1, 1] - trace
+    K[..., 3, 3] = 1 + 2 * R[..., 2, 2] - trace
+    K[..., 0, 1] = K[..., 1, 0] = R[..., 2, 1] - R[..., 1, 2]
+    K[..., 0, 2] = K[..., 2, 0] = R[..., 0, 2] - R[..., 2, 0]
+    K[..., 0, 3] = K[..., 3, 0] = R[..., 1, 0] - R[..., 0, 1]
+    K[..., 1, 2] = K[..., 2, 1] = R[..., 0, 1] + R[..., 1, 0]
+    K[..., 1, 3] = K[..., 3, 1] = R[..., 0, 2] + R[..., 2, 0]
+    K[..., 2, 3] = K[..., 3, 2] = R[..., 1, 2] + R[..., 2, 1]
+
+    r00, r11, r22 = R[..., 0, 0], R[..., 1, 1], R[..., 2, 2]
+    row = np.where(
+        trace > 0,
+        0,
+        np.where((r00 > r11) & (r00 > r22), 1, np.where(r11 > r22, 2, 3)),
+    )
+    q = np.take_along_axis(K, row[..., None, None], axis=-2)[..., 0, :]
+
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def xforms_to_xyz_quaternions(
+    xforms,  # type: Union[np.ndarray, SequenceType[Any]]
+    continuous=True,  # type: bool
+):  # type: (...) -> np.ndarray
+    """Convert many transformations to coords and quaternion values at once.
+
+    Vectorized version of :func:`xform_to_xyz_quaternion` for e.g. a whole
+    trajectory. The rotation part of the transformations is assumed to be
+    orthonormal (no scaling or shearing).
+
+    Parameters
+    ----------
+    xforms
+        Transformations as a (N, 4, 4) :class:`numpy.ndarray` or a sequence of
+        any type accepted by :func:`xform_to_xyz_quaternion`.
+    continuous
+        Flip the sign of quaternions where needed so that consecutive
+        quaternions are in the same hemisphere, avoiding the controller taking
+        the long way around between two targets. The first quaternion has a
+        non-negative W value. Without it, each quaternion is the same as
+        returned by :func:`xform_to_xyz_quaternion`.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        (N, 7) array of X, Y, Z, QW, QX, QY, QZ values.
+
+    >>> import numpy as np
+    >>> from compas.geometry import Frame, Rotation, Translation
+    >>> Tr = Translation.from_vector([100, 100, 100])
+    >>> R = Rotation.from_frame(Frame.worldYZ())
+    >>> xforms_to_xyz_quaternions([Tr * R, np.identity(4)])
+    array([[100. , 100. , 100. ,   0.5,   0.5,   0.5,   0.5],
+           [  0. ,   0. ,   0. ,   1. ,   0. ,   0. ,   0. ]])
+    """
+    import numpy as np
+
+    if not isinstance(xforms, np.ndarray):
+        xforms = [_coerce_cg_xform(xform).matrix for xform in xforms]
+
+    M = np.asarray(xforms, dtype=float)
+    if M.size == 0:
+        M = M.reshape(0, 4, 4)
+
+    if M.ndim != 3 or M.shape[1:] != (4, 4):
+        raise ValueError("Expected (N, 4, 4) transformations, got {}".format(M.shape))
+
+    q = _matrices_to_quaternions(M[:, :3, :3])
+
+    if continuous and len(q):
+        # flip where the dot product with the previous quaternion is negative,
+        # propagated along the path
+        signs = np.ones(len(q))
+        signs[0] = -1 if q[0, 0] < 0 else 1
+        signs[1:] = np.where(np.einsum("ij,ij->i", q[1:], q[:-1]) < 0, -1, 1)
+        q *= np.cumprod(signs)[:, None]
+
+    return np.concatenate((M[:, :3, 3], q), axis=-1)
+
+
+def _robot_base_axes(robot_base_frame):
+    # type: (Union[cg.Frame, List[List[float]]]) -> Tuple[np.ndarray, np.ndarray]
+    """Origin and (3, 3) matrix with the axes of the robot base frame as columns."""
+    import numpy as np
+
+    if not isinstance(robot_base_frame, cg.Frame):
+        robot_base_frame = cg.Frame(*robot_base_frame)
+
+    origin = np.array(robot_base_frame.point, dtype=float)
+    axes = np.array(
+        [
+            robot_base_frame.xaxis,
+            robot_base_frame.yaxis,
+            robot_base_frame.zaxis,
+        ],
+        dtype=float,
+    ).T
+
+    return origin, axes
+
+
+def _check_out(out, shape):  # type: (Union[None, np.ndarray], Tuple[int, ...]) -> None
+    if out is not None and out.shape != shape:
+        raise ValueError("Expected out with shape {}, got {}".format(shape, out.shape))
+
+
+def transform_points_to_robot_base(
+    points,  # type: Union[np.ndarray, List[List[float]]]
+    robot_base_frame,  # type: Union[cg.Frame, List[List[float]]]
+    inverse=False,  # type: bool
+    out=None,  # type: Union[None, np.ndarray]
+):  # type: (...) -> np.ndarray
+    """Transform points from WCS to RCS, or back, in one operation.
+
+    Equivalent to transforming each point with
+    :func:`worldxy_to_robot_base_xform` (or its inverse) without creating
+    compas objects.
+
+    Parameters
+    ----------
+    points
+        (N, 3) point coordinates.
+    robot_base_frame
+        Robot base frame in WCS, as :class:`compas.geometry.Frame` or origin, x
+        axis and y axis (e.g. the result of
+        :func:`compas_mrr.arbitrary_pts_localization`).
+    inverse
+        Transform from RCS to WCS instead.
+    out
+        Float array of shape (N, 3) to store the result in. Can be ``points``
+        itself to transform in place.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        (N, 3) transformed coordinates, ``out`` if given.
+
+    Examples
+    --------
+    >>> robot_base_frame = cg.Frame([100, 100, 100], [1, 0, 0], [0, 0, 1])
+    >>> transform_points_to_robot_base([[100, 100, 110]], robot_base_frame)
+    array([[ 0., 10.,  0.]])
+    """
+    import numpy as np
+
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError("Expected (N, 3) points, got {}".format(points.shape))
+
+    _check_out(out, points.shape)
+    origin, axes = _robot_base_axes(robot_base_frame)
+
+    if inverse:
+        out = np.matmul(points, axes.T, out=out)
+        out += origin
+    else:
+        out = np.subtract(points, origin, out=out)
+        np.matmul(out, axes, out=out)
+
+    return out
+
+
+def transform_orientations_to_robot_base(
+    orientations,  # type: Union[np.ndarray, List[List[List[float]]]]
+    robot_base_frame,  # type: Union[cg.Frame, List[List[float]]]
+    inverse=False,  # type: bool
+    out=None,  # type: Union[None, np.ndarray]
+):  # type: (...) -> np.ndarray
+    """Rotate frame orientations from WCS to RCS, or back, in one operation.
+
+    Parameters
+    ----------
+    orientations
+        (N, 3, 3) frame orientations, each with the x, y and z axis as rows.
+        Any (N, M, 3) array of vectors works.
+    robot_base_frame
+        Robot base frame in WCS, see :func:`transform_points_to_robot_base`.
+    inverse
+        Rotate from RCS to WCS instead.
+    out
+        Float array with the same shape as ``orientations`` to store the result
+        in. Can be ``orientations`` itself to rotate in place.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The rotated orientations, ``out`` if given.
+    """
+    import numpy as np
+
+    orientations = np.asarray(orientations, dtype=float)
+    if orientations.ndim != 3 or orientations.shape[2] != 3:
+        raise ValueError(
+            "Expected (N, 3, 3) orientations, got {}".format(orientations.shape)
+        )
+
+    _check_out(out, orientations.shape)
+    _, axes = _robot_base_axes(robot_base_frame)
+
+    return np.matmul(orientations, axes.T if inverse else axes, out=out)
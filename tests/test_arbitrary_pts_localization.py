@@ -4,42 +4,9 @@ from __future__ import print_function
 
 from compas import IPY
 from compas.rpc import Proxy
-from compas.geometry import Point
 from pytest import fixture
 
 
-@fixture
-def wcs_pts():
-    coords = [
-        [15402.885, 24560.608, 1046.399],
-        [15117.993, 23725.867, 1208.917],
-        [15223.168, 22797.331, 2399.654],
-        [16199.274, 22003.423, 1362.059],
-        [16786.777, 23083.323, 3974.498],
-        [17965.302, 23314.847, 4033.842],
-        [18982.944, 24283.387, 3544.996],
-        [18539.657, 25105.912, 2822.457],
-        [17748.109, 25368.456, 2296.253],
-    ]
-    return [Point(*c) for c in coords]
-
-
-@fixture
-def rcs_pts():
-    coords = [
-        [-2306.777, -271.836, -108.456],
-        [-2306.726, -1153.883, 53.651],
-        [-1908.872, -2001.106, 1251.384],
-        [-734.537, -2442.080, 201.813],
-        [-514.716, -1236.923, 2818.192],
-        [520.430, -645.945, 2879.326],
-        [1171.776, 591.959, 2397.131],
-        [499.173, 1232.814, 1660.649],
-        [-333.942, 1232.847, 1134.185],
-    ]
-    return [Point(*c) for c in coords]
-
-
 @fixture
 def approx_result():
     return [
@@ -63,6 +30,441 @@ def test_arbitrary_pts_localization(wcs_pts, rcs_pts, approx_result):
     assert result == approx(np.array(approx_result), abs=1e-4)
 
 
+def test_arbitrary_pts_localization_slsqp(wcs_pts, rcs_pts, approx_result):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import arbitrary_pts_localization
+
+    result = arbitrary_pts_localization(rcs_pts, wcs_pts, method="slsqp")
+
+    assert result == approx(np.array(approx_result), abs=1e-4)
+
+
+def test_arbitrary_pts_localization_lm(wcs_pts, rcs_pts, approx_result):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import arbitrary_pts_localization
+
+    result = arbitrary_pts_localization(rcs_pts, wcs_pts, method="lm")
+
+    assert result == approx(np.array(approx_result), abs=1e-4)
+
+    # matches the closed form solution and the axes are orthonormal
+    svd = arbitrary_pts_localization(rcs_pts, wcs_pts)
+    assert np.allclose(result, svd, atol=1e-8)
+
+    _, x_vec, y_vec = np.array(result)
+    R = np.column_stack((x_vec, y_vec, np.cross(x_vec, y_vec)))
+    assert np.allclose(R.T.dot(R), np.eye(3), atol=1e-14)
+
+
+def test_arbitrary_pts_localization_invalid_method(wcs_pts, rcs_pts):
+    if IPY:
+        return
+
+    from pytest import raises
+
+    from compas_mrr import arbitrary_pts_localization
+
+    with raises(ValueError):
+        arbitrary_pts_localization(rcs_pts, wcs_pts, method="newton")
+
+
+def test_arbitrary_pts_localization_svd_options(wcs_pts, rcs_pts, approx_result):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+    from pytest import raises
+
+    from compas_mrr import arbitrary_pts_localization
+
+    options = {
+        "plot_results": True,
+        "maxiter": 50,
+        "starts": 8,
+        "executor": "thread",
+        "tol": 1e3,
+        "full_rotation": True,
+        "initial_frame": approx_result,
+        "fallback_rms": 1.0,
+    }
+
+    for name, value in options.items():
+        with raises(ValueError, match=name):
+            arbitrary_pts_localization(rcs_pts, wcs_pts, **{name: value})
+
+    # the defaults can be passed explicitly
+    result = arbitrary_pts_localization(
+        rcs_pts, wcs_pts, method="svd", maxiter=200, starts=4, plot_results=False
+    )
+
+    assert result == approx(np.array(approx_result), abs=1e-4)
+
+
+def test_arbitrary_pts_localization_invalid_points(wcs_pts, rcs_pts):
+    if IPY:
+        return
+
+    from pytest import raises
+
+    from compas_mrr import arbitrary_pts_localization
+
+    for method in ("svd", "slsqp", "lm"):
+        with raises(ValueError, match="same length"):
+            arbitrary_pts_localization(rcs_pts, wcs_pts[:-1], method=method)
+
+        with raises(ValueError, match="three point pairs"):
+            arbitrary_pts_localization(rcs_pts[:2], wcs_pts[:2], method=method)
+
+
+def test__kabsch_reflection():
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.arbitrary_pts_localization import _kabsch
+
+    # Planar point sets have a degenerate covariance where the best
+    # orthogonal fit could be a reflection.
+    rcs = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]], dtype=float)
+    wcs = rcs[:, [1, 0, 2]] + [10, 20, 30]
+
+    t, R = _kabsch(rcs, wcs)
+
+    assert np.linalg.det(R) > 0
+    assert np.allclose(R.dot(R.T), np.eye(3))
+
+
+def test_arbitrary_pts_localization_executors(wcs_pts, rcs_pts, approx_result):
+    if IPY:
+        return
+
+    import sys
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import arbitrary_pts_localization
+
+    module = sys.modules["compas_mrr.arbitrary_pts_localization"]
+
+    # real localizations have only a few points, they still use the pool
+    for executor in ("thread", "process"):
+        pools = []
+        for _ in range(2):
+            result = arbitrary_pts_localization(
+                rcs_pts, wcs_pts, method="slsqp", starts=6, executor=executor
+            )
+            pools.append(module._POOLS[executor])
+
+            assert result == approx(np.array(approx_result), abs=1e-4)
+
+        assert pools[0] is pools[1]
+
+
+def test_arbitrary_pts_localization_executors_serial(
+    wcs_pts, rcs_pts, approx_result, monkeypatch
+):
+    if IPY:
+        return
+
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy as np
+    from pytest import approx
+    from pytest import raises
+
+    from compas_mrr import arbitrary_pts_localization
+
+    module = sys.modules["compas_mrr.arbitrary_pts_localization"]
+    monkeypatch.setattr(module, "_POOLS", {})
+
+    # a single start doesn't start a pool
+    result = arbitrary_pts_localization(
+        rcs_pts, wcs_pts, method="slsqp", starts=1, executor="process"
+    )
+
+    assert result == approx(np.array(approx_result), abs=1e-4)
+    assert module._POOLS == {}
+
+    # a given executor is always used
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        submit = pool.submit
+        submitted = []
+
+        def counting_submit(*args, **kwargs):
+            submitted.append(args)
+            return submit(*args, **kwargs)
+
+        monkeypatch.setattr(pool, "submit", counting_submit)
+
+        result = arbitrary_pts_localization(
+            rcs_pts, wcs_pts, method="slsqp", starts=6, executor=pool
+        )
+
+    assert result == approx(np.array(approx_result), abs=1e-4)
+    assert len(submitted) == 6
+
+    with raises(ValueError):
+        arbitrary_pts_localization(
+            rcs_pts, wcs_pts, method="slsqp", starts=1, executor="fiber"
+        )
+
+    for method in ("slsqp", "lm"):
+        with raises(ValueError, match="starts"):
+            arbitrary_pts_localization(rcs_pts, wcs_pts, method=method, starts=0)
+
+
+def test_arbitrary_pts_localization_tol(wcs_pts, rcs_pts, approx_result):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import arbitrary_pts_localization
+
+    result = arbitrary_pts_localization(
+        rcs_pts, wcs_pts, method="slsqp", starts=16, executor="thread", tol=1e3
+    )
+
+    assert result == approx(np.array(approx_result), abs=1e-4)
+
+
+def test_arbitrary_pts_localization_initial_frame(
+    wcs_pts, rcs_pts, approx_result, monkeypatch
+):
+    if IPY:
+        return
+
+    import sys
+
+    import numpy as np
+    from compas.geometry import Frame
+    from pytest import approx
+    from pytest import raises
+
+    from compas_mrr import arbitrary_pts_localization
+
+    module = sys.modules["compas_mrr.arbitrary_pts_localization"]
+    solve_start = module._solve_start
+    x0s = []
+
+    def counting_solve_start(x0, *args, **kwargs):
+        x0s.append(x0)
+        return solve_start(x0, *args, **kwargs)
+
+    monkeypatch.setattr(module, "_solve_start", counting_solve_start)
+
+    # moved by a few centimetres and degrees
+    origin, x_vec, y_vec = np.array(approx_result)
+    initial_frame = Frame(origin + [30, -20, 5], x_vec + [0, 0.05, 0], y_vec)
+
+    result = arbitrary_pts_localization(
+        rcs_pts, wcs_pts, method="slsqp", initial_frame=initial_frame
+    )
+
+    assert result == approx(np.array(approx_result), abs=1e-4)
+    assert len(x0s) == 1
+
+    # falls back to the multi start solve if the deviation is too large
+    del x0s[:]
+    result = arbitrary_pts_localization(
+        rcs_pts,
+        wcs_pts,
+        method="slsqp",
+        starts=4,
+        initial_frame=initial_frame,
+        fallback_rms=0,
+    )
+
+    assert result == approx(np.array(approx_result), abs=1e-4)
+    assert len(x0s) == 5
+
+    # the closed form solution has no initial guess
+    with raises(ValueError):
+        arbitrary_pts_localization(rcs_pts, wcs_pts, initial_frame=initial_frame)
+
+
+def test__warm_guess():
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.arbitrary_pts_localization import _residuals
+    from compas_mrr.arbitrary_pts_localization import _warm_guess
+
+    frame = [[100.0, 200.0, 300.0], [0.0, 2.0, 0.0], [-1.0, 0.1, 0.0]]
+    rcs = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 10.0, 5.0]])
+    wcs = 100 * np.arange(1, 4) + np.column_stack((-rcs[:, 1], rcs[:, 0], rcs[:, 2]))
+
+    rcs_centroid, wcs_centroid = rcs.mean(axis=0), wcs.mean(axis=0)
+    x0 = _warm_guess(frame, rcs_centroid, wcs_centroid)
+
+    assert np.allclose(x0[3:], [0, 1, 0, -1, 0, 0])
+    assert np.allclose(_residuals(x0, rcs - rcs_centroid, wcs - wcs_centroid), 0)
+
+
+def test_arbitrary_pts_localization_full_rotation(rcs_pts):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import arbitrary_pts_localization
+
+    # Robot base upside down and tilted
+    x_vec = np.array([0.0, 0.6, 0.8])
+    y_vec = np.array([0.0, 0.8, -0.6])
+    axes = np.array((x_vec, y_vec, np.cross(x_vec, y_vec)))
+    origin = np.array([1000.0, -2000.0, 500.0])
+    wcs_pts = (np.array(rcs_pts).dot(axes) + origin).tolist()
+
+    result = arbitrary_pts_localization(
+        rcs_pts, wcs_pts, method="slsqp", starts=8, full_rotation=True
+    )
+
+    assert result == approx(np.array([origin, x_vec, y_vec]), abs=1e-4)
+
+
+def test__initial_guesses():
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.arbitrary_pts_localization import _initial_guesses
+
+    for full_rotation in (False, True):
+        x0s = _initial_guesses(7, full_rotation=full_rotation)
+        x_vecs, y_vecs = x0s[:, 3:6], x0s[:, 6:9]
+
+        assert x0s.shape == (7, 9)
+        assert np.allclose(x0s[:, 0:3], 0)
+        assert np.allclose(np.linalg.norm(x_vecs, axis=1), 1)
+        assert np.allclose(np.linalg.norm(y_vecs, axis=1), 1)
+        assert np.allclose(np.einsum("ij,ij->i", x_vecs, y_vecs), 0)
+
+
+def test__objective_gradient(wcs_pts, rcs_pts):
+    if IPY:
+        return
+
+    import numpy as np
+    from scipy.optimize import approx_fprime
+
+    from compas_mrr.arbitrary_pts_localization import _objective_function
+    from compas_mrr.arbitrary_pts_localization import _objective_gradient
+
+    rcs = np.array(rcs_pts) / 1000
+    wcs = np.array(wcs_pts) / 1000
+    x = np.array([1.0, 2.0, 0.5, 0.9, -0.3, 0.1, 0.4, 0.8, -0.2])
+
+    expected = approx_fprime(x, _objective_function, 1e-7, rcs, wcs)
+
+    assert np.allclose(_objective_gradient(x, rcs, wcs), expected, rtol=1e-4)
+
+
+def test__lm_jacobian(wcs_pts, rcs_pts):
+    if IPY:
+        return
+
+    import numpy as np
+    from scipy.optimize import approx_fprime
+
+    from compas_mrr.arbitrary_pts_localization import _lm_jacobian
+    from compas_mrr.arbitrary_pts_localization import _lm_residuals
+
+    rcs = np.array(rcs_pts) / 1000
+    wcs = np.array(wcs_pts) / 1000
+    R0 = np.array([[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+
+    for params in (np.array([1.0, 2.0, 0.5, 0.3, -0.2, 0.1]), np.zeros(6)):
+        expected = np.array(
+            [
+                approx_fprime(params, lambda p: _lm_residuals(p, R0, rcs, wcs)[i], 1e-7)
+                for i in range(3 * len(rcs))
+            ]
+        )
+
+        assert np.allclose(_lm_jacobian(params, R0, rcs, wcs), expected, atol=1e-5)
+
+
+def test_batch_arbitrary_pts_localization(wcs_pts, rcs_pts, approx_result):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr import batch_arbitrary_pts_localization
+
+    # Ragged sets, the last two sets are subsets of the first
+    rcs_sets = [rcs_pts, rcs_pts[:5], rcs_pts[3:]]
+    wcs_sets = [wcs_pts, wcs_pts[:5], wcs_pts[3:]]
+
+    frames, rms = batch_arbitrary_pts_localization(rcs_sets, wcs_sets)
+
+    assert frames.shape == (3, 3, 3)
+    assert rms.shape == (3,)
+    assert frames[0] == approx(np.array(approx_result), abs=1e-4)
+    # Sum of squared deviations from the SLSQP runs is about 506
+    assert rms[0] == approx(np.sqrt(506.0722 / len(rcs_pts)))
+
+    for frame, rcs, wcs in zip(frames, rcs_sets, wcs_sets):
+        assert frame == approx(np.array(arbitrary_pts_localization(rcs, wcs)))
+
+
+def test_batch_arbitrary_pts_localization_stacked(rcs_pts):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import batch_arbitrary_pts_localization
+
+    rcs = np.array(rcs_pts)
+    rcs_sets = np.stack((rcs, rcs))
+    wcs_sets = np.stack((rcs + [100.0, 0, 0], rcs[:, [1, 0, 2]] * [1, 1, -1]))
+
+    frames, rms = batch_arbitrary_pts_localization(rcs_sets, wcs_sets)
+
+    assert frames[0] == approx(np.array([[100, 0, 0], [1, 0, 0], [0, 1, 0]]))
+    assert frames[1] == approx(np.array([[0, 0, 0], [0, 1, 0], [1, 0, 0]]))
+    assert rms == approx(np.zeros(2), abs=1e-6)
+
+
+def test_batch_arbitrary_pts_localization_invalid(rcs_pts, wcs_pts):
+    if IPY:
+        return
+
+    from pytest import raises
+
+    from compas_mrr import batch_arbitrary_pts_localization
+
+    with raises(ValueError):
+        batch_arbitrary_pts_localization([rcs_pts[:2]], [wcs_pts[:2]])
+
+    with raises(ValueError):
+        batch_arbitrary_pts_localization([rcs_pts[:4]], [wcs_pts[:5]])
+
+
 def test_proxy(wcs_pts, rcs_pts, approx_result):
     with Proxy("compas_mrr.arbitrary_pts_localization", python="python") as proxy:
         result = proxy.arbitrary_pts_localization(rcs_pts, wcs_pts)
@@ -0,0 +1,192 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas import IPY
+
+
+def _counting(calls):
+    from compas_mrr import arbitrary_pts_localization
+
+    def localize(rcs_coords, wcs_coords, **kwargs):
+        calls.append(kwargs)
+        return arbitrary_pts_localization(rcs_coords, wcs_coords, **kwargs)
+
+    return localize
+
+
+def test_cached_localization(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr import cached_localization
+
+    calls = []
+    localize = cached_localization(_counting(calls), decimals=3)
+
+    frame = localize(rcs_coords, wcs_coords)
+    assert frame == arbitrary_pts_localization(rcs_coords, wcs_coords)
+
+    # same points below the rounding, as an array
+    noisy = np.array(wcs_coords) + 1e-5
+    assert localize(rcs_coords, noisy) == frame
+    assert len(calls) == 1
+
+    # results are copies
+    frame[0][0] = 0
+    assert localize(rcs_coords, wcs_coords)[0][0] != 0
+
+    localize(rcs_coords, wcs_coords, method="slsqp")
+    localize(rcs_coords, wcs_coords, method="slsqp", executor="thread")
+    assert len(calls) == 2
+
+    localize(rcs_coords, np.array(wcs_coords) + 1)
+    assert len(calls) == 3
+
+    assert (localize.cache.hits, localize.cache.misses) == (3, 3)
+
+
+def test_cache_lru(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    from compas_mrr import LocalizationCache
+
+    cache = LocalizationCache(maxsize=2)
+    calls = []
+    localize = _counting(calls)
+
+    for shift in (0, 1, 0, 2, 1):
+        wcs = [[c + shift for c in pt] for pt in wcs_coords]
+        cache.localize(localize, rcs_coords, wcs)
+
+    # 0 is kept as most recently used when 2 is added, 1 is evicted
+    assert len(calls) == 4
+    assert len(cache) == 2
+
+
+def test_cache_directory(rcs_coords, wcs_coords, tmp_path):
+    if IPY:
+        return
+
+    from compas_mrr import LocalizationCache
+
+    calls = []
+    localize = _counting(calls)
+
+    cache = LocalizationCache(directory=str(tmp_path))
+    frame, diagnostics = cache.localize(
+        localize, rcs_coords, wcs_coords, full_output=True
+    )
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    # a new process starts with an empty memory cache
+    restarted = LocalizationCache(directory=str(tmp_path))
+    cached_frame, cached_diagnostics = restarted.localize(
+        localize, rcs_coords, wcs_coords, full_output=True
+    )
+
+    assert len(calls) == 1
+    assert cached_frame == frame
+    assert cached_diagnostics.rms == diagnostics.rms
+    assert len(restarted) == 1
+
+    restarted.clear()
+    assert len(restarted) == 0
+    assert not list(tmp_path.glob("*.npz"))
+
+
+def test_cache_plot_results(rcs_coords, wcs_coords, tmp_path):
+    if IPY:
+        return
+
+    from compas_mrr import LocalizationCache
+    from compas_mrr.plotting import wait_for_plots
+
+    cache = LocalizationCache()
+    calls = []
+    localize = _counting(calls)
+
+    for _ in range(2):
+        cache.localize(
+            localize,
+            rcs_coords,
+            wcs_coords,
+            method="slsqp",
+            starts=1,
+            plot_results=str(tmp_path),
+        )
+    wait_for_plots()
+
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+def test_cache_directory_results(rcs_coords, wcs_coords, tmp_path):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import LocalizationCache
+    from compas_mrr import leave_one_out_diagnostics
+    from compas_mrr import robust_pts_localization
+
+    cache = LocalizationCache(directory=str(tmp_path))
+    restarted = LocalizationCache(directory=str(tmp_path))
+
+    for func, kwargs in (
+        (robust_pts_localization, {"seed": 0}),
+        (leave_one_out_diagnostics, {}),
+    ):
+        result = cache.localize(func, rcs_coords, wcs_coords, **kwargs)
+        cached = restarted.localize(func, rcs_coords, wcs_coords, **kwargs)
+
+        assert type(cached) is type(result)
+        for a, b in zip(cached, result):
+            assert type(a) is type(b)
+            assert np.array_equal(a, b)
+
+    assert restarted.misses == 0
+
+
+def test_cache_directory_not_storable(rcs_coords, wcs_coords, tmp_path):
+    if IPY:
+        return
+
+    from compas_mrr import LocalizationCache
+
+    cache = LocalizationCache(directory=str(tmp_path))
+
+    cache.localize(lambda rcs, wcs: {"frame": 1}, rcs_coords, wcs_coords)
+
+    # kept in memory only
+    assert len(cache) == 1
+    assert not list(tmp_path.glob("*.npz"))
+
+
+def test_cache_directory_no_pickle(rcs_coords, wcs_coords, tmp_path):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import LocalizationCache
+
+    calls = []
+    localize = _counting(calls)
+    cache = LocalizationCache(directory=str(tmp_path))
+    cache.localize(localize, rcs_coords, wcs_coords)
+
+    # replace the stored result with one that needs unpickling
+    (path,) = tmp_path.glob("*.npz")
+    with open(str(path), "wb") as f:
+        np.savez(f, layout=np.array('{"array": "a0"}'), a0=np.array([object()]))
+
+    restarted = LocalizationCache(directory=str(tmp_path))
+    restarted.localize(localize, rcs_coords, wcs_coords)
+
+    assert len(calls) == 2
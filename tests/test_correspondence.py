@@ -0,0 +1,97 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import compas
+from compas import IPY
+from compas.geometry import Frame
+from pytest import fixture
+
+from compas_mrr import MeasurementPoint
+from compas_mrr.correspondence import match_points
+from compas_mrr.pointlist import read_pointlist
+
+HERE = os.path.dirname(__file__)
+
+
+@fixture
+def rcs_frames():
+    return compas.json_load(os.path.join(HERE, "..", "grasshopper", "rcs_frames.json"))
+
+
+@fixture
+def wcs_pts():
+    return read_pointlist(
+        os.path.join(HERE, "..", "grasshopper", "wcs_frames.csv"), scale=1000
+    )
+
+
+def test_match_points_frames(rcs_frames, wcs_pts):
+    result = match_points(rcs_frames, list(reversed(wcs_pts)))
+
+    assert result.keys == list(range(10, 0, -1))
+    assert result.missing_rcs == []
+    assert result.missing_wcs == []
+    assert result.duplicates == []
+    assert result.rcs_coords[-1] == list(rcs_frames[0].point)
+    assert result.wcs_coords[-1] == list(wcs_pts[0])
+
+
+def test_match_points_labeled():
+    rcs = [
+        MeasurementPoint(0, 0, 0, "LP1"),
+        MeasurementPoint(1, 0, 0, "LP2"),
+        MeasurementPoint(2, 0, 0, "S1"),
+        MeasurementPoint(3, 0, 0, "LP4"),
+    ]
+    wcs = [
+        MeasurementPoint(12, 0, 0, "S1"),
+        MeasurementPoint(10, 0, 0, "LP1"),
+        MeasurementPoint(11, 0, 0, "LP2"),
+        MeasurementPoint(11.5, 0, 0, "LP2"),
+        MeasurementPoint(13, 0, 0, "LP3"),
+    ]
+
+    result = match_points(rcs, wcs)
+
+    assert result.keys == [("S", 1), ("LP", 1), ("LP", 2)]
+    assert result.rcs_coords == [[2, 0, 0], [0, 0, 0], [1, 0, 0]]
+    # Last measurement of duplicate is used
+    assert result.wcs_coords == [[12, 0, 0], [10, 0, 0], [11.5, 0, 0]]
+    assert result.missing_rcs == [("LP", 3)]
+    assert result.missing_wcs == [("LP", 4)]
+    assert result.duplicates == [("LP", 2)]
+
+
+def test_match_points_start():
+    rcs = [Frame.worldXY(), Frame([1, 0, 0], [1, 0, 0], [0, 1, 0])]
+    wcs = [MeasurementPoint(1, 2, 3, "LP0")]
+
+    result = match_points(rcs, wcs, start=0)
+
+    assert result.keys == [0]
+    assert result.rcs_coords == [[0, 0, 0]]
+    assert result.missing_wcs == [1]
+
+
+def test_find_correspondences(rcs_frames, wcs_pts):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.correspondence import find_correspondences
+
+    rcs = np.array([list(frame.point) for frame in rcs_frames])
+    wcs = np.array([list(pt) for pt in wcs_pts])
+
+    # Shuffle measurements and add a point not measured by the robot
+    order = np.random.default_rng(0).permutation(len(wcs))
+    wcs = np.vstack((wcs[order], [[16500.0, 24000.0, 0.0]]))
+
+    rcs_idxs, wcs_idxs = find_correspondences(rcs, wcs, max_distance=50.0)
+
+    assert rcs_idxs.tolist() == list(range(10))
+    assert order[wcs_idxs].tolist() == list(range(10))
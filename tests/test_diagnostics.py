@@ -0,0 +1,132 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas import IPY
+from pytest import raises
+
+
+def test_localization_diagnostics(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr import batch_arbitrary_pts_localization
+    from compas_mrr import localization_diagnostics
+
+    frame = arbitrary_pts_localization(rcs_coords, wcs_coords)
+    result = localization_diagnostics(rcs_coords, wcs_coords, frame)
+
+    _, expected_rms = batch_arbitrary_pts_localization([rcs_coords], [wcs_coords])
+
+    assert result.residuals.shape == (9, 3)
+    assert np.allclose(result.distances, np.linalg.norm(result.residuals, axis=1))
+    assert np.isclose(result.rms, expected_rms[0])
+
+    # symmetric positive definite
+    assert np.allclose(result.covariance, result.covariance.T)
+    assert np.all(np.linalg.eigvalsh(result.covariance) > 0)
+
+    # estimated sigma from the residuals with 3 * N - 6 degrees of freedom
+    sigma = np.sqrt(np.sum(result.distances**2) / 21)
+    with_sigma = localization_diagnostics(rcs_coords, wcs_coords, frame, sigma=sigma)
+    assert np.allclose(with_sigma.covariance, result.covariance)
+
+    doubled = localization_diagnostics(rcs_coords, wcs_coords, frame, sigma=2 * sigma)
+    assert np.allclose(doubled.covariance, 4 * result.covariance)
+
+
+def test_localization_diagnostics_collinear():
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import localization_diagnostics
+
+    coords = [[0, 0, 0], [1, 0, 0], [2, 0, 0]]
+    frame = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+
+    result = localization_diagnostics(coords, coords, frame, sigma=1.0)
+
+    assert not np.all(np.isfinite(result.covariance))
+
+
+def test_localization_diagnostics_invalid(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    from compas_mrr import localization_diagnostics
+
+    frame = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+
+    with raises(ValueError):
+        localization_diagnostics(rcs_coords, wcs_coords[:-1], frame)
+
+    with raises(ValueError):
+        localization_diagnostics(rcs_coords[:2], wcs_coords[:2], frame)
+
+
+def test_full_output(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    from compas_mrr import arbitrary_pts_localization
+
+    for method in ("svd", "slsqp"):
+        frame, diagnostics = arbitrary_pts_localization(
+            rcs_coords, wcs_coords, method=method, full_output=True
+        )
+
+        assert frame == arbitrary_pts_localization(
+            rcs_coords, wcs_coords, method=method
+        )
+        assert diagnostics.covariance.shape == (6, 6)
+
+
+def test_leave_one_out_diagnostics(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr import leave_one_out_diagnostics
+
+    result = leave_one_out_diagnostics(rcs_coords, wcs_coords)
+
+    full_origin, full_x, full_y = np.array(
+        arbitrary_pts_localization(rcs_coords, wcs_coords)
+    )
+
+    for i in range(len(rcs_coords)):
+        rcs = rcs_coords[:i] + rcs_coords[i + 1 :]
+        wcs = wcs_coords[:i] + wcs_coords[i + 1 :]
+        origin, x_vec, y_vec = np.array(arbitrary_pts_localization(rcs, wcs))
+        R = np.column_stack((x_vec, y_vec, np.cross(x_vec, y_vec)))
+
+        predicted = R.dot(rcs_coords[i]) + origin
+        assert np.allclose(result.residuals[i], predicted - wcs_coords[i])
+        assert np.allclose(result.translations[i], origin - full_origin)
+
+        # small rotation vector w with R = exp([w]) * R_full
+        x_delta = np.cross(result.rotations[i], full_x) + full_x
+        assert np.allclose(x_delta, x_vec, atol=1e-6)
+
+    assert np.allclose(result.distances, np.linalg.norm(result.residuals, axis=1))
+    assert np.isclose(result.rms, np.sqrt(np.mean(result.distances**2)))
+
+
+def test_leave_one_out_diagnostics_invalid(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    from compas_mrr import leave_one_out_diagnostics
+
+    with raises(ValueError):
+        leave_one_out_diagnostics(rcs_coords, wcs_coords[:-1])
+
+    with raises(ValueError):
+        leave_one_out_diagnostics(rcs_coords[:3], wcs_coords[:3])
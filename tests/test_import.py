@@ -0,0 +1,92 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import subprocess
+import sys
+
+from compas import IPY
+
+# Import time of compas_mrr on top of compas.geometry, in seconds
+IMPORT_TIME_BUDGET = 0.5
+
+LAZY_SUBMODULES = [
+    "compas_mrr.arbitrary_pts_localization",
+    "compas_mrr.robust_pts_localization",
+    "compas_mrr.incremental_localization",
+    "compas_mrr.measurement_point_cloud",
+]
+
+
+def _run(code):  # type: (str) -> str
+    return subprocess.check_output([sys.executable, "-c", code]).decode().strip()
+
+
+def test_import_is_lazy():
+    if IPY:
+        return
+
+    code = "import sys, compas_mrr; print(' '.join(sorted(sys.modules)))"
+    modules = _run(code).split()
+
+    for name in LAZY_SUBMODULES:
+        assert name not in modules
+
+
+def test_import_time_budget():
+    if IPY:
+        return
+
+    code = (
+        "import time, compas.geometry; t = time.perf_counter(); import compas_mrr; "
+        "print(time.perf_counter() - t)"
+    )
+
+    assert float(_run(code)) < IMPORT_TIME_BUDGET
+
+
+def test_lazy_attributes():
+    if IPY:
+        return
+
+    import compas_mrr
+    from compas_mrr.arbitrary_pts_localization import _kabsch  # noqa: F401
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr import IncrementalLocalizer
+
+    # Importing the submodule first must not shadow the function
+    assert callable(arbitrary_pts_localization)
+    assert arbitrary_pts_localization.__name__ == "arbitrary_pts_localization"
+    assert isinstance(IncrementalLocalizer, type)
+    assert "MeasurementPointCloud" in dir(compas_mrr)
+
+
+def test_star_import():
+    if IPY:
+        return
+
+    import compas_mrr
+
+    namespace = {}
+    exec("from compas_mrr import *", namespace)
+
+    for name in compas_mrr.__all__:
+        assert namespace[name] is getattr(compas_mrr, name)
+
+    for name in compas_mrr._LAZY_ATTRS:
+        assert callable(namespace[name])
+
+    assert "arbitrary_pts_localization" in namespace
+    assert "three_pts_localization" in namespace
+
+
+def test_unknown_attribute():
+    if IPY:
+        return
+
+    from pytest import raises
+
+    import compas_mrr
+
+    with raises(AttributeError):
+        compas_mrr.does_not_exist
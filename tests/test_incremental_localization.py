@@ -0,0 +1,71 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas import IPY
+
+
+def test_incremental_localizer(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import IncrementalLocalizer
+    from compas_mrr import batch_arbitrary_pts_localization
+
+    localizer = IncrementalLocalizer()
+
+    for i, (rcs_pt, wcs_pt) in enumerate(zip(rcs_coords, wcs_coords)):
+        frame, rms = localizer.add(rcs_pt, wcs_pt)
+
+        if i < 2:
+            assert frame is None
+            assert rms is None
+            continue
+
+        frames, expected_rms = batch_arbitrary_pts_localization(
+            [rcs_coords[: i + 1]], [wcs_coords[: i + 1]]
+        )
+
+        assert np.array(frame) == approx(frames[0])
+        assert rms == approx(expected_rms[0])
+
+    assert localizer.n == len(rcs_coords)
+
+
+def test_incremental_localizer_converged(rcs_coords):
+    if IPY:
+        return
+
+    from compas_mrr import IncrementalLocalizer
+
+    localizer = IncrementalLocalizer(patience=2)
+
+    for i, pt in enumerate(rcs_coords):
+        localizer.add(pt, [pt[0] + 100, pt[1] - 100, pt[2]])
+
+        # Third point determines the frame, two more agreeing updates needed
+        assert localizer.converged == (i >= 4)
+
+    localizer.reset()
+
+    assert localizer.n == 0
+    assert localizer.frame is None
+    assert not localizer.converged
+
+
+def test_incremental_localizer_collinear():
+    if IPY:
+        return
+
+    from compas_mrr import IncrementalLocalizer
+
+    localizer = IncrementalLocalizer()
+
+    for x in range(4):
+        frame, rms = localizer.add([x, 0, 0], [x, 0, 0])
+
+    assert frame is None
+    assert rms is None
@@ -1,5 +1,8 @@
 from pytest import fixture
 from compas_mrr import MeasurementPoint
+from compas_mrr.measurement_point import group_measurement_points
+from compas_mrr.measurement_point import sort_measurement_points
+from compas_mrr.measurement_point import split_pt_name
 from compas.geometry import Point
 
 
@@ -42,3 +45,69 @@ def test__split_pt_name_no_idx(example_instance_wo_idx):
     _, idx = example_instance_wo_idx._split_pt_name()
 
     assert idx == 0
+
+
+def test_attrs_lazy():
+    pt = MeasurementPoint._from_raw_attrs(
+        1, 2, 3, "LP1", ["Attr1", "HA", "note"], ["", "4.98", "foo"]
+    )
+
+    assert pt._raw_attrs is not None
+    assert pt.attrs == {"HA": 4.98, "note": "foo"}
+    assert pt._raw_attrs is None
+
+    pt.attrs = None
+    assert pt.attrs == {}
+
+
+def test_prefix_idx_cached(example_instance):
+    assert example_instance._split_pt_name() is example_instance._split_pt_name()
+
+    example_instance.pt_name = "LP12"
+
+    assert example_instance.prefix == "LP"
+    assert example_instance.idx == 12
+
+
+def test_split_pt_name():
+    assert split_pt_name("LP1") == ("LP", 1)
+    assert split_pt_name("A1B20") == ("A1B", 20)
+    assert split_pt_name("123") == ("", 123)
+    assert split_pt_name("") == ("", 0)
+
+
+def test_sort_measurement_points():
+    names = ["LP10", "LP2", "A3", "LP1"]
+    pts = [MeasurementPoint(0, 0, 0, name) for name in names]
+
+    sorted_pts = sort_measurement_points(pts)
+
+    assert [pt.pt_name for pt in sorted_pts] == ["A3", "LP1", "LP2", "LP10"]
+
+
+def test_group_measurement_points():
+    names = ["LP10", "S2", "LP2", "S1", "LP1"]
+    pts = [MeasurementPoint(0, 0, 0, name) for name in names]
+
+    groups = group_measurement_points(pts)
+
+    assert list(groups.keys()) == ["LP", "S"]
+    assert [pt.pt_name for pt in groups["LP"]] == ["LP1", "LP2", "LP10"]
+    assert [pt.pt_name for pt in groups["S"]] == ["S1", "S2"]
+
+
+def test_sort_and_group_match_python_order():
+    names = ["S2", "LP10", "A", "LP2", "S1", "A", "LP1", "B0", "LP2"]
+    pts = [MeasurementPoint(i, 0, 0, name) for i, name in enumerate(names)]
+
+    expected = sorted(pts, key=lambda pt: (pt.prefix, pt.idx))
+    assert sort_measurement_points(pts) == expected
+    # stable for equal names
+    assert [pt.x for pt in sort_measurement_points(pts)] == [pt.x for pt in expected]
+
+    groups = group_measurement_points(pts)
+    assert list(groups) == ["S", "LP", "A", "B"]
+    assert [pt.x for pt in groups["LP"]] == [6, 3, 8, 1]
+
+    assert sort_measurement_points([]) == []
+    assert group_measurement_points([]) == {}
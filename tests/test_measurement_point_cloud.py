@@ -0,0 +1,134 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+from compas import IPY
+from pytest import fixture
+
+HERE = os.path.dirname(__file__)
+
+
+@fixture
+def pointlist_path():
+    return os.path.join(HERE, "..", "grasshopper", "wcs_frames.csv")
+
+
+def test_from_pointlist(pointlist_path):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import MeasurementPoint
+    from compas_mrr import MeasurementPointCloud
+
+    cloud = MeasurementPointCloud.from_pointlist(pointlist_path, scale=1000)
+
+    assert len(cloud) == 10
+    assert cloud.coords.shape == (10, 3)
+    assert cloud.names[0] == "LP1"
+    assert cloud.attrs["HA"].dtype == float
+    assert np.isnan(cloud.attrs["Attr1"]).all()
+
+    pt = cloud[0]
+    assert isinstance(pt, MeasurementPoint)
+    assert pt.pt_name == "LP1"
+    assert pt.attrs["HD"] == 2.350375
+    assert "Attr1" not in pt.attrs
+
+    assert cloud[-1].pt_name == "LP10"
+
+
+def test_from_points():
+    if IPY:
+        return
+
+    from compas_mrr import MeasurementPoint
+    from compas_mrr import MeasurementPointCloud
+
+    pts = [
+        MeasurementPoint(1, 2, 3, "LP1", attrs={"HA": 1.0, "note": "a"}),
+        MeasurementPoint(4, 5, 6, "LP2", attrs={"HA": 2.0}),
+    ]
+
+    cloud = MeasurementPointCloud.from_points(pts)
+
+    assert cloud.attrs["HA"].tolist() == [1.0, 2.0]
+    assert cloud.attrs["note"].tolist() == ["a", ""]
+
+    roundtrip = cloud.to_points()
+    assert [pt.pt_name for pt in roundtrip] == ["LP1", "LP2"]
+    assert [list(pt) for pt in roundtrip] == [list(pt) for pt in pts]
+    assert roundtrip[1].attrs == {"HA": 2.0}
+
+
+def test_indexing():
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import raises
+
+    from compas_mrr import MeasurementPointCloud
+
+    cloud = MeasurementPointCloud(
+        np.arange(12).reshape(4, 3),
+        names=["A1", "A2", "B1", "B2"],
+        attrs={"HA": [0.1, 0.2, 0.3, 0.4]},
+    )
+
+    subset = cloud[cloud.attrs["HA"] > 0.25]
+    assert isinstance(subset, MeasurementPointCloud)
+    assert subset.names.tolist() == ["B1", "B2"]
+    assert cloud[1:3].coords.tolist() == [[3, 4, 5], [6, 7, 8]]
+
+    with raises(IndexError):
+        cloud[4]
+
+    with raises(ValueError):
+        MeasurementPointCloud(np.zeros((2, 3)), names=["A1"])
+
+
+def test_localization_accepts_cloud(pointlist_path, rcs_coords):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import MeasurementPointCloud
+    from compas_mrr import arbitrary_pts_localization
+
+    cloud = MeasurementPointCloud.from_pointlist(pointlist_path, scale=1000)[:9]
+
+    result = arbitrary_pts_localization(MeasurementPointCloud(rcs_coords), cloud)
+    expected = arbitrary_pts_localization(rcs_coords, cloud.coords.tolist())
+
+    assert np.asarray(cloud).shape == (9, 3)
+    assert result == approx(np.array(expected))
+
+
+def test_sorted_and_grouped():
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import MeasurementPointCloud
+
+    names = ["LP10", "S2", "LP2", "S1", "LP1"]
+    cloud = MeasurementPointCloud(np.zeros((5, 3)), names=names)
+
+    prefixes, idxs = cloud.split_names()
+    assert prefixes.tolist() == ["LP", "S", "LP", "S", "LP"]
+    assert idxs.tolist() == [10, 2, 2, 1, 1]
+
+    sorted_cloud = cloud.sorted_by_name()
+    assert sorted_cloud.names.tolist() == ["LP1", "LP2", "LP10", "S1", "S2"]
+
+    groups = cloud.grouped_by_prefix()
+    assert list(groups.keys()) == ["LP", "S"]
+    assert groups["LP"].names.tolist() == ["LP1", "LP2", "LP10"]
+    assert groups["S"].names.tolist() == ["S1", "S2"]
@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+
+from compas import IPY
+from pytest import fixture
+
+
+@fixture
+def plot_dir():
+    path = tempfile.mkdtemp(prefix="compas_mrr_test_")
+    yield path
+    shutil.rmtree(path)
+
+
+def _pts():
+    rcs_coords = [[0, 0, 0], [1000, 0, 0], [0, 1000, 0], [0, 0, 1000]]
+    wcs_coords = [[10, 20, 30], [1010, 20, 30], [10, 1020, 30], [10, 20, 1030]]
+    return rcs_coords, wcs_coords
+
+
+def test_plot_results(plot_dir):
+    if IPY:
+        return
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr.plotting import wait_for_plots
+
+    rcs_coords, wcs_coords = _pts()
+    arbitrary_pts_localization(
+        rcs_coords, wcs_coords, method="slsqp", starts=2, plot_results=plot_dir
+    )
+    wait_for_plots()
+
+    records = [f for f in os.listdir(plot_dir) if f.endswith(".npz")]
+    assert len(records) == 1
+
+    out_dir = os.path.join(plot_dir, os.path.splitext(records[0])[0])
+    assert os.path.isfile(os.path.join(out_dir, "summary.png"))
+    for i in range(2):
+        for projection in ("xy", "xz", "yz"):
+            name = "rcs_matching_{}.png".format(projection)
+            assert os.path.isfile(os.path.join(out_dir, str(i), name))
+
+    # no pyplot figures are left open
+    if "matplotlib.pyplot" in sys.modules:
+        assert sys.modules["matplotlib.pyplot"].get_fignums() == []
+
+
+def test_render_plot_record(plot_dir):
+    if IPY:
+        return
+
+    import numpy as np
+    from scipy.optimize import OptimizeResult
+
+    from compas_mrr.plotting import render_plot_record
+    from compas_mrr.plotting import save_plot_record
+
+    rcs_coords, wcs_coords = _pts()
+    result = OptimizeResult(x=np.array([10, 20, 30, 1, 0, 0, 0, 1, 0.0]), fun=0.0)
+
+    path = save_plot_record(
+        np.array(rcs_coords), np.array(wcs_coords), [result], plot_dir=plot_dir
+    )
+
+    with np.load(path) as record:
+        assert record["solutions"].shape == (1, 9)
+        assert np.allclose(record["wcs_coords"], wcs_coords)
+
+    out_dir = render_plot_record(path)
+    assert sorted(os.listdir(out_dir)) == ["0", "summary.png"]
+
+
+def test_submit_plot_record_failure(plot_dir):
+    if IPY:
+        return
+
+    from pytest import warns
+
+    from compas_mrr.plotting import submit_plot_record
+    from compas_mrr.plotting import wait_for_plots
+
+    path = os.path.join(plot_dir, "not_a_record.npz")
+    with open(path, "w") as f:
+        f.write("not a record")
+
+    with warns(RuntimeWarning, match="not_a_record"):
+        submit_plot_record(path)
+        wait_for_plots()
@@ -0,0 +1,109 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import os
+
+from compas import IPY
+from pytest import fixture
+from pytest import raises
+
+from compas_mrr import MeasurementPoint
+from compas_mrr.pointlist import iter_pointlist
+from compas_mrr.pointlist import read_pointlist
+
+HERE = os.path.dirname(__file__)
+
+
+@fixture
+def pointlist_path():
+    return os.path.join(HERE, "..", "grasshopper", "wcs_frames.csv")
+
+
+@fixture
+def pointlist_file():
+    return io.StringIO(
+        "name;x;y;z;Attr1;HA;\nLP1;1.5;2.0;3.0;;4.98;\n\nLP2;4.0;5.0;6.0;foo;5.36;\n"
+    )
+
+
+def test_read_pointlist(pointlist_path, wcs_coords):
+    pts = read_pointlist(pointlist_path, scale=1000)
+
+    assert len(pts) == 10
+    assert all(isinstance(pt, MeasurementPoint) for pt in pts)
+    assert pts[0].pt_name == "LP1"
+    # the survey the shared fixtures are taken from
+    assert [round(c, 3) for c in pts[0]] == wcs_coords[0]
+    assert pts[-1].idx == 10
+    assert pts[0].attrs["HD"] == 2.350375
+
+
+def test_iter_pointlist(pointlist_file):
+    pts = iter_pointlist(pointlist_file)
+
+    pt = next(pts)
+    assert pt.pt_name == "LP1"
+    assert list(pt) == [1.5, 2.0, 3.0]
+    assert pt.attrs == {"HA": 4.98}
+
+    pt = next(pts)
+    assert pt.attrs == {"Attr1": "foo", "HA": 5.36}
+
+    with raises(StopIteration):
+        next(pts)
+
+
+def test_iter_pointlist_invalid_header():
+    with raises(ValueError):
+        next(iter_pointlist(io.StringIO("NAME;X;Y;\nLP1;1;2;\n")))
+
+    with raises(ValueError):
+        next(iter_pointlist(io.StringIO("")))
+
+
+def test_read_pointlist_arrays(pointlist_path):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.pointlist import iter_pointlist_arrays
+    from compas_mrr.pointlist import read_pointlist_arrays
+
+    names, coords, columns = read_pointlist_arrays(pointlist_path, scale=1000)
+    pts = read_pointlist(pointlist_path, scale=1000)
+
+    assert names.tolist() == [pt.pt_name for pt in pts]
+    assert coords.shape == (10, 3)
+    assert np.allclose(coords, [list(pt) for pt in pts])
+
+    for key in ("HA", "VA", "HD", "hr", "ppm"):
+        assert columns[key].shape == (10,)
+        assert columns[key].tolist() == [pt.attrs[key] for pt in pts]
+
+    # the Attr columns are empty
+    assert np.all(np.isnan(columns["Attr1"]))
+
+    chunks = list(iter_pointlist_arrays(pointlist_path, chunksize=4))
+
+    assert [len(names) for names, _, _ in chunks] == [4, 4, 2]
+    assert np.allclose(np.concatenate([c for _, c, _ in chunks]) * 1000, coords)
+    assert np.array_equal(
+        np.concatenate([c["HD"] for _, _, c in chunks]), columns["HD"]
+    )
+
+
+def test_read_pointlist_arrays_text_column():
+    if IPY:
+        return
+
+    from compas_mrr.pointlist import read_pointlist_arrays
+
+    text = "NAME;X;Y;Z;HA;Note;\nLP1;1;2;3;0.5;;\nLP2;1;2;3;0.25;text;\n"
+
+    _, _, columns = read_pointlist_arrays(io.StringIO(text))
+
+    assert list(columns) == ["HA"]
+    assert columns["HA"].tolist() == [0.5, 0.25]
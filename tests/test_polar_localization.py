@@ -0,0 +1,183 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import compas
+from compas import IPY
+from pytest import fixture
+from pytest import raises
+
+HERE = os.path.dirname(__file__)
+
+
+@fixture
+def accuracy():
+    if IPY:
+        return None
+
+    from compas_mrr.polar_localization import InstrumentAccuracy
+
+    # 1 arc second, 1 mm + 1.5 ppm
+    return InstrumentAccuracy(angle=4.85e-6, distance=1.0, ppm=1.5)
+
+
+def _simulate(rng, accuracy, noise=True):
+    """Simulate measuring RCS points placed with a known frame."""
+    import numpy as np
+    from scipy.spatial.transform import Rotation
+
+    station = np.array([13000.0, 25000.0, 1750.0])
+    orientation = 4.78
+
+    R = Rotation.from_rotvec([0.01, -0.02, 1.2]).as_matrix()
+    t = np.array([15500.0, 23000.0, 500.0])
+
+    rcs_coords = rng.uniform(-2500, 2500, size=(6, 3))
+    wcs_coords = rcs_coords.dot(R.T) + t
+
+    offsets = wcs_coords - station
+    hd = np.linalg.norm(offsets[:, :2], axis=1)
+    slope_distance = np.linalg.norm(offsets, axis=1)
+    va = np.arccos(offsets[:, 2] / slope_distance)
+    ha = (orientation - np.arctan2(offsets[:, 1], offsets[:, 0])) % (2 * np.pi)
+
+    if noise:
+        ha = ha + rng.normal(scale=accuracy.angle, size=len(ha))
+        va = va + rng.normal(scale=accuracy.angle, size=len(va))
+        sigma = accuracy.distance + accuracy.ppm * 1e-6 * slope_distance
+        slope_distance = slope_distance + rng.normal(scale=sigma)
+        hd = slope_distance * np.sin(va)
+
+    direction = orientation - ha
+    measured = station + np.column_stack(
+        (hd * np.cos(direction), hd * np.sin(direction), hd / np.tan(va))
+    )
+
+    return rcs_coords, measured, np.column_stack((ha, va, hd)), t, R, station
+
+
+def test_station_position(accuracy):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.polar_localization import _station_position
+
+    rng = np.random.default_rng(0)
+    _, wcs_coords, observations, _, _, station = _simulate(rng, accuracy, False)
+
+    assert np.allclose(_station_position(wcs_coords, observations), station)
+
+
+def test_polar_pts_localization_exact(accuracy):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.polar_localization import polar_pts_localization
+
+    rng = np.random.default_rng(1)
+    rcs_coords, wcs_coords, observations, t, R, _ = _simulate(rng, accuracy, False)
+
+    frame = polar_pts_localization(rcs_coords, wcs_coords, observations, accuracy)
+
+    assert np.allclose(frame[0], t)
+    assert np.allclose(frame[1], R[:, 0])
+    assert np.allclose(frame[2], R[:, 1])
+
+
+def test_polar_pts_localization_more_accurate(accuracy):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr.polar_localization import polar_pts_localization
+
+    rng = np.random.default_rng(2)
+
+    weighted_errors = []
+    unweighted_errors = []
+    for _ in range(50):
+        rcs_coords, wcs_coords, observations, t, _, _ = _simulate(rng, accuracy)
+
+        frame = polar_pts_localization(rcs_coords, wcs_coords, observations, accuracy)
+        weighted_errors.append(np.linalg.norm(frame[0] - t))
+
+        frame = arbitrary_pts_localization(rcs_coords, wcs_coords)
+        unweighted_errors.append(np.linalg.norm(frame[0] - t))
+
+    assert np.mean(weighted_errors) < 0.75 * np.mean(unweighted_errors)
+
+
+def test_polar_pts_localization_pointlist(accuracy):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr.pointlist import read_pointlist
+    from compas_mrr.polar_localization import polar_observations
+    from compas_mrr.polar_localization import polar_pts_localization
+
+    rcs_frames = compas.json_load(
+        os.path.join(HERE, "..", "grasshopper", "rcs_frames.json")
+    )
+    rcs_coords = [list(frame.point) for frame in rcs_frames]
+    points = read_pointlist(
+        os.path.join(HERE, "..", "grasshopper", "wcs_frames.csv"), scale=1000
+    )
+
+    wcs_coords, observations = polar_observations(points, scale=1000)
+    frame, diagnostics = polar_pts_localization(
+        rcs_coords, wcs_coords, observations, accuracy, full_output=True
+    )
+
+    expected = arbitrary_pts_localization(rcs_coords, wcs_coords)
+    assert np.linalg.norm(np.subtract(frame[0], expected[0])) < 20
+    assert diagnostics.covariance.shape == (6, 6)
+    assert np.all(np.linalg.eigvalsh(diagnostics.covariance) > 0)
+
+
+def test_polar_pts_localization_vertical_sight(accuracy):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.polar_localization import polar_pts_localization
+
+    rng = np.random.default_rng(1)
+    rcs_coords, wcs_coords, observations, _, _, station = _simulate(
+        rng, accuracy, False
+    )
+
+    # point straight above the station
+    observations[2] = [0.0, 0.0, 0.0]
+    with raises(ValueError, match=r"\[2\]"):
+        polar_pts_localization(rcs_coords, wcs_coords, observations, accuracy)
+
+    # observations fine, but the given station is below the point
+    _, wcs_coords, observations, _, _, _ = _simulate(rng, accuracy, False)
+    station = wcs_coords[4] - [0.0, 0.0, 1000.0]
+    with raises(ValueError, match=r"\[4\]"):
+        polar_pts_localization(
+            rcs_coords, wcs_coords, observations, accuracy, station=station
+        )
+
+
+def test_polar_observations_missing():
+    if IPY:
+        return
+
+    from compas_mrr import MeasurementPoint
+    from compas_mrr.polar_localization import polar_observations
+
+    with raises(ValueError):
+        polar_observations([MeasurementPoint(0, 0, 0, "LP1", {"HA": 1.0})])
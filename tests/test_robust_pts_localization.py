@@ -0,0 +1,139 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas import IPY
+from pytest import fixture
+
+
+@fixture
+def outlier_idx():
+    return 4
+
+
+@fixture
+def wcs_coords_with_outlier(wcs_coords, outlier_idx):
+    coords = [list(c) for c in wcs_coords]
+    coords[outlier_idx] = [
+        coords[outlier_idx][0] + 300,
+        coords[outlier_idx][1] - 200,
+        coords[outlier_idx][2] + 150,
+    ]
+    return coords
+
+
+def test_robust_pts_localization_ransac(
+    rcs_coords, wcs_coords, wcs_coords_with_outlier, outlier_idx
+):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr import robust_pts_localization
+
+    expected = arbitrary_pts_localization(
+        np.delete(rcs_coords, outlier_idx, axis=0),
+        np.delete(wcs_coords, outlier_idx, axis=0),
+    )
+
+    for threshold in (None, 30.0):
+        frame, inliers, residuals = robust_pts_localization(
+            rcs_coords, wcs_coords_with_outlier, threshold=threshold
+        )
+
+        assert frame == approx(np.array(expected))
+        assert not inliers[outlier_idx]
+        assert inliers.sum() == len(rcs_coords) - 1
+        assert residuals[outlier_idx] > 300
+        assert residuals.shape == (len(rcs_coords),)
+
+
+def test_robust_pts_localization_irls(rcs_coords, wcs_coords_with_outlier, outlier_idx):
+    if IPY:
+        return
+
+    from compas_mrr import robust_pts_localization
+
+    for method in ("huber", "cauchy"):
+        frame, inliers, residuals = robust_pts_localization(
+            rcs_coords, wcs_coords_with_outlier, method=method
+        )
+
+        assert not inliers[outlier_idx]
+        assert inliers.sum() == len(rcs_coords) - 1
+        assert residuals[outlier_idx] > 300
+
+
+def test_robust_pts_localization_no_outliers(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    import numpy as np
+    from pytest import approx
+
+    from compas_mrr import arbitrary_pts_localization
+    from compas_mrr import robust_pts_localization
+
+    expected = arbitrary_pts_localization(rcs_coords, wcs_coords)
+
+    frame, inliers, _ = robust_pts_localization(rcs_coords, wcs_coords)
+
+    assert inliers.all()
+    assert frame == approx(np.array(expected))
+
+
+def test_robust_pts_localization_random_subsets(
+    rcs_coords, wcs_coords_with_outlier, outlier_idx
+):
+    if IPY:
+        return
+
+    from compas_mrr import robust_pts_localization
+
+    # Fewer trials than combinations of three points
+    _, inliers, _ = robust_pts_localization(
+        rcs_coords, wcs_coords_with_outlier, max_trials=30, seed=0
+    )
+
+    assert not inliers[outlier_idx]
+
+
+def test_robust_pts_localization_invalid(rcs_coords, wcs_coords):
+    if IPY:
+        return
+
+    from pytest import raises
+
+    from compas_mrr import robust_pts_localization
+
+    with raises(ValueError):
+        robust_pts_localization(rcs_coords, wcs_coords, method="lsq")
+
+    with raises(ValueError):
+        robust_pts_localization(rcs_coords[:2], wcs_coords[:2])
+
+
+def test__refine_max_iter(rcs_coords, wcs_coords_with_outlier, outlier_idx):
+    if IPY:
+        return
+
+    import numpy as np
+
+    from compas_mrr.arbitrary_pts_localization import _kabsch
+    from compas_mrr.robust_pts_localization import _refine
+
+    rcs = np.array(rcs_coords)
+    wcs = np.array(wcs_coords_with_outlier)
+
+    # starting with the outlier as inlier, the first fit drops it
+    inliers = np.ones(len(rcs), dtype=bool)
+    t, R, refined = _refine(rcs, wcs, inliers, threshold=50.0, max_iter=1)
+
+    assert not refined[outlier_idx]
+
+    expected_t, expected_R = _kabsch(rcs[refined], wcs[refined])
+    assert np.allclose(t, expected_t)
+    assert np.allclose(R, expected_R)
@@ -0,0 +1,193 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import threading
+
+import compas
+from compas import IPY
+from pytest import fixture
+from pytest import raises
+
+from compas_mrr.server import LOCALIZE_HEADER
+from compas_mrr.server import OP_LOCALIZE
+from compas_mrr.server import LocalizationClient
+from compas_mrr.server import LocalizationServer
+from compas_mrr.server import _pack_message
+
+HERE = os.path.dirname(__file__)
+
+
+@fixture
+def point_pairs():
+    from compas_mrr.pointlist import read_pointlist
+
+    rcs_frames = compas.json_load(
+        os.path.join(HERE, "..", "grasshopper", "rcs_frames.json")
+    )
+    wcs_pts = read_pointlist(
+        os.path.join(HERE, "..", "grasshopper", "wcs_frames.csv"), scale=1000
+    )
+
+    return [list(frame.point) for frame in rcs_frames], [list(pt) for pt in wcs_pts]
+
+
+@fixture
+def client():
+    server = LocalizationServer(port=0, warm=not IPY)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    client = LocalizationClient(port=server.server_address[1])
+    yield client
+
+    client.close()
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_health(client):
+    if IPY:
+        return
+
+    info = client.health()
+
+    assert info["status"] == "ok"
+    assert info["requests_handled"] == 1
+
+
+def test_localize(client, point_pairs):
+    if IPY:
+        return
+
+    from compas_mrr.arbitrary_pts_localization import arbitrary_pts_localization
+    from compas_mrr.arbitrary_pts_localization import (
+        batch_arbitrary_pts_localization,
+    )
+
+    rcs_coords, wcs_coords = point_pairs
+    expected = arbitrary_pts_localization(rcs_coords, wcs_coords)
+    _, expected_rms = batch_arbitrary_pts_localization([rcs_coords], [wcs_coords])
+
+    for method in ("svd", "slsqp", "lm"):
+        frame, rms = client.localize(rcs_coords, wcs_coords, method=method)
+
+        for vec, expected_vec in zip(frame, expected):
+            assert compas.geometry.allclose(vec, expected_vec, tol=1e-3)
+        assert abs(rms - expected_rms[0]) < 1e-3
+
+
+def test_localize_pipelined(client, point_pairs):
+    if IPY:
+        return
+
+    rcs_coords, wcs_coords = point_pairs
+    pairs = [(rcs_coords[:n], wcs_coords[:n]) for n in range(3, 11)]
+
+    results = client.localize_many(pairs)
+
+    assert len(results) == len(pairs)
+    assert [rms for _, rms in results] == [
+        client.localize(rcs, wcs)[1] for rcs, wcs in pairs
+    ]
+    assert client.health()["requests_handled"] == 2 * len(pairs) + 1
+
+
+class _CountingSocket(object):
+    """Socket counting the requests of a fixed size sent through it."""
+
+    def __init__(self, sock, message_size):
+        self._sock = sock
+        self._message_size = message_size
+        self.sent = 0
+
+    def sendall(self, data):
+        self.sent += len(data) // self._message_size
+        return self._sock.sendall(data)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+def test_localize_pipelined_window(client, point_pairs, monkeypatch):
+    if IPY:
+        return
+
+    rcs_coords, wcs_coords = point_pairs
+    pairs = [(rcs_coords, wcs_coords)] * 10
+    expected = client.localize_many(pairs)
+
+    payload_size = LOCALIZE_HEADER.size + 2 * 3 * 8 * len(rcs_coords)
+    message_size = len(_pack_message(OP_LOCALIZE, 0, b"\0" * payload_size))
+
+    for window in (1, 3, 4):
+        sock = _CountingSocket(client._sock, message_size)
+        monkeypatch.setattr(client, "_sock", sock)
+
+        receive = client._receive
+        received = []
+
+        def counting_receive(request_id):
+            # all requests sent so far minus the responses read are in flight
+            assert sock.sent - len(received) <= window
+            received.append(request_id)
+            return receive(request_id)
+
+        monkeypatch.setattr(client, "_receive", counting_receive)
+
+        assert client.localize_many(pairs, window=window) == expected
+        assert sock.sent == len(received) == len(pairs)
+
+        monkeypatch.undo()
+
+    with raises(ValueError):
+        client.localize_many(pairs, window=0)
+
+
+def test_error_response(client, point_pairs):
+    if IPY:
+        return
+
+    rcs_coords, wcs_coords = point_pairs
+
+    with raises(ValueError):
+        client.localize(rcs_coords[:3], wcs_coords[:4])
+
+    # truncated payload
+    client._sock.sendall(_pack_message(OP_LOCALIZE, 42, b"\x00\x03\x00\x00\x00"))
+    with raises(RuntimeError, match="ValueError"):
+        client._receive(42)
+
+    # unknown operation
+    client._sock.sendall(_pack_message(7, 43))
+    with raises(RuntimeError, match="Unknown operation"):
+        client._receive(43)
+
+    # connection is still usable
+    assert client.health()["status"] == "ok"
+
+
+def test_localize_cached(point_pairs):
+    if IPY:
+        return
+
+    from compas_mrr.cache import LocalizationCache
+
+    server = LocalizationServer(port=0, warm=False, cache=LocalizationCache())
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    try:
+        with LocalizationClient(port=server.server_address[1]) as client:
+            rcs_coords, wcs_coords = point_pairs
+            first = client.localize(rcs_coords, wcs_coords)
+            second = client.localize(rcs_coords, wcs_coords)
+
+            assert first == second
+            assert client.health()["cache"] == {"size": 1, "hits": 1, "misses": 1}
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
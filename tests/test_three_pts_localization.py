@@ -2,11 +2,14 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import compas
 from compas.geometry import Frame
 from compas.geometry import Point
+from compas.geometry import Transformation
 from compas.geometry import Vector
 from pytest import fixture
 
+from compas_mrr import batch_three_pts_localization
 from compas_mrr import three_pts_localization
 from compas_mrr.three_pts_localization import _coerce_frame
 from compas_mrr.three_pts_localization import _pts_to_frame
@@ -68,3 +71,47 @@ def test_three_pts_localization(rcs_coords, wcs_coords, example_pt_rcs, example_
         rounded_transformed_pt = [round(c, 2) for c in list(transformed_pt)]
         rounded_example_pt = [round(c, 2) for c in list(example_pt_wcs)]
         assert rounded_transformed_pt == rounded_example_pt
+
+
+def test_three_pts_localization_frames(rcs_coords, wcs_coords):
+    rcs_frame = Frame.from_points(*rcs_coords)
+    wcs_frame = Frame.from_points(*wcs_coords)
+
+    T = Transformation.from_frame_to_frame(rcs_frame, wcs_frame)
+    expected = Frame.worldXY().transformed(T)
+
+    result = three_pts_localization(rcs_frame, wcs_frame)
+
+    for a, b in zip(result, expected):
+        assert [round(c, 6) for c in a] == [round(c, 6) for c in b]
+
+
+def test_batch_three_pts_localization(rcs_coords, wcs_coords):
+    if compas.IPY:
+        return
+
+    import numpy as np
+
+    rcs = np.array([list(pt) for pt in rcs_coords])
+    wcs = np.array([list(pt) for pt in wcs_coords])
+
+    rcs_triples = np.stack((rcs, rcs + [10.0, 20.0, 30.0]))
+    wcs_triples = np.stack((wcs, wcs[[0, 2, 1]]))
+
+    frames = batch_three_pts_localization(rcs_triples, wcs_triples)
+
+    assert frames.shape == (2, 3, 3)
+    for frame, rcs_triple, wcs_triple in zip(frames, rcs_triples, wcs_triples):
+        expected = three_pts_localization(rcs_triple.tolist(), wcs_triple.tolist())
+        assert np.allclose(frame, [expected.point, expected.xaxis, expected.yaxis])
+
+
+def test_batch_three_pts_localization_shape():
+    if compas.IPY:
+        return
+
+    import numpy as np
+    from pytest import raises
+
+    with raises(ValueError):
+        batch_three_pts_localization(np.zeros((2, 3, 3)), np.zeros((3, 3, 3)))
@@ -2,10 +2,273 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from compas_mrr.utils import _ensure_rhino
+import compas
+from compas.geometry import Frame
+from compas.geometry import Point
+from pytest import fixture
 from pytest import raises
 
+from compas_mrr import utils
+from compas_mrr.utils import _ensure_rhino
+from compas_mrr.utils import cgframes_to_rgplanes
+from compas_mrr.utils import cgpoints_to_rgpoints
+from compas_mrr.utils import matrices_to_rgtransforms
+from compas_mrr.utils import rgplanes_to_frames
+from compas_mrr.utils import rgpoints_to_coords
+from compas_mrr.utils import rgtransforms_to_matrices
+
+
+class _Point3d(object):
+    WIDTH = 3
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X, self.Y, self.Z = x, y, z
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(*values)
+
+    def values(self):
+        return [self.X, self.Y, self.Z]
+
+
+class _Vector3d(_Point3d):
+    pass
+
+
+class _Plane(object):
+    def __init__(self, origin, x_vec, y_vec):
+        self.Origin, self.XAxis, self.YAxis = origin, x_vec, y_vec
+
+
+class _Transform(object):
+    WIDTH = 16
+
+    def __init__(self, values=None):
+        self._values = list(values or [float(i % 5 == 0) for i in range(16)])
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(values)
+
+    def values(self):
+        return list(self._values)
+
+
+class _Geometry(object):
+    Point3d = _Point3d
+    Vector3d = _Vector3d
+    Plane = _Plane
+    Transform = _Transform
+
+
+class _Rhino(object):
+    Geometry = _Geometry
+
+
+class _StructArray(object):
+    """Array of blittable structs, stored as the flat doubles in memory."""
+
+    def __init__(self, struct_type, n):
+        self.struct_type = struct_type
+        self.memory = [0.0] * (n * struct_type.WIDTH)
+
+    def __len__(self):
+        return len(self.memory) // self.struct_type.WIDTH
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        w = self.struct_type.WIDTH
+        return self.struct_type.from_values(self.memory[i * w : (i + 1) * w])
+
+
+class _ArrayType(object):
+    def __init__(self, item_type):
+        self.item_type = item_type
+
+    def __call__(self, items):
+        if self.item_type is float:
+            return [float(v) for v in items]
+
+        array = _StructArray(self.item_type, len(items))
+        array.memory = [v for item in items for v in item.values()]
+        return array
+
+
+class _Array(object):
+    def __getitem__(self, item_type):
+        return _ArrayType(item_type)
+
+    @staticmethod
+    def CreateInstance(item_type, n):
+        if item_type is float:
+            return [0.0] * n
+        return _StructArray(item_type, n)
+
+
+class _Pointer(object):
+    def __init__(self, target):
+        self.target = target
+
+
+class _GCHandle(object):
+    def __init__(self, target):
+        self.target = target
+        self.freed = False
+
+    @staticmethod
+    def Alloc(target, handle_type):
+        assert handle_type == "Pinned"
+        return _GCHandle(target)
+
+    def AddrOfPinnedObject(self):
+        return _Pointer(self.target)
+
+    def Free(self):
+        self.freed = True
+
+
+class _Marshal(object):
+    calls = 0
+
+    @classmethod
+    def Copy(cls, *args):
+        cls.calls += 1
+        if isinstance(args[0], _Pointer):
+            # Copy(IntPtr source, double[] destination, int startIndex, int length)
+            source, destination, start, length = args
+            destination[start : start + length] = source.target.memory[:length]
+        else:
+            # Copy(double[] source, int startIndex, IntPtr destination, int length)
+            source, start, destination, length = args
+            destination.target.memory[:length] = source[start : start + length]
+
+
+class _System(object):
+    Array = _Array()
+
+
+class _GCHandleType(object):
+    Pinned = "Pinned"
+
+
+@fixture
+def rhino_stub():
+    """Pure Python stand-in for the parts of RhinoCommon and .NET used by utils."""
+    stubs = {
+        "Rhino": _Rhino,
+        "System": _System,
+        "GCHandle": _GCHandle,
+        "GCHandleType": _GCHandleType,
+        "Marshal": _Marshal,
+    }
+    originals = {name: getattr(utils, name, None) for name in stubs}
+    original_flag = compas.RHINO
+
+    for name, stub in stubs.items():
+        setattr(utils, name, stub)
+    compas.RHINO = True
+    _Marshal.calls = 0
+
+    yield _Rhino
+
+    compas.RHINO = original_flag
+    for name, original in originals.items():
+        if original is None:
+            delattr(utils, name)
+        else:
+            setattr(utils, name, original)
+
 
 def test__ensure_rhino():
     with raises(ImportError):
         _ensure_rhino()
+
+
+def test_cgpoints_to_rgpoints(rhino_stub):
+    points = [Point(1, 2, 3), [4, 5, 6]]
+
+    rgpoints = cgpoints_to_rgpoints(points)
+
+    assert all(isinstance(pt, _Point3d) for pt in rgpoints)
+    assert _Marshal.calls == 1
+
+    assert rgpoints_to_coords(rgpoints) == [[1, 2, 3], [4, 5, 6]]
+    assert _Marshal.calls == 2
+
+    # lists of points are read in one call as well
+    assert rgpoints_to_coords([_Point3d(7, 8, 9)]) == [[7, 8, 9]]
+
+
+def test_cgpoints_to_rgpoints_ndarray(rhino_stub):
+    if compas.IPY:
+        return
+
+    import numpy as np
+
+    coords = np.arange(12, dtype=float).reshape(4, 3)
+
+    assert rgpoints_to_coords(cgpoints_to_rgpoints(coords)) == coords.tolist()
+
+
+def test_cgframes_to_rgplanes(rhino_stub):
+    frames = [
+        Frame([1, 2, 3], [0, 1, 0], [-1, 0, 0]),
+        [[4, 5, 6], [1, 0, 0], [0, 0, 1]],
+    ]
+
+    planes = cgframes_to_rgplanes(frames)
+
+    assert all(isinstance(plane, _Plane) for plane in planes)
+    assert rgplanes_to_frames(planes) == [
+        [[1, 2, 3], [0, 1, 0], [-1, 0, 0]],
+        [[4, 5, 6], [1, 0, 0], [0, 0, 1]],
+    ]
+
+
+def test_matrices_to_rgtransforms(rhino_stub):
+    M = [
+        [1.0, 0.0, 0.0, -100],
+        [0.0, 0.0, 1.0, -100],
+        [0.0, -1.0, 0.0, 100],
+        [0.0, 0.0, 0.0, 1.0],
+    ]
+
+    transforms = matrices_to_rgtransforms([M, M])
+
+    assert len(transforms) == 2
+    assert transforms[1].values() == [v for row in M for v in row]
+    assert _Marshal.calls == 1
+
+    assert rgtransforms_to_matrices(transforms) == [M, M]
+    assert _Marshal.calls == 2
+
+
+def test_matrices_to_rgtransforms_ndarray(rhino_stub):
+    if compas.IPY:
+        return
+
+    import numpy as np
+
+    matrices = np.arange(32, dtype=float).reshape(2, 4, 4)
+
+    transforms = matrices_to_rgtransforms(matrices)
+
+    assert rgtransforms_to_matrices(transforms) == matrices.tolist()
+
+
+def test_bulk_converters_without_rhino():
+    with raises(ImportError):
+        cgpoints_to_rgpoints([[1, 2, 3]])
+
+    # fails with the same error, not on the missing Rhino attributes
+    for converter in (
+        rgpoints_to_coords,
+        cgframes_to_rgplanes,
+        rgplanes_to_frames,
+        matrices_to_rgtransforms,
+        rgtransforms_to_matrices,
+    ):
+        with raises(ImportError):
+            converter([object()])
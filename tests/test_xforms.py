@@ -2,14 +2,20 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from compas import IPY
 from compas.geometry import Frame
 from compas.geometry import Transformation
 from pytest import fixture
 from pytest import raises
 
+from compas_mrr.xforms import _RESOLVED_CONVERTERS
 from compas_mrr.xforms import _coerce_cg_xform
+from compas_mrr.xforms import register_xform_converter
+from compas_mrr.xforms import transform_orientations_to_robot_base
+from compas_mrr.xforms import transform_points_to_robot_base
 from compas_mrr.xforms import worldxy_to_robot_base_xform
 from compas_mrr.xforms import xform_to_xyz_quaternion
+from compas_mrr.xforms import xforms_to_xyz_quaternions
 
 
 @fixture
@@ -72,6 +78,44 @@ def test__coerce_cg_xform_invalid_sequence():
         _coerce_cg_xform([None])
 
 
+def test__coerce_cg_xform_invalid_shape():
+    with raises(TypeError):
+        _coerce_cg_xform([[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+
+
+def test__coerce_cg_xform_non_finite(rcf_matrix):
+    rcf_matrix[0][3] = float("nan")
+
+    with raises(TypeError):
+        _coerce_cg_xform(rcf_matrix)
+
+
+def test__coerce_cg_xform_resolved_once(rcf_matrix):
+    _coerce_cg_xform(rcf_matrix)
+    with raises(TypeError):
+        _coerce_cg_xform(None)
+
+    assert _RESOLVED_CONVERTERS[list] is not None
+    assert _RESOLVED_CONVERTERS[type(None)] is None
+
+
+def test_register_xform_converter(rcf_matrix, rcf_xform):
+    class Pose(object):
+        def __init__(self, M):
+            self.M = M
+
+    class SubPose(Pose):
+        pass
+
+    with raises(TypeError):
+        _coerce_cg_xform(Pose(rcf_matrix))
+
+    register_xform_converter(Pose, lambda pose: Transformation.from_matrix(pose.M))
+
+    assert _coerce_cg_xform(Pose(rcf_matrix)) == rcf_xform
+    assert _coerce_cg_xform(SubPose(rcf_matrix)) == rcf_xform
+
+
 def test_worldxy_to_robot_base_xform(rcf, rcf_xform):
     assert worldxy_to_robot_base_xform(rcf) == rcf_xform
 
@@ -87,3 +131,139 @@ def test_xform_to_xyz_quaternion(rcf_matrix, rcf_xyz_quaternion):
     except ImportError:  # IPY
         rounded_actual_result = [round(v, 3) for v in computed_quaternion]
         assert rounded_actual_result == rcf_xyz_quaternion
+
+
+def test_xforms_to_xyz_quaternions():
+    if IPY:
+        return
+
+    import numpy as np
+    from compas.geometry import Rotation
+    from compas.geometry import Translation
+
+    rng = np.random.default_rng(0)
+    xforms = []
+    for axis, angle, vector in zip(
+        rng.normal(size=(50, 3)),
+        rng.uniform(-np.pi, np.pi, 50),
+        rng.normal(size=(50, 3)),
+    ):
+        R = Rotation.from_axis_and_angle(axis.tolist(), angle)
+        xforms.append(Translation.from_vector(vector.tolist()) * R)
+
+    result = xforms_to_xyz_quaternions(xforms, continuous=False)
+    expected = np.array([xform_to_xyz_quaternion(T) for T in xforms])
+
+    assert result.shape == (50, 7)
+    # same sign as the scalar conversion, not only the same rotation
+    assert np.allclose(result, expected, rtol=0, atol=1e-12)
+
+    # all branches of the conversion: W, X, Y and Z picked
+    for axis, angle in (
+        ([0, 0, 1], 0.1),
+        ([1, 0, 0], 0.9 * np.pi),
+        ([0, 1, 0], 0.9 * np.pi),
+        ([0, 0, 1], 0.9 * np.pi),
+    ):
+        R = Rotation.from_axis_and_angle(axis, angle)
+        assert np.allclose(
+            xforms_to_xyz_quaternions([R], continuous=False)[0],
+            xform_to_xyz_quaternion(R),
+            rtol=0,
+            atol=1e-12,
+        )
+
+    stacked = np.array([T.matrix for T in xforms])
+    assert np.allclose(xforms_to_xyz_quaternions(stacked, continuous=False), result)
+
+
+def test_xforms_to_xyz_quaternions_continuous():
+    if IPY:
+        return
+
+    import numpy as np
+    from compas.geometry import Rotation
+
+    # rotation passing through 180 degrees, where W changes sign
+    angles = np.linspace(0, 2 * np.pi, 37)
+    xforms = [Rotation.from_axis_and_angle([0, 0, 1], a).matrix for a in angles]
+
+    q = xforms_to_xyz_quaternions(np.array(xforms))[:, 3:]
+
+    assert q[0, 0] > 0
+    assert np.all(np.einsum("ij,ij->i", q[1:], q[:-1]) > 0)
+    assert np.allclose(q[-1], [-1, 0, 0, 0])
+
+
+def test_xforms_to_xyz_quaternions_invalid():
+    if IPY:
+        return
+
+    import numpy as np
+
+    assert xforms_to_xyz_quaternions([]).shape == (0, 7)
+
+    with raises(ValueError):
+        xforms_to_xyz_quaternions(np.zeros((2, 3, 4)))
+
+
+def test_transform_points_to_robot_base(rcf, rcf_xform):
+    if IPY:
+        return
+
+    import numpy as np
+    from compas.geometry import Point
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-1000, 1000, size=(20, 3))
+    expected = [Point(*pt).transformed(rcf_xform) for pt in points.tolist()]
+
+    result = transform_points_to_robot_base(points, rcf)
+    assert np.allclose(result, expected)
+
+    back = transform_points_to_robot_base(result, rcf, inverse=True)
+    assert np.allclose(back, points)
+
+    # in place
+    original = points.copy()
+    out = transform_points_to_robot_base(points, rcf, out=points)
+    assert out is points
+    assert np.allclose(points, expected)
+    transform_points_to_robot_base(points, rcf, inverse=True, out=points)
+    assert np.allclose(points, original)
+
+
+def test_transform_orientations_to_robot_base(rcf, rcf_xform):
+    if IPY:
+        return
+
+    import numpy as np
+    from compas.geometry import Rotation
+
+    rng = np.random.default_rng(1)
+    frames = [
+        Frame.from_rotation(Rotation.from_axis_and_angle(axis.tolist(), angle))
+        for axis, angle in zip(rng.normal(size=(10, 3)), rng.uniform(-3, 3, 10))
+    ]
+    orientations = np.array([[f.xaxis, f.yaxis, f.zaxis] for f in frames])
+    expected = [f.transformed(rcf_xform) for f in frames]
+    expected = np.array([[f.xaxis, f.yaxis, f.zaxis] for f in expected])
+
+    result = transform_orientations_to_robot_base(orientations, rcf)
+    assert np.allclose(result, expected)
+
+    transform_orientations_to_robot_base(result, rcf, inverse=True, out=result)
+    assert np.allclose(result, orientations)
+
+
+def test_transform_points_to_robot_base_invalid(rcf):
+    if IPY:
+        return
+
+    import numpy as np
+
+    with raises(ValueError):
+        transform_points_to_robot_base([[1, 2]], rcf)
+
+    with raises(ValueError):
+        transform_points_to_robot_base([[1, 2, 3]], rcf, out=np.zeros((2, 3)))